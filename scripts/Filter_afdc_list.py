@@ -9,6 +9,21 @@ Beispiel:
 python filter_afdc_plugins.py \
   --input light-duty-vehicles-2026-02-17.csv \
   --output afdc_us_plugins_core.csv
+
+Große Exporte (--stream): liest nur die benötigten Spalten mit festen dtypes
+in Chunks, filtert jeden Chunk sofort und zählt die Year/Fuel-Pivot im selben
+Durchlauf mit. Im Speicher liegen ein Chunk plus alle bisher gefilterten
+Zeilen (für die abschließende Sortierung): der Speicher wächst mit der Größe
+des Ergebnisses, nicht mit der des Exports. Beide Pfade schreiben dieselbe
+CSV (Vehicle ID / Model Year als Int64, auch bei leeren Zellen).
+python filter_afdc_plugins.py -i light-duty-vehicles.csv -o afdc_us_plugins_core.csv --stream --chunksize 50000
+
+Snapshot: neben der Output-CSV wird <output>.arrow (bzw. .pkl ohne pyarrow)
+geschrieben, verschlüsselt mit dem SHA-256 der Input-CSV + Filter-Optionen
+(inkl. --stream).
+Ist die Quelle unverändert, wird sie nicht erneut geparst. Spätere Schritte
+können den Snapshot mit afdc_snapshot.load_afdc() lesen (siehe afdc_snapshot.py);
+derzeit nutzt noch keine Stufe des Repos die gefilterte CSV.
 """
 
 from __future__ import annotations
@@ -17,6 +32,8 @@ import argparse
 import sys
 import pandas as pd
 
+from afdc_snapshot import cached_snapshot, csv_is_current, file_sha256, snapshot_path, write_snapshot
+
 
 # "Core"-Spalten: minimal, aber hilfreich fürs Matching + spätere Datenanreicherung
 DEFAULT_KEEP = [
@@ -45,6 +62,26 @@ DEFAULT_KEEP = [
     "Manufacturer URL",
 ]
 
+PLUGIN_FUEL_CODES = ["ELEC", "PHEV"]
+SORT_COLS = ["Model Year", "Manufacturer", "Model", "Fuel Code", "Vehicle ID"]
+
+# Feste dtypes für --stream (unbekannte Spalten werden wie bisher inferiert)
+AFDC_DTYPES = {
+    "Vehicle ID": "Int64",
+    "Manufacturer": "str",
+    "Model": "str",
+    "Model Year": "Int64",
+    "Fuel Code": "str",
+    "Battery Capacity kWh": "float64",
+    "Charging Rate Level 2 (kW)": "float64",
+    "Charging Rate DC Fast (kW)": "float64",
+    "Notes": "str",
+    "Manufacturer URL": "str",
+}
+# Ganzzahl-Spalten: auch im In-Memory-Pfad als Int64 (sonst float64 bei Lücken → "2024.0")
+INT_COLUMNS = [c for c, dtype in AFDC_DTYPES.items() if dtype == "Int64"]
+DEFAULT_CHUNKSIZE = 50_000
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Filter AFDC LDV export to BEV/PHEV + keep relevant columns.")
@@ -78,60 +115,160 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Wenn gesetzt: entfernt Duplikate anhand Vehicle ID (falls vorhanden).",
     )
+    p.add_argument(
+        "--stream",
+        action="store_true",
+        help="Chunkweise lesen: nur benötigte Spalten (usecols) mit festen dtypes, Pivot inkrementell.",
+    )
+    p.add_argument(
+        "--no-snapshot",
+        action="store_true",
+        help="Keinen Spalten-Snapshot (<output>.arrow/.pkl) schreiben oder verwenden.",
+    )
+    p.add_argument(
+        "--chunksize",
+        type=int,
+        default=DEFAULT_CHUNKSIZE,
+        help=f"Zeilen pro Chunk für --stream (default: {DEFAULT_CHUNKSIZE})",
+    )
     return p.parse_args()
 
 
-def main() -> int:
-    args = parse_args()
+def year_fuel_counts(df: pd.DataFrame) -> pd.Series | None:
+    """(Model Year, Fuel Code) → count, wie pivot_table(aggfunc='count') auf der Werte-Spalte."""
+    if "Model Year" not in df.columns or "Fuel Code" not in df.columns:
+        return None
+    values = "Vehicle ID" if "Vehicle ID" in df.columns else df.columns[0]
+    return df.groupby(["Model Year", "Fuel Code"], observed=True)[values].count()
 
-    # CSV einlesen (robust: keep_default_na=False verhindert manche komischen NA-Interpretationen)
+
+def build_pivot(counts: pd.Series) -> pd.DataFrame:
+    pivot = counts.unstack("Fuel Code", fill_value=0).sort_index()
+    pivot["Total"] = pivot.sum(axis=1)
+    return pivot
+
+
+def filter_in_memory(args: argparse.Namespace, keep: list[str]):
+    """
+    Bisheriger Pfad: ganze CSV einlesen, dann filtern.
+    Returns (df_out, kept columns, fuel code counts, year/fuel counts); df_out is None
+    (and the columns are all available ones) if no keep column exists.
+    """
     df = pd.read_csv(args.input, low_memory=False)
 
     # Optional: nur Plug-ins (falls doch noch HYBR o.ä. drin sind)
     if not args.no_fuel_filter and "Fuel Code" in df.columns:
-        df = df[df["Fuel Code"].isin(["ELEC", "PHEV"])].copy()
+        df = df[df["Fuel Code"].isin(PLUGIN_FUEL_CODES)].copy()
 
-    # Spalten reduzieren
-    keep = args.keep if args.keep is not None else DEFAULT_KEEP
     keep_existing = [c for c in keep if c in df.columns]
-
     if not keep_existing:
-        print("ERROR: Keine der gewünschten Spalten in der Datei gefunden.", file=sys.stderr)
-        print("Verfügbare Spalten:", list(df.columns), file=sys.stderr)
-        return 2
+        return None, list(df.columns), None, None
 
     df_out = df[keep_existing].copy()
+    for col in INT_COLUMNS:
+        if col in df_out.columns:
+            df_out[col] = df_out[col].astype("Int64")
 
     # Dedupe optional
     if args.dedupe and "Vehicle ID" in df_out.columns:
         df_out = df_out.drop_duplicates(subset=["Vehicle ID"]).copy()
 
-    # Sortierung (wenn Spalten existieren)
-    sort_cols = [c for c in ["Model Year", "Manufacturer", "Model", "Fuel Code", "Vehicle ID"] if c in df_out.columns]
-    if sort_cols:
-        df_out = df_out.sort_values(sort_cols)
+    fuel_counts = df_out["Fuel Code"].value_counts(dropna=False) if "Fuel Code" in df_out.columns else None
+    return df_out, keep_existing, fuel_counts, year_fuel_counts(df_out)
+
+
+def filter_streaming(args: argparse.Namespace, keep: list[str]):
+    """
+    Chunkweise: nur keep-Spalten (+ Fuel Code für den Filter) mit festen dtypes,
+    Filter, Dedupe und Zählungen pro Chunk. Returns wie filter_in_memory.
+    """
+    header = list(pd.read_csv(args.input, nrows=0).columns)
+    keep_existing = [c for c in keep if c in header]
+    if not keep_existing:
+        return None, header, None, None
+
+    fuel_filter = not args.no_fuel_filter and "Fuel Code" in header
+    usecols = keep_existing + (["Fuel Code"] if fuel_filter and "Fuel Code" not in keep_existing else [])
+    dtypes = {c: AFDC_DTYPES[c] for c in usecols if c in AFDC_DTYPES}
+    dedupe = args.dedupe and "Vehicle ID" in keep_existing
+
+    parts = []
+    seen_ids: set = set()
+    fuel_counts = None
+    year_counts = None
+    for chunk in pd.read_csv(args.input, usecols=usecols, dtype=dtypes, chunksize=args.chunksize):
+        if fuel_filter:
+            chunk = chunk[chunk["Fuel Code"].isin(PLUGIN_FUEL_CODES)]
+        chunk = chunk[keep_existing]
+
+        if dedupe:
+            ids = chunk["Vehicle ID"]
+            first = ~ids.duplicated() & ~ids.isin(seen_ids)
+            chunk = chunk[first]
+            seen_ids.update(chunk["Vehicle ID"].tolist())
+
+        if "Fuel Code" in chunk.columns:
+            counts = chunk["Fuel Code"].value_counts(dropna=False)
+            fuel_counts = counts if fuel_counts is None else fuel_counts.add(counts, fill_value=0)
+        counts = year_fuel_counts(chunk)
+        if counts is not None:
+            year_counts = counts if year_counts is None else year_counts.add(counts, fill_value=0)
+        parts.append(chunk)
+
+    df_out = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=keep_existing)
+    if fuel_counts is not None:
+        fuel_counts = fuel_counts.astype(int).sort_values(ascending=False, kind="mergesort")
+    if year_counts is not None:
+        year_counts = year_counts.astype(int)
+    return df_out, keep_existing, fuel_counts, year_counts
+
+
+def main() -> int:
+    args = parse_args()
+    keep = args.keep if args.keep is not None else DEFAULT_KEEP
 
-    # Speichern
-    df_out.to_csv(args.output, index=False)
+    # Snapshot: gleiche Quelle + gleiche Optionen → CSV nicht erneut parsen
+    options = {"keep": keep, "fuel_filter": not args.no_fuel_filter, "dedupe": args.dedupe, "stream": args.stream}
+    source_sha256 = None if args.no_snapshot else file_sha256(args.input)
+    cached = cached_snapshot(args.output, source_sha256, options) if source_sha256 else None
+    df_out = cached[0] if cached else None
+
+    if df_out is not None:
+        print(f"Snapshot: {snapshot_path(args.output)} (Quelle unverändert, kein Parsen)")
+        fuel_counts = df_out["Fuel Code"].value_counts(dropna=False) if "Fuel Code" in df_out.columns else None
+        year_counts = year_fuel_counts(df_out)
+    else:
+        # Einlesen + Plug-in-Filter + Spalten reduzieren (+ Dedupe optional)
+        filter_fn = filter_streaming if args.stream else filter_in_memory
+        df_out, columns, fuel_counts, year_counts = filter_fn(args, keep)
+
+        if df_out is None:
+            print("ERROR: Keine der gewünschten Spalten in der Datei gefunden.", file=sys.stderr)
+            print("Verfügbare Spalten:", columns, file=sys.stderr)
+            return 2
+
+        # Sortierung (wenn Spalten existieren)
+        sort_cols = [c for c in SORT_COLS if c in df_out.columns]
+        if sort_cols:
+            df_out = df_out.sort_values(sort_cols)
+
+    # Speichern (CSV + Snapshot nur, wenn nicht schon aktuell)
+    if cached and csv_is_current(args.output, cached[1]):
+        print(f"Unchanged: {args.output}")
+    else:
+        df_out.to_csv(args.output, index=False)
+        if source_sha256:
+            write_snapshot(df_out, args.output, source_sha256, options)
+        print(f"Wrote: {args.output}")
 
     # Kleine Summary in die Konsole
-    print(f"Wrote: {args.output}")
     print(f"Rows: {len(df_out):,}")
-    if "Fuel Code" in df_out.columns:
+    if fuel_counts is not None:
         print("Counts by Fuel Code:")
-        print(df_out["Fuel Code"].value_counts(dropna=False).to_string())
-    if "Model Year" in df_out.columns and "Fuel Code" in df_out.columns:
-        pivot = pd.pivot_table(
-            df_out,
-            index="Model Year",
-            columns="Fuel Code",
-            values="Vehicle ID" if "Vehicle ID" in df_out.columns else df_out.columns[0],
-            aggfunc="count",
-            fill_value=0,
-        )
-        pivot["Total"] = pivot.sum(axis=1)
+        print(fuel_counts.to_string())
+    if year_counts is not None:
         print("\nCounts by Model Year (tail):")
-        print(pivot.tail(15).to_string())
+        print(build_pivot(year_counts).tail(15).to_string())
 
     return 0
 
@@ -17,251 +17,25 @@ import sys
 import pandas as pd
 from typing import Optional, Dict
 
+from rule_tables import load_rules
+
 
 # ============================================================================
 # EU-SPEZIFISCHE QUELLENANGABEN
 # ============================================================================
 
-EU_PLUG_TYPE_SOURCES = {
-    "Type 2 + CCS2": (
-        "IEC 62196-2 Type 2 AC (Mennekes) + CCS2 (Combined Charging System) | "
-        "AFDC EU Reference | EV-Database Specification | "
-        "EU Charging Directive 2014/94/EU"
-    ),
-    "CHAdeMO + Type 2": (
-        "CHAdeMO Association Specification | "
-        "Nissan LEAF EU Technical Manual | "
-        "EV-Database CHAdeMO Coverage"
-    ),
-    "NACS (Berlin Giga) / Type 2 mit Adapter": (
-        "Tesla Berlin Gigafactory Specifications | "
-        "Tesla EU NACS Adapter Documentation | "
-        "Tesla Supercharger EU Network Docs"
-    ),
-}
-
-EU_AUTOCHARGE_SOURCES = {
-    # VW Group
-    "Audi": (
-        "Audi e-tron/Q4 Technical Documentation | "
-        "Audi ChargeConnect Platform | "
-        "NewMotion Partnership Docs | "
-        "Ionity High-Speed Charging Network"
-    ),
-    "Volkswagen": (
-        "Volkswagen ID. Family Owner Manual | "
-        "VW ChargeConnect Integration | "
-        "NewMotion (Electrify Europe) Partnership | "
-        "Ionity Coverage Maps"
-    ),
-    "Porsche": (
-        "Porsche Taycan/911 e Technical Manual | "
-        "Porsche Charging Network Integration | "
-        "EU Charging Networks | "
-        "Ionity High-Speed Charging"
-    ),
-    "CUPRA": (
-        "CUPRA Born/Formentor e Technical Docs | "
-        "VW Group Charging Infrastructure | "
-        "NewMotion Partnership"
-    ),
-
-    # BMW Group
-    "BMW": (
-        "BMW i3/i4/iX Technical Documentation | "
-        "BMW ChargeNow Service | "
-        "NewMotion Partnership EU | "
-        "Ionity Coverage Maps"
-    ),
-    "Mini": (
-        "Mini Cooper SE Owner Manual | "
-        "BMW ChargeNow Integration | "
-        "EU Charging Network Coverage"
-    ),
-
-    # Hyundai-Kia-Genesis Group
-    "Hyundai": (
-        "Hyundai Ioniq 5/6 Owner Manual | "
-        "Hyundai Charging Service | "
-        "Ionity High-Speed Network | "
-        "Shell Recharge Partnership"
-    ),
-    "Kia": (
-        "Kia EV6/EV9 Technical Documentation | "
-        "Kia Charging Services | "
-        "Ionity High-Speed Charging | "
-        "Shell Recharge EU Network"
-    ),
-    "Genesis": (
-        "Genesis GV60/Electrified Manual | "
-        "Genesis Premium Charging Service | "
-        "Ionity Partnership"
-    ),
-
-    # Mercedes-Benz/Smart
-    "Mercedes-Benz": (
-        "Mercedes EQC/EQE/EQS Owner Manual | "
-        "Mercedes-Benz Charging Solutions | "
-        "Shell Recharge Partnership | "
-        "Ionity Coverage"
-    ),
-
-    # Other Brands
-    "Tesla": (
-        "Tesla Model 3/Y/S/X EU Owner Manual | "
-        "Tesla Supercharger Network EU | "
-        "Type 2 Adapter for older models | "
-        "Shell Recharge Partnership (Roadster)"
-    ),
-    "Volvo": (
-        "Volvo XC40 Recharge Owner Manual | "
-        "Volvo Charging Integration | "
-        "EU Charging Network Partnerships"
-    ),
-    "Polestar": (
-        "Polestar 2/3 Technical Documentation | "
-        "Volvo Group Charging Services | "
-        "EU Network Coverage"
-    ),
-    "Ford": (
-        "Ford Mustang Mach-E Owner Manual | "
-        "Ford Intelligent Charging | "
-        "EU Charging Network Integration"
-    ),
-    "Nissan": (
-        "Nissan LEAF/Ariya EU Owner Manual | "
-        "Nissan Charging Service | "
-        "EV-Database CHAdeMO/CCS2 Coverage"
-    ),
-    "MG": (
-        "MG4/5/EV Technical Specification | "
-        "EV-Database EU Coverage | "
-        "Limited charging network partnerships"
-    ),
-    "BYD": (
-        "BYD Yuan Plus/Seagull EU Documentation | "
-        "Limited EU charging network integration"
-    ),
-    "GAC": (
-        "GAC Aion Y Plus EU Specification | "
-        "Emerging EU market data"
-    ),
-    "Xpeng": (
-        "Xpeng P7/G9 EU Market Documentation | "
-        "Limited EU infrastructure support"
-    ),
-}
-
-EU_EMERGENCY_RELEASE_SOURCES = {
-    # VW Group
-    "Audi e-tron": (
-        "Audi e-tron Betriebsanleitung | "
-        "Audi Service Portal | "
-        "EV-Database Emergency Release Instructions | "
-        "Audi Community Forum EU"
-    ),
-    "Volkswagen ID": (
-        "Volkswagen ID. Betriebsanleitung | "
-        "VW Service Portal DE | "
-        "EV-Database MEB Platform Guide | "
-        "VW Owner Forums EU"
-    ),
-    "Porsche Taycan": (
-        "Porsche Taycan Betriebsanleitung | "
-        "Porsche Service Center EU | "
-        "EV-Database Documentation"
-    ),
-
-    # BMW Group
-    "BMW i3": (
-        "BMW i3 Betriebsanleitung | "
-        "BMW Service Portal EU | "
-        "Owner Forums Deutsch"
-    ),
-    "BMW i4": (
-        "BMW i4 Owner Manual | "
-        "BMW Service Documentation | "
-        "EV-Database Specification"
-    ),
-    "BMW iX": (
-        "BMW iX Betriebsanleitung | "
-        "BMW Service Portal | "
-        "EV-Database Instructions"
-    ),
-
-    # Hyundai-Kia E-GMP Platform
-    "Hyundai Ioniq 5": (
-        "Hyundai Ioniq 5 Owner Manual | "
-        "E-GMP Platform Specification | "
-        "Hyundai Service Portal EU"
-    ),
-    "Kia EV6": (
-        "Kia EV6 Owner Manual | "
-        "E-GMP Platform Documentation | "
-        "Kia Service Portal EU"
-    ),
-
-    # Mercedes EQ
-    "Mercedes EQC": (
-        "Mercedes EQC Betriebsanleitung | "
-        "Mercedes Service Portal | "
-        "EV-Database Documentation"
-    ),
-    "Mercedes EQE": (
-        "Mercedes EQE Owner Manual | "
-        "Mercedes Service Documentation | "
-        "EV-Database Instructions"
-    ),
-
-    # Tesla
-    "Tesla Model 3": (
-        "Tesla Model 3 Owner Manual EU | "
-        "Tesla Service Center Documentation"
-    ),
-    "Tesla Model Y": (
-        "Tesla Model Y Owner Manual EU | "
-        "Tesla Service Portal"
-    ),
-
-    # Others
-    "Nissan LEAF": (
-        "Nissan LEAF Owner Manual | "
-        "Nissan Service Portal EU | "
-        "EV-Database Documentation"
-    ),
-    "Volvo XC40": (
-        "Volvo XC40 Recharge Manual | "
-        "Volvo Service Documentation"
-    ),
-}
-
-EU_EMERGENCY_RELEASE_PLATFORM_SOURCES = {
-    "MEB": (
-        "Volkswagen MEB Platform Technical Manual | "
-        "VW e-mobility Documentation | "
-        "Audi/Skoda/Cupra Technical Specifications"
-    ),
-    "E-GMP": (
-        "Hyundai-Kia E-GMP Platform Specification | "
-        "Genesis GV60 Technical Manual | "
-        "Owner Forums EU"
-    ),
-    "BMW i": (
-        "BMW i Series Architecture Documentation | "
-        "BMW Service Portal | "
-        "Technical Community Forums"
-    ),
-    "Mercedes EQ": (
-        "Mercedes EQ Architecture Documentation | "
-        "Mercedes-Benz Service Portal DE"
-    ),
-}
-
-EU_EMERGENCY_RELEASE_FALLBACK = (
-    "EV-Database EU Vehicle Database | "
-    "Fahrzeug-Betriebsanleitung (konsultieren) | "
-    "Pannendienst kontaktieren (ADAC, ÖAC, TCS)"
-)
+# Quellen in rules/eu_sources.json (Reihenfolge = Priorität bei Teilstring-Treffern)
+_SOURCES = load_rules('eu_sources')
+
+EU_PLUG_TYPE_SOURCES = _SOURCES['plug_type']
+
+EU_AUTOCHARGE_SOURCES = _SOURCES['autocharge']
+
+EU_EMERGENCY_RELEASE_SOURCES = _SOURCES['emergency_release']
+
+EU_EMERGENCY_RELEASE_PLATFORM_SOURCES = _SOURCES['emergency_release_platform']
+
+EU_EMERGENCY_RELEASE_FALLBACK = _SOURCES['emergency_release_fallback']
 
 
 # ============================================================================
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+afdc_snapshot.py
+
+Spaltenbasierter Snapshot des gefilterten AFDC-Exports, damit spätere Schritte
+nicht jedes Mal CSV-Text tokenisieren müssen.
+
+- Filter_afdc_list.py schreibt neben <output>.csv einen Snapshot <output>.csv.arrow
+  (Arrow IPC, falls pyarrow installiert ist, sonst <output>.csv.pkl)
+- Schlüssel: SHA-256 der Quell-CSV + Filter-Optionen (in den Metadaten des
+  Snapshots); gleiche Quelle + gleiche Optionen → kein erneutes Parsen
+- Manufacturer / Model / Fuel Code sind dictionary-encoded (pandas: category),
+  Vehicle ID / Model Year Int64, auch wenn load_afdc() auf die CSV zurückfällt
+- Arrow-Snapshots werden per Memory-Map gelesen, die Arrow-Tabelle selbst liegt
+  also nicht im Heap. to_pandas() kopiert die Spalten trotzdem in pandas-Blöcke
+  (nicht zero-copy); split_blocks + self_destruct geben jeden Arrow-Puffer nach
+  der Umwandlung frei, der Spitzenverbrauch liegt bei etwa einem Frame statt
+  zwei. Ohne pyarrow ist der Snapshot ein normales Pickle: kein Memory-Map, der
+  Frame wird komplett in den Speicher geladen (schneller als read_csv)
+- Zusätzlich wird Größe + mtime der geschriebenen CSV vermerkt: load_afdc(csv)
+  nutzt den Snapshot nur, solange die CSV unverändert ist
+
+Bisher liest keine Stufe des Repos die gefilterte AFDC-CSV wieder ein;
+load_afdc() ist die Schnittstelle für spätere Schritte:
+    from afdc_snapshot import load_afdc
+    afdc = load_afdc('afdc_us_plugins_core.csv')
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:  # pyarrow ist optional
+    pa = None
+
+SNAPSHOT_SUFFIX = '.arrow' if pa is not None else '.pkl'
+DICTIONARY_COLUMNS = ['Manufacturer', 'Model', 'Fuel Code']
+INT_COLUMNS = ['Vehicle ID', 'Model Year']  # wie Filter_afdc_list.INT_COLUMNS
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def snapshot_path(csv_path: str) -> str:
+    return csv_path + SNAPSHOT_SUFFIX
+
+
+def csv_is_current(csv_path: str, meta: dict) -> bool:
+    """True if csv_path is still the file the snapshot was written next to."""
+    try:
+        return {k: meta.get(k) for k in ('csv_size', 'csv_mtime_ns')} == _csv_stamp(csv_path)
+    except OSError:
+        return False
+
+
+def _csv_stamp(csv_path: str) -> dict:
+    st = os.stat(csv_path)
+    return {'csv_size': st.st_size, 'csv_mtime_ns': st.st_mtime_ns}
+
+
+def write_snapshot(df: pd.DataFrame, csv_path: str, source_sha256: str, options: dict) -> str:
+    """Write the snapshot for the (already written) csv_path; returns its path."""
+    df = snapshot_dtypes(df.reset_index(drop=True).copy())
+
+    meta = {'source_sha256': source_sha256, 'options': options, **_csv_stamp(csv_path)}
+    path = snapshot_path(csv_path)
+    tmp = f"{path}.tmp"
+    if pa is not None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}),
+                                               b'afdc_snapshot': json.dumps(meta).encode()})
+        with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        with open(tmp, 'wb') as f:
+            pickle.dump({'meta': meta, 'df': df}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
+    return path
+
+
+def read_snapshot(path: str) -> tuple[pd.DataFrame, dict]:
+    """(DataFrame, metadata); Arrow snapshots are memory-mapped, then converted (copied) to pandas."""
+    if path.endswith('.arrow'):
+        if pa is None:
+            raise ImportError("pyarrow is required to read .arrow snapshots")
+        with pa.memory_map(path, 'r') as source:
+            table = pa.ipc.open_file(source).read_all()
+        meta = json.loads(table.schema.metadata[b'afdc_snapshot'])
+        return table.to_pandas(split_blocks=True, self_destruct=True), meta
+
+    with open(path, 'rb') as f:
+        payload = pickle.load(f)
+    return payload['df'], payload['meta']
+
+
+def cached_snapshot(csv_path: str, source_sha256: str, options: dict) -> tuple[pd.DataFrame, dict] | None:
+    """(DataFrame, metadata) of the snapshot next to csv_path if built from the same source + options."""
+    path = snapshot_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        df, meta = read_snapshot(path)
+    except Exception:
+        return None
+    if meta.get('source_sha256') != source_sha256 or meta.get('options') != options:
+        return None
+    return df, meta
+
+
+def snapshot_dtypes(df: pd.DataFrame, skip=()) -> pd.DataFrame:
+    """DICTIONARY_COLUMNS as category, INT_COLUMNS as Int64 (columns in skip untouched)."""
+    for cols, dtype in ((DICTIONARY_COLUMNS, 'category'), (INT_COLUMNS, 'Int64')):
+        for col in cols:
+            if col in df.columns and col not in skip and str(df[col].dtype) != dtype:
+                df[col] = df[col].astype(dtype)
+    return df
+
+
+def load_afdc(csv_path: str, **read_csv_kwargs) -> pd.DataFrame:
+    """
+    Filtered AFDC table: from the snapshot if it matches the CSV on disk
+    (size + mtime), otherwise parsed from the CSV. Either way with the
+    snapshot dtypes (see snapshot_dtypes), except for columns given in dtype=.
+
+    read_csv_kwargs (usecols, dtype, ...) cannot be applied to a snapshot;
+    passing any always reads the CSV.
+    """
+    path = snapshot_path(csv_path)
+    if not read_csv_kwargs and os.path.exists(path):
+        try:
+            df, meta = read_snapshot(path)
+            if csv_is_current(csv_path, meta):
+                return df
+        except Exception:
+            pass
+    dtype = read_csv_kwargs.get('dtype')
+    return snapshot_dtypes(pd.read_csv(csv_path, **read_csv_kwargs), skip=dtype if isinstance(dtype, dict) else ())
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+bench_afdc_filter.py
+
+Differential-Check + Zeitmessung für Filter_afdc_list.py: In-Memory-Pfad vs.
+--stream auf einem synthetischen AFDC-Export (zusätzliche Spalten, HYBR/CNG-
+Zeilen, doppelte Vehicle IDs, leere Model Year / Vehicle ID-Zellen, Chunks
+kleiner als der Export). Beide Modi müssen byte-identische CSVs und dieselbe
+Konsolen-Summary liefern, mit und ohne --dedupe.
+
+Verwendung:
+    python3 bench_afdc_filter.py
+    python3 bench_afdc_filter.py --rows 300000 --chunksize 50000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Filter_afdc_list.py")
+
+
+def synthetic_export(path: str, rows: int, seed: int = 0) -> None:
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        "Vehicle ID": rng.integers(1, rows // 2 + 2, rows).astype(float),
+        "Fuel Code": np.array(["ELEC", "PHEV", "HYBR", "CNG"], dtype=object)[rng.integers(0, 4, rows)],
+        "Manufacturer": np.array(["Tesla", "Ford", "Kia", "BMW"], dtype=object)[rng.integers(0, 4, rows)],
+        "Model": np.array(["Model 3", "F-150 Lightning", "EV6", "i4"], dtype=object)[rng.integers(0, 4, rows)],
+        "Model Year": rng.integers(2011, 2027, rows).astype(float),
+        "Battery Capacity kWh": np.round(rng.uniform(10, 130, rows), 1),
+        "Charging Rate Level 2 (kW)": np.where(rng.random(rows) < 0.3, np.nan, 11.5),
+        "Charging Rate DC Fast (kW)": np.where(rng.random(rows) < 0.3, np.nan, 150.0),
+        "Notes": np.where(rng.random(rows) < 0.8, None, "some, note"),
+        "Manufacturer URL": "https://example.com",
+        "Engine Type": "n/a",
+    })
+    df.loc[rng.random(rows) < 0.01, "Model Year"] = np.nan
+    df.loc[rng.random(rows) < 0.01, "Vehicle ID"] = np.nan
+    df.to_csv(path, index=False)
+
+
+def run(args: list[str]) -> tuple[str, float]:
+    t0 = time.perf_counter()
+    out = subprocess.run([sys.executable, SCRIPT, *args, "--no-snapshot"],
+                         capture_output=True, text=True, check=True).stdout
+    return out, time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="In-memory vs. --stream for Filter_afdc_list.py")
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--chunksize", type=int, default=7_000)
+    args = ap.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "ldv.csv")
+        synthetic_export(src, args.rows)
+        for extra in ([], ["--dedupe"]):
+            outs = {}
+            for mode, flags in [("in-memory", []), ("stream", ["--stream", "--chunksize", str(args.chunksize)])]:
+                dst = os.path.join(tmp, f"{mode}.csv")
+                summary, seconds = run(["-i", src, "-o", dst, *extra, *flags])
+                with open(dst, "rb") as f:
+                    outs[mode] = (f.read(), summary.replace(dst, "<output>"), seconds)
+            same = outs["in-memory"][:2] == outs["stream"][:2]
+            failures += not same
+            label = " ".join(extra) or "default"
+            print(f"{label:<9} identical CSV + summary: {'yes' if same else 'NO'}  "
+                  f"(in-memory {outs['in-memory'][2]:.2f}s, stream {outs['stream'][2]:.2f}s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
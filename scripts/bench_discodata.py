@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+bench_discodata.py
+
+Benchmark des Discodata-Downloads gegen den lokalen Stub (discodata_stub.py),
+reproduzierbar und ohne Netzwerk.
+
+Misst pro Variante Laufzeit, Anzahl Requests und Zeilen und prüft, dass alle
+Varianten dieselben Zeilen liefern:
+- sequentielles Paging (bisheriger Pfad, ohne --sleep)
+- COUNT + parallele Seiten mit 1/4/8 Workern
+- mit ResponseCache: kalt und warm
+- gegen einen Stub mit zufälliger Zeilenreihenfolge pro Ausführung (--shuffle):
+  die Seiten müssen trotzdem genau die Zeilen des sequentiellen Laufs liefern
+
+Verwendung:
+    python3 bench_discodata.py
+    python3 bench_discodata.py --rows 500000 --latency 0.1 --page-size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+
+import download_eu_plugins_discodata as dd
+from discodata_stub import start_stub
+from http_cache import ResponseCache
+
+
+def run(name: str, server, fn) -> list[dict]:
+    before = server.requests
+    t0 = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - t0
+    print(f"  {name:<24} {elapsed:7.2f} s  {server.requests - before:5d} requests  {len(rows):8,} rows")
+    return rows
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark Discodata paging/caching against the local stub")
+    ap.add_argument("--rows", type=int, default=200_000, help="Synthetic co2cars rows")
+    ap.add_argument("--latency", type=float, default=0.05, help="Stub delay per request (seconds)")
+    ap.add_argument("--page-size", type=int, default=2000)
+    ap.add_argument("--years", nargs=2, type=int, default=(2019, 2024))
+    args = ap.parse_args()
+
+    print(f"Seeding stub with {args.rows:,} rows ...")
+    server = start_stub(rows=args.rows, latency=args.latency)
+    dd.BASE = server.base_url
+    query = dd.build_query(args.years[0], args.years[1], ["P", "F"])
+    print(f"Stub: {server.base_url}, latency {args.latency * 1000:.0f} ms/request\n")
+
+    results = {}
+    results['sequential'] = run('sequential', server, lambda: [
+        r for page in dd.iter_pages_sequential(query, args.page_size, sleep_s=0) for r in page])
+    for workers in (1, 4, 8):
+        results[f'parallel x{workers}'] = run(f'COUNT + parallel x{workers}', server, lambda: dd.fetch_all_pages(
+            query, args.page_size, workers=workers, rps=0))
+
+    cache = ResponseCache(tempfile.mkdtemp(prefix='bench_discodata_cache_'))
+    for label in ('cache cold', 'cache warm'):
+        results[label] = run(f'parallel x4, {label}', server, lambda: dd.fetch_all_pages(
+            query, args.page_size, cache=cache, workers=4, rps=0))
+
+    shuffled = start_stub(latency=args.latency, db_path=server.db_path, shuffle=True)
+    dd.BASE = shuffled.base_url
+    for workers in (1, 4):
+        results[f'shuffled x{workers}'] = run(f'shuffled server, x{workers}', shuffled, lambda: dd.fetch_all_pages(
+            query, args.page_size, workers=workers, rps=0))
+
+    reference = results['sequential']
+    mismatches = [name for name, rows in results.items() if rows != reference]
+    print(f"\nIdentical rows in all variants: {'yes' if not mismatches else 'NO – ' + ', '.join(mismatches)}")
+    server.shutdown()
+    shuffled.shutdown()
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+bench_enrich_eu.py
+
+Benchmark + Differential-Check für enrich_eu_ev_data.py.
+
+1. Notentriegelung (--part rules): EmergencyReleaseIndex (Hersteller-Index, pro
+   eindeutigem (Manufacturer, Model)-Paar) vs. bisherige lineare Suche pro Zeile (df.apply).
+
+Die Regeltabellen werden synthetisch auf einige tausend Einträge vergrößert
+(neue Marken, Groß-/Kleinschreibung, Schlüssel die Teilstrings anderer Marken
+sind wie "MG" in "Mercedes-AMG"). Die lineare Suche läuft auf einer Stichprobe
+(--linear-sample) und wird pro 1000 Zeilen angegeben; beide Pfade müssen auf
+der Stichprobe identisch sein.
+
+2. Plug Type + Autocharge (--part plug): Masken + Merge auf Manufacturer vs.
+   df.apply pro Zeile bei 2k / 200k / 2M Zeilen. Über --rowwise-max hinaus wird
+   die Zeit des apply-Pfads linear hochgerechnet (markiert mit ~); verglichen
+   werden die Ergebnisse auf den tatsächlich zeilenweise berechneten Zeilen.
+
+Verwendung:
+    python3 bench_enrich_eu.py
+    python3 bench_enrich_eu.py --part rules --rows 200000 --rules 36 500 2000 5000
+    python3 bench_enrich_eu.py --part plug --sizes 2000 200000 2000000 --rowwise-max 2000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+import enrich_eu_ev_data as ee
+from canonicalize import map_unique
+
+BASE_MAKES = ['Audi', 'BMW', 'Mercedes-Benz', 'Mercedes-AMG', 'Ford', 'Volkswagen', 'Peugeot', 'Opel', 'Volvo',
+              'Hyundai', 'Kia', 'Nissan', 'Tesla', 'Porsche', 'Škoda', 'Polestar', 'MG', 'BYD', 'CUPRA',
+              'Fiat', 'Mini', 'Citroën', 'Leapmotor', 'Xpeng', 'Ora', 'Dacia', 'Renault', 'Zeekr']
+MODELS = ['Q4 e-tron', 'iX xDrive50', 'i4 eDrive40', 'e-208', 'Corsa Electric', 'Model Y', 'ID.4 Pro',
+          'Mustang Mach-E', 'EX30', '2 Long Range', 'Ioniq 5', 'EV6 GT', 'EV9', 'LEAF e+', 'ARIYA 87kWh',
+          'Enyaq iV 80', 'Taycan', 'ZS EV', 'Atto 3', 'Born', '500e', 'Cooper SE', 'ë-C4', 'T03', 'G6',
+          'Funky Cat', 'Spring', 'Megane E-Tech', '001']
+
+
+def grow_tables(n_model_rules: int, seed: int = 0) -> tuple[dict, dict, dict, list[str]]:
+    """Original tables extended to n_model_rules model rules (+ platform/make rules) and the brand list."""
+    rng = random.Random(seed)
+    by_model = dict(ee.EU_EMERGENCY_RELEASE_BY_MODEL)
+    by_platform = dict(ee.EU_EMERGENCY_RELEASE_BY_PLATFORM)
+    by_make = dict(ee.EU_EMERGENCY_RELEASE_BY_MAKE)
+    makes = list(BASE_MAKES)
+    while len(by_model) < n_model_rules:
+        if rng.random() < 0.05 or len(makes) < 40:
+            makes.append(''.join(rng.choice('bcdfghklmnprstvz') + rng.choice('aeiou') for _ in range(3)).title())
+        mfr = rng.choice(makes)
+        mfr = mfr.upper() if rng.random() < 0.05 else mfr
+        key = rng.choice(MODELS).split()[0][:rng.randint(1, 4)] + str(rng.randint(0, 99))
+        by_model[(mfr, key)] = f"Regel {len(by_model)}: {mfr} {key}"
+        if rng.random() < 0.1:
+            by_platform.setdefault(mfr, f"Plattform {mfr}")
+        elif rng.random() < 0.1:
+            by_make.setdefault(mfr, f"Hersteller {mfr}")
+    return by_model, by_platform, by_make, makes
+
+
+def sample_frame(rows: int, makes: list[str], seed: int = 1) -> pd.DataFrame:
+    rng = random.Random(seed)
+    pairs = [(rng.choice(makes + [' Tesla ', 'Unknown']),
+              f"{rng.choice(MODELS)}{rng.choice(['', '', ' ' + str(rng.randint(0, 99))])}") for _ in range(4000)]
+    chosen = [rng.choice(pairs) for _ in range(rows)]
+    df = pd.DataFrame(chosen, columns=['Manufacturer', 'Model'])
+    df.loc[df.sample(frac=0.01, random_state=seed).index, 'Model'] = None
+    return df
+
+
+def bench_rules(args) -> int:
+    failures = 0
+    print("Notentriegelung: Index vs. lineare Suche")
+    print(f"{'model rules':>11}  {'linear / 1k rows':>16}  {'indexed (all rows)':>18}  {'/ 1k rows':>9}  identical")
+    for n_rules in args.rules:
+        by_model, by_platform, by_make, makes = grow_tables(n_rules)
+        df = sample_frame(args.rows, makes)
+        sample = df.head(args.linear_sample)
+
+        t0 = time.perf_counter()
+        linear = sample.apply(ee.determine_emergency_release_eu_linear, axis=1,
+                              args=(by_model, by_platform, by_make))
+        t_linear = (time.perf_counter() - t0) / len(sample) * 1000
+
+        t0 = time.perf_counter()
+        index = ee.EmergencyReleaseIndex(by_model, by_platform, by_make)
+        indexed = map_unique(lambda m, mo: ee.emergency_release_for(m, mo, index), df['Manufacturer'], df['Model'])
+        t_index = time.perf_counter() - t0
+
+        same = linear.tolist() == indexed.head(len(sample)).tolist()
+        failures += not same
+        print(f"{len(by_model):>11,}  {t_linear * 1000:>14.1f}ms  {t_index:>17.3f}s  "
+              f"{t_index / len(df) * 1e6:>7.2f}ms  {'yes' if same else 'NO'}")
+    return failures
+
+
+PLUG_MAKES = list(ee.EU_AUTOCHARGE_LOOKUP) + ['Tesla ', 'Nissan', 'Dacia', 'Unknown', 'Tesla Motors']
+PLUG_MODELS = ['LEAF', 'LEAF e+', 'ARIYA', 'Model 3', 'Model Y', 'ID.3', 'iX1', 'EV6', 'Spring']
+
+
+def catalogue(rows: int, seed: int = 2) -> pd.DataFrame:
+    """Normalized-catalogue-like frame (int64 Model Year as written by normalize_eu_data.py)."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Manufacturer': np.array(PLUG_MAKES, dtype=object)[rng.integers(0, len(PLUG_MAKES), rows)],
+        'Model': np.array(PLUG_MODELS, dtype=object)[rng.integers(0, len(PLUG_MODELS), rows)],
+        'Model Year': rng.integers(2018, 2027, rows),
+    })
+
+
+def plug_rowwise(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    return df.apply(ee.determine_plug_type_eu, axis=1), df.apply(ee.determine_autocharge_eu, axis=1)
+
+
+def plug_vectorized(df: pd.DataFrame) -> tuple[pd.Series, pd.Series]:
+    manufacturer = ee._str_column(df, "Manufacturer")
+    years = ee._model_years(df)
+    return (ee.plug_type_series(manufacturer, ee._str_column(df, "Model"), years),
+            ee.autocharge_series(manufacturer, years))
+
+
+def bench_plug(args) -> int:
+    failures = 0
+    # Randfälle: Jahre als float/str, NaN-Hersteller, fehlende Spalte
+    edge = catalogue(5000, seed=7)
+    edge['Model Year'] = edge['Model Year'].astype(object)
+    edge.loc[::7, 'Model Year'] = edge.loc[::7, 'Model Year'].astype(float) + 0.5
+    edge.loc[::11, 'Model Year'] = edge.loc[::11, 'Model Year'].map(lambda y: f" {int(y)} ")
+    edge.loc[::13, 'Manufacturer'] = None
+    for label, df in [('edge cases', edge), ('no Model Year column', edge.drop(columns='Model Year'))]:
+        same = [a.tolist() for a in plug_rowwise(df)] == [b.tolist() for b in plug_vectorized(df)]
+        failures += not same
+        print(f"Differential ({label}): {'OK' if same else 'MISMATCH'}")
+
+    # ungültige Jahre: beide Pfade brechen mit demselben Fehler ab
+    for bad in (np.nan, '2023.0', 'n/a'):
+        df = edge.copy()
+        df.loc[17, 'Model Year'] = bad
+        errors = []
+        for fn in (plug_rowwise, plug_vectorized):
+            try:
+                fn(df)
+                errors.append(None)
+            except (ValueError, TypeError) as e:
+                errors.append((type(e), str(e)))
+        same = errors[0] is not None and errors[0] == errors[1]
+        failures += not same
+        print(f"Differential (Model Year {bad!r}): {'OK, ' + errors[0][0].__name__ if same else 'MISMATCH'}")
+
+    print("\nPlug Type + Autocharge: Masken/Merge vs. df.apply")
+    print(f"{'rows':>10}  {'df.apply':>10}  {'vectorized':>10}  speedup  identical")
+    for rows in args.sizes:
+        df = catalogue(rows)
+        sample = df.head(min(rows, args.rowwise_max))
+
+        t0 = time.perf_counter()
+        slow = plug_rowwise(sample)
+        t_slow = (time.perf_counter() - t0) * rows / len(sample)
+
+        t0 = time.perf_counter()
+        fast = plug_vectorized(df)
+        t_fast = time.perf_counter() - t0
+
+        same = all(a.tolist() == b.head(len(sample)).tolist() for a, b in zip(slow, fast))
+        failures += not same
+        mark = '~' if len(sample) < rows else ' '
+        print(f"{rows:>10,}  {mark}{t_slow:>8.2f}s  {t_fast:>9.3f}s  {t_slow / t_fast:6.0f}x  {'yes' if same else 'NO'}")
+    return failures
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmarks for enrich_eu_ev_data.py")
+    ap.add_argument("--part", choices=["rules", "plug", "all"], default="all")
+    ap.add_argument("--rows", type=int, default=20_000, help="Rows for --part rules")
+    ap.add_argument("--linear-sample", type=int, default=2000, help="Rows for the (slow) linear path")
+    ap.add_argument("--rules", type=int, nargs="+", default=[len(ee.EU_EMERGENCY_RELEASE_BY_MODEL), 500, 2000, 5000])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[2_000, 200_000, 2_000_000], help="Rows for --part plug")
+    ap.add_argument("--rowwise-max", type=int, default=200_000,
+                    help="Largest row count run through df.apply (beyond: extrapolated)")
+    args = ap.parse_args()
+
+    failures = 0
+    if args.part in ("rules", "all"):
+        failures += bench_rules(args)
+    if args.part == "all":
+        print()
+    if args.part in ("plug", "all"):
+        failures += bench_plug(args)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
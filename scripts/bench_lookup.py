@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+bench_lookup.py
+
+Benchmark + Differential-Check für build_lookup.py.
+
+1. Suche (--part match): SpecMatcher (Aho-Corasick pro Hersteller, einmal pro (Hersteller, Modell)-Paar)
+vs. bisherige Schleife (pro Zeile normalize + Scan über alle SPECS).
+
+SPECS wird synthetisch auf --specs Einträge vergrößert (neue Marken, Teilstrings
+die Präfix/Suffix anderer Teilstrings sind, spezifische vor generischen
+Einträgen, Duplikate, leere Teilstrings), der Katalog auf --rows Zeilen. Die
+bisherige Schleife läuft auf einer Stichprobe (--linear-sample) und wird auf
+alle Zeilen hochgerechnet (markiert mit ~).
+
+Geprüft wird:
+- jedes eindeutige (Hersteller, Modell)-Paar des Katalogs: matcher.best ==
+  find_spec_linear, mit den echten und den vergrößerten SPECS
+- die Stichprobe: match_specs == matcher pro Zeile == bisherige Schleife
+
+Zeiten: bisherige Schleife, Matcher pro Zeile (ohne Deduplizierung, zeigt
+den Anteil des Automaten) und match_specs (einmal pro Paar).
+
+2. Schreiben (--part fill): fill_specs (eine Zuweisung pro Spalte) vs.
+   fill_specs_rowwise (df.at pro Zelle) auf einem Katalog mit fehlenden Werten,
+   vorhandenen Herkunfts-Tags und alter SOURCE_NOTE in 'Plug Type Source'.
+   Beide Frames müssen identisch sein; ein zweiter Lauf (lookup_specs +
+   fill_specs) darf nichts mehr ändern.
+
+Verwendung:
+    python3 bench_lookup.py
+    python3 bench_lookup.py --part match --specs 10000 --rows 1000000 --linear-sample 20000
+    python3 bench_lookup.py --part fill --rows 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+import build_lookup as bl
+from build_lookup import SPECS, find_spec_linear, match_specs, normalize
+from spec_matcher import SpecMatcher
+
+WORDS = ['e-tron', 'gt', 'sportback', 'long range', 'performance', 'plus', 'pro', 'max', 'awd', 'rwd',
+         '4motion', 'xdrive', 'edrive40', 'id.', 'ioniq', 'ev', 'e+', 'electric', 'hybrid', 'phev']
+
+
+def grow_specs(n: int, seed: int = 0) -> list[tuple]:
+    """SPECS extended to n rows, real rows first (they keep their priority)."""
+    rng = random.Random(seed)
+    specs = list(SPECS)
+    makes = sorted({s[0] for s in SPECS})
+    while len(specs) < n:
+        if rng.random() < 0.02:
+            makes.append(''.join(rng.choice('bcdfghklmnprstvz') + rng.choice('aeiou') for _ in range(3)).title())
+        mfr = rng.choice(makes)
+        r = rng.random()
+        if r < 0.5:
+            model = f"{rng.choice(WORDS)} {rng.randint(1, 99)}"
+        elif r < 0.8:
+            base = rng.choice(specs)[1] or rng.choice(WORDS)
+            model = base[:rng.randint(1, len(base))] if rng.random() < 0.5 else base[rng.randint(0, len(base) - 1):]
+        elif r < 0.995:
+            model = f"{rng.choice(WORDS)} {rng.choice(WORDS)}"
+        else:
+            model = ''
+        num = lambda: rng.choice([None, round(rng.uniform(20, 120), 1)])
+        specs.append((mfr, model, num(), num(), num()))
+    return specs
+
+
+def catalogue(rows: int, specs: list[tuple], seed: int = 1, pairs: int = 50_000) -> pd.DataFrame:
+    rng = random.Random(seed)
+    makes = sorted({s[0] for s in specs}) + ['Unknown', ' BMW ', 'bmw']
+    pool = []
+    for _ in range(pairs):
+        mfr = rng.choice(makes)
+        model = ' '.join(rng.choice(WORDS + [str(rng.randint(1, 99))]) for _ in range(rng.randint(1, 4)))
+        if rng.random() < 0.3:
+            model = f"{rng.choice(specs)[1]} {model}".upper()
+        pool.append((mfr, model if rng.random() > 0.01 else None))
+    picks = np.random.default_rng(seed).integers(0, len(pool), rows)
+    return pd.DataFrame([pool[k] for k in picks], columns=['Manufacturer', 'Model'])
+
+
+def lookup_rowwise(df: pd.DataFrame, specs: list[tuple]) -> list[int]:
+    """Previous loop: per row strip + normalize + scan over all SPECS."""
+    return [find_spec_linear(str(mfr).strip(), normalize(model), specs)
+            for mfr, model in zip(df['Manufacturer'], df['Model'])]
+
+
+def check_pairs(df: pd.DataFrame, specs: list[tuple], matcher: SpecMatcher) -> bool:
+    pairs = {(str(m).strip(), normalize(mo)) for m, mo in zip(df['Manufacturer'], df['Model'])}
+    return all(matcher.best(m, mo) == find_spec_linear(m, mo, specs) for m, mo in pairs)
+
+
+def bench_match(args) -> int:
+    failures = 0
+    specs = grow_specs(args.specs)
+    df = catalogue(args.rows, specs)
+
+    for label, table in [(f"real SPECS ({len(SPECS)})", SPECS), (f"grown SPECS ({len(specs)})", specs)]:
+        same = check_pairs(df.head(200_000), table, SpecMatcher(table))
+        failures += not same
+        print(f"Differential, distinct pairs, {label}: {'OK' if same else 'MISMATCH'}")
+
+    t0 = time.perf_counter()
+    matcher = SpecMatcher(specs)
+    t_build = time.perf_counter() - t0
+
+    sample = df.head(args.linear_sample)
+    t0 = time.perf_counter()
+    slow = lookup_rowwise(sample, specs)
+    t_slow = (time.perf_counter() - t0) * len(df) / len(sample)
+
+    t0 = time.perf_counter()
+    per_row = [matcher.best(str(mfr).strip(), normalize(model))
+               for mfr, model in zip(sample['Manufacturer'], sample['Model'])]
+    t_per_row = (time.perf_counter() - t0) * len(df) / len(sample)
+
+    t0 = time.perf_counter()
+    fast = match_specs(df, matcher, memo_path=None)
+    t_fast = time.perf_counter() - t0
+
+    same = slow == fast[:len(sample)].tolist() == per_row
+    failures += not same
+    print(f"Differential, sample of {len(sample):,} rows: {'OK' if same else 'MISMATCH'}")
+
+    print(f"\n{len(specs):,} SPECS, {len(df):,} rows (automaton build {t_build:.3f}s)")
+    print(f"  previous loop (scan per row)     ~{t_slow:8.1f}s")
+    print(f"  matcher per row (no dedup)       ~{t_per_row:8.1f}s  {t_slow / t_per_row:6.0f}x")
+    print(f"  match_specs (per distinct pair)   {t_fast:8.2f}s  {t_slow / t_fast:6.0f}x")
+    return failures
+
+
+def fill_frame(rows: int, specs: list[tuple], seed: int = 4) -> pd.DataFrame:
+    """catalogue() plus spec columns with gaps, existing tags and old SOURCE_NOTE suffixes."""
+    df = catalogue(rows, specs, seed=seed)
+    rng = np.random.default_rng(seed)
+    for col, _, _ in bl.SPEC_FIELDS:
+        df[col] = np.where(rng.random(rows) < 0.4, np.nan, rng.integers(10, 100, rows).astype(float))
+    df['Plug Type Source'] = np.array(['src a', 'src b', np.nan, 'nan | ' + bl.SOURCE_NOTE,
+                                       'src a | ' + bl.SOURCE_NOTE + ' | ' + bl.SOURCE_NOTE],
+                                      dtype=object)[rng.integers(0, 5, rows)]
+    df[bl.SPEC_SOURCE_COLUMN] = np.array([np.nan, np.nan, 'specs:ac', 'specs:bat,dc', 'manual'],
+                                         dtype=object)[rng.integers(0, 5, rows)]
+    return df
+
+
+def bench_fill(args) -> int:
+    failures = 0
+    specs = grow_specs(args.specs)
+    matcher = SpecMatcher(specs)
+
+    # ohne Herkunftsspalte und ohne 'Plug Type Source'
+    edge = fill_frame(5000, specs, seed=9).drop(columns=[bl.SPEC_SOURCE_COLUMN, 'Plug Type Source'])
+    for label, df in [('full', fill_frame(5000, specs, seed=8)), ('no tag/source columns', edge)]:
+        rules = bl.lookup_specs(df, matcher, memo_path=None)
+        a, b = df.copy(), df.copy()
+        same = bl.fill_specs(a, rules, specs) == bl.fill_specs_rowwise(b, rules, specs) and a.equals(b)
+        failures += not same
+        print(f"Differential, fill ({label}): {'OK' if same else 'MISMATCH'}")
+
+    df = fill_frame(args.rows, specs)
+    rules = bl.lookup_specs(df, matcher, memo_path=None)
+    sample = df.head(args.linear_sample).copy()
+
+    t0 = time.perf_counter()
+    slow = bl.fill_specs_rowwise(sample, rules[:len(sample)], specs)
+    t_slow = (time.perf_counter() - t0) * len(df) / len(sample)
+
+    t0 = time.perf_counter()
+    counts = bl.fill_specs(df, rules, specs)
+    t_fast = time.perf_counter() - t0
+
+    same = df.head(len(sample)).equals(sample)
+    failures += not same
+    print(f"Differential, fill sample of {len(sample):,} rows: {'OK' if same else 'MISMATCH'}")
+
+    before = df.copy()
+    t0 = time.perf_counter()
+    again = bl.fill_specs(df, bl.lookup_specs(df, matcher, memo_path=None), specs)
+    t_again = time.perf_counter() - t0
+    idempotent = again == (0, 0, 0, 0) and df.equals(before)
+    failures += not idempotent
+    print(f"Second run changes nothing: {'OK' if idempotent else 'NO'} {again}")
+
+    print(f"\n{len(df):,} rows, filled bat/ac/dc {counts[:3]}, retagged {counts[3]:,}")
+    print(f"  fill_specs_rowwise (df.at)       ~{t_slow:8.1f}s")
+    print(f"  fill_specs (per column)           {t_fast:8.2f}s  {t_slow / t_fast:6.0f}x")
+    print(f"  second run (lookup + fill)        {t_again:8.2f}s")
+    return failures
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmarks for build_lookup.py")
+    ap.add_argument("--part", choices=["match", "fill", "all"], default="all")
+    ap.add_argument("--specs", type=int, default=10_000)
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--linear-sample", type=int, default=20_000, help="Rows for the (slow) per-row paths")
+    args = ap.parse_args()
+
+    failures = 0
+    if args.part in ("match", "all"):
+        failures += bench_match(args)
+    if args.part == "all":
+        print()
+    if args.part in ("fill", "all"):
+        failures += bench_fill(args)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
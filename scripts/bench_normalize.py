@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+bench_normalize.py
+
+Differential-Check + Benchmark: vektorisierte Normalisierung (normalize_frame)
+vs. bisheriger zeilenweiser Pfad (normalize_frame_rowwise) aus normalize_eu_data.py.
+
+1. Differential-Check: beide Pfade auf synthetischen Rohdaten inkl. Randfällen
+   (NaN, leere Strings, "1_000", "2023.0", wiederholtes erstes Wort, Suffix-Hersteller,
+   Unicode-Ziffern ...), pro Spalte und als fertige CSV aus normalize_csv()
+2. Benchmark: Laufzeit beider Pfade bei 10x und 100x der Basiszeilen, vektorisiert
+   zusätzlich mit warmem Kanonisierungs-Memo (canonicalize.py)
+
+Verwendung:
+    python3 bench_normalize.py
+    python3 bench_normalize.py --base-rows 2000 --scales 1 10 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import time
+
+import pandas as pd
+
+import normalize_eu_data as ne
+
+
+# ============================================================================
+# SYNTHETISCHE ROHDATEN
+# ============================================================================
+
+MAKES = ['Tesla', 'BMW', 'CUPRA', 'Volkswagen', 'Kia', 'Hyundai', 'MGMG', 'Ład', 'Polestar', 'Audi',
+         'Mercedes-Benz', ' Renault ', '', None]
+MODELS = ['Model 3 Long Range', 'iX3', 'Born 150 kW - 58 kWh CUPRA Born', 'ID.3 Pro S', 'EV6 GT',
+          'Ioniq 5 (Facelift)', '4 Trophy (MY22-24)', 'Model Y (Juniper)', 'Q4 e-tron (MY2024)',
+          'Born Born', 'born Born 77 kWh', 'EQA 250+', '2 Long Range Dual Motor', '  ', None,
+          'Megane E-Tech 60 kWh Optimum Charge', 'Niro EV 64.8 kWh', 'X X X', 'Model S Plaid Tesla']
+YEARS = [2024, 2023, 2025, '2022', ' 2021 ', '2023.0', 1999, 2031, None, 'n/a', '1_999', '٢٠٢٣', 2026.7]
+NUMBERS = [77.0, 58, 11, 7.4, 150, 250, 0, -5, None, '', '64,8', ' 82.5 ', '1e2', 'inf', 'nan',
+           '1_0', 22.0, 3, 350, 400, 9.99]
+
+
+def synthetic_raw(rows: int, seed: int = 0, mixed: bool = True) -> pd.DataFrame:
+    """Raw scrape-like frame; `mixed` adds string garbage into the numeric columns."""
+    rng = random.Random(seed)
+    numbers = NUMBERS if mixed else [n for n in NUMBERS if not isinstance(n, str)]
+    years = YEARS if mixed else [y for y in YEARS if not isinstance(y, str)]
+
+    def model(make):
+        m = rng.choice(MODELS)
+        if m and make and rng.random() < 0.15:
+            m = m + make.strip()  # "iX3BMW"
+        return m
+
+    makes = [rng.choice(MAKES) for _ in range(rows)]
+    return pd.DataFrame({
+        'Manufacturer': makes,
+        'Model': [model(mk) for mk in makes],
+        'Model Year': [rng.choice(years) for _ in range(rows)],
+        'Battery Capacity kWh': [rng.choice(numbers) for _ in range(rows)],
+        'Charging Rate Level 2 (kW)': [rng.choice(numbers) for _ in range(rows)],
+        'Charging Rate DC Fast (kW)': [rng.choice(numbers) for _ in range(rows)],
+    })
+
+
+# ============================================================================
+# DIFFERENTIAL CHECK
+# ============================================================================
+
+def _same(a: pd.Series, b: pd.Series) -> bool:
+    a = a.astype(object).where(a.notna(), None)
+    b = b.astype(object).where(b.notna(), None)
+    return a.tolist() == b.tolist()
+
+
+def check_columns(df: pd.DataFrame, memo_path: str | None = None) -> list[str]:
+    with contextlib.redirect_stdout(io.StringIO()):
+        slow = ne.normalize_frame_rowwise(df.copy())
+        fast = ne.normalize_frame(df.copy(), memo_path)
+    return [c for c in slow.columns if not _same(slow[c], fast[c])]
+
+
+def check_csv(df: pd.DataFrame) -> bool:
+    """normalize_csv() end to end: byte-identical output files."""
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = os.path.join(tmp, 'raw.csv')
+        df.to_csv(raw, index=False)
+        outputs = []
+        for vectorized in (False, True):
+            out = os.path.join(tmp, f'out_{vectorized}.csv')
+            with contextlib.redirect_stdout(io.StringIO()):
+                ne.normalize_csv(raw, out, vectorized=vectorized, memo_path=None)
+            with open(out, 'rb') as f:
+                outputs.append(f.read())
+    return outputs[0] == outputs[1]
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def timed(fn, df: pd.DataFrame, *args) -> float:
+    data = df.copy()
+    t0 = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn(data, *args)
+    return time.perf_counter() - t0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Vectorized vs. row-wise normalize_eu_data")
+    ap.add_argument("--base-rows", type=int, default=2000, help="Rows of a typical raw scrape")
+    ap.add_argument("--scales", type=int, nargs="+", default=[10, 100], help="Multiples of --base-rows")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    failures = 0
+    print("Differential-Check:")
+    for label, df in [('in-memory, mixed types', synthetic_raw(5000, args.seed)),
+                      ('in-memory, clean numeric', synthetic_raw(5000, args.seed + 1, mixed=False))]:
+        bad = check_columns(df)
+        failures += bool(bad)
+        print(f"  {label:<28} {'OK' if not bad else 'MISMATCH in ' + ', '.join(bad)}")
+    with tempfile.TemporaryDirectory() as tmp:
+        memo_path = os.path.join(tmp, 'memo.sqlite')
+        for label in ('memo cold', 'memo warm'):
+            bad = check_columns(synthetic_raw(5000, args.seed), memo_path)
+            failures += bool(bad)
+            print(f"  {'in-memory, ' + label:<28} {'OK' if not bad else 'MISMATCH in ' + ', '.join(bad)}")
+    for label, df in [('CSV end to end, mixed', synthetic_raw(5000, args.seed + 2)),
+                      ('CSV end to end, clean', synthetic_raw(5000, args.seed + 3, mixed=False))]:
+        ok = check_csv(df)
+        failures += not ok
+        print(f"  {label:<28} {'OK' if ok else 'MISMATCH'}")
+
+    print("\nBenchmark (Schritte 1–5, CSV-Dtypes):")
+    print(f"  {'rows':>10}  {'row-wise':>10}  {'vectorized':>10}  {'memo warm':>10}  speedup")
+    with tempfile.TemporaryDirectory() as tmp:
+        for scale in args.scales:
+            rows = args.base_rows * scale
+            path = os.path.join(tmp, 'raw.csv')
+            synthetic_raw(rows, args.seed, mixed=False).to_csv(path, index=False)
+            df = pd.read_csv(path, low_memory=False)  # wie normalize_csv
+            slow = timed(ne.normalize_frame_rowwise, df)
+            fast = timed(ne.normalize_frame, df)
+            memo_path = os.path.join(tmp, 'memo.sqlite')
+            timed(ne.normalize_frame, df, memo_path)
+            warm = timed(ne.normalize_frame, df, memo_path)
+            print(f"  {rows:>10,}  {slow:>9.2f}s  {fast:>9.3f}s  {warm:>9.3f}s  {slow / fast:6.1f}x")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
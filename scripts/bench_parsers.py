@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+bench_parsers.py
+
+Benchmark: schneller Parser-Pfad (fast_parse) vs. bisheriger BeautifulSoup-Pfad
+für Listing-Seiten (extract_vehicles_from_page) und Detail-Seiten
+(extract_specs_from_detail_html).
+
+Misst ms/Seite und Peak-Memory (tracemalloc) pro Pfad und prüft, dass beide
+Pfade dieselben Ergebnisse liefern.
+
+Fixtures: gespeicherte HTML-Dateien oder Verzeichnisse (z.B. objects/ eines
+--cache-dir). Ohne Fixtures werden synthetische Seiten erzeugt.
+
+Verwendung:
+    python3 bench_parsers.py
+    python3 bench_parsers.py --listing saved/listing/ --detail saved/detail/ --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import time
+import tracemalloc
+
+from fast_parse import LISTING_PARSER
+from scrape_ev_database_v4 import extract_vehicles_from_page
+from enrich_from_detail_pages_v5 import extract_specs_from_detail_html
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+def load_fixtures(paths: list[str]) -> list[str]:
+    pages = []
+    for path in paths:
+        files = [path] if os.path.isfile(path) else sorted(
+            os.path.join(root, f) for root, _, names in os.walk(path) for f in names
+        )
+        for file in files:
+            with open(file, 'r', encoding='utf-8', errors='replace') as f:
+                pages.append(f.read())
+    return pages
+
+
+def _noise(n: int) -> str:
+    block = (
+        '<div class="row"><div class="col"><img src="/img/x.jpg" alt=""/>'
+        '<p class="info">Range 420 km &amp; efficiency 171 Wh/km</p>'
+        '<ul><li>Seats 5</li><li>Tow hitch possible</li></ul></div></div>\n'
+    )
+    return block * n
+
+
+def synthetic_listing_page(page_num: int) -> str:
+    links = []
+    for k in range(50):
+        cid = page_num * 50 + k
+        links.append(
+            f'<div class="list-item"><a class="title" href="/car/{cid}/Brand-Model-{cid}-{40 + k}-kWh">'
+            f'<span>Brand{k % 7}</span><span>Model {cid} ({k % 3 + 1}-gen)</span></a>'
+            f'<span class="battery">{40 + k} kWh</span>{_noise(20)}</div>'
+        )
+    return (f'<html><head><title>EV Database</title><style>.a{{color:red}}</style>'
+            f'<script>var cfg = {{"kW DC": 999}};</script></head><body>'
+            f'{"".join(links)}</body></html>')
+
+
+def synthetic_detail_page(i: int) -> str:
+    return (
+        '<html><head><script>window.data = "500 kWh 999 kW DC";</script>'
+        '<style>td::after { content: "88 kW AC"; }</style></head><body>'
+        f'{_noise(150)}<!-- 777 kWh comment -->'
+        f'<table><tr><td>Useable Battery</td><td>{60 + i % 40}.5 kWh Useable</td></tr>'
+        f'<tr><td>Charge Power</td><td>{11 if i % 2 else 22} kW AC</td></tr>'
+        f'<tr><td>Charge Power (max)</td><td>{100 + i % 150} kW DC</td></tr></table>'
+        f'{_noise(150)}</body></html>'
+    )
+
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+def measure(fn, pages: list, repeat: int) -> tuple[float, float, list]:
+    """(ms per page [median of runs], peak MiB for one pass, results of last run)"""
+    timings = []
+    results = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            results = [fn(p) for p in pages]
+            timings.append((time.perf_counter() - t0) * 1000 / max(1, len(pages)))
+
+        tracemalloc.start()
+        for p in pages:
+            fn(p)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return statistics.median(timings), peak / 1024 / 1024, results
+
+
+def report(name: str, pages: list, fast_fn, slow_fn, repeat: int) -> None:
+    fast_ms, fast_mem, fast_res = measure(fast_fn, pages, repeat)
+    slow_ms, slow_mem, slow_res = measure(slow_fn, pages, repeat)
+    mismatches = sum(1 for a, b in zip(fast_res, slow_res) if a != b)
+
+    print(f"{name} ({len(pages)} Seiten, {sum(map(len, pages)) / max(1, len(pages)) / 1024:.0f} KiB/Seite)")
+    print(f"  {'bs4 html.parser':<22} {slow_ms:8.2f} ms/page   peak {slow_mem:7.2f} MiB")
+    print(f"  {'fast':<22} {fast_ms:8.2f} ms/page   peak {fast_mem:7.2f} MiB")
+    print(f"  Speedup: {slow_ms / fast_ms if fast_ms else 0:.1f}x   Abweichende Ergebnisse: {mismatches}\n")
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark fast vs. BeautifulSoup HTML parsing")
+    ap.add_argument('--listing', nargs='*', default=[], help='Listing page fixtures (files or directories)')
+    ap.add_argument('--detail', nargs='*', default=[], help='Detail page fixtures (files or directories)')
+    ap.add_argument('--synthetic', type=int, default=20, help='Synthetic pages per type if no fixtures given')
+    ap.add_argument('--repeat', type=int, default=3, help='Timing runs (median is reported)')
+    args = ap.parse_args()
+
+    listing = load_fixtures(args.listing) or [synthetic_listing_page(i) for i in range(args.synthetic)]
+    detail = load_fixtures(args.detail) or [synthetic_detail_page(i) for i in range(args.synthetic)]
+
+    print(f"Listing fast path tokenizer: {LISTING_PARSER}\n")
+
+    report("Listing", listing,
+           lambda h: extract_vehicles_from_page(h, 0, fast=True),
+           lambda h: extract_vehicles_from_page(h, 0, fast=False), args.repeat)
+    report("Detail", detail,
+           lambda h: extract_specs_from_detail_html(h, fast=True),
+           lambda h: extract_specs_from_detail_html(h, fast=False), args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+bench_split.py
+
+Benchmark + Differential-Check für fix_eu_data.split_manufacturer_model:
+Präfix-/Suffix-Trie (brand_trie.py) vs. bisherige lineare Suche über die nach
+Länge sortierte Herstellerliste.
+
+Die Herstellerliste wird schrittweise um chinesische OEMs, Sub-Marken
+(teils mit gemeinsamen Präfixen wie "Geely" / "Geely Galaxy") und synthetische
+Marken auf einige hundert bis tausend Namen erweitert. Pro Größe:
+- identische (Manufacturer, Model)-Paare beider Varianten auf Strings mit
+  Präfix-Treffer, Suffix-Hersteller ("iX3BMW"), leerem Rest und Fallbacks
+- Zeit für alle Strings (pro Aufruf, ohne Deduplizierung)
+
+Verwendung:
+    python3 bench_split.py
+    python3 bench_split.py --strings 50000 --sizes 55 200 500 1000 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from brand_trie import BrandTrie
+from fix_eu_data import MANUFACTURERS, split_manufacturer_model, split_manufacturer_model_linear
+
+CHINESE_OEMS = [
+    'BYD', 'Denza', 'Fangchengbao', 'Yangwang', 'NIO', 'Onvo', 'Firefly', 'Li Auto', 'Zeekr',
+    'Lynk & Co', 'Geely', 'Geely Galaxy', 'Smart', 'Leapmotor', 'Aito', 'Avatr', 'Deepal',
+    'Changan', 'Changan Nevo', 'Great Wall', 'Haval', 'Wey', 'Tank', 'Chery', 'Exeed', 'Jaecoo',
+    'Omoda', 'iCar', 'GAC Aion', 'Hyptec', 'FAW', 'Voyah', 'Dongfeng', 'Dongfeng Nammi',
+    'Forthing', 'Roewe', 'IM Motors', 'Rising Auto', 'Neta', 'Hozon', 'Jetour', 'Xiaomi',
+    'Seres', 'Skyworth', 'Wuling', 'Baojun', 'JAC', 'Luxeed', 'Stelato', 'Maextro', 'Zhijie',
+]
+MODELS = ['Model 3', 'iX3', 'Born', 'Seal U DM-i', 'ET5 Touring', '001', 'Atto 3', 'Dolphin Surf',
+          'EX30', 'C10', 'Song Plus', 'Mini EV', 'Galaxy E5', 'Nevo A07', '07']
+
+
+def brand_list(size: int, seed: int = 0) -> list[str]:
+    """MANUFACTURERS + Chinese OEMs + synthetic brands/sub-brands, `size` names in total."""
+    rng = random.Random(seed)
+    names = list(dict.fromkeys(MANUFACTURERS + CHINESE_OEMS))
+    while len(names) < size:
+        base = rng.choice(names) if rng.random() < 0.3 else ''.join(
+            rng.choice('bcdfghjklmnprstvwxz') + rng.choice('aeiou') for _ in range(rng.randint(2, 4))).title()
+        name = f"{base} {rng.choice(['Auto', 'EV', 'Motors', 'Pro', 'e'])}" if base in names else base
+        if name not in names:
+            names.append(name)
+    return names[:size]
+
+
+def sample_strings(brands: list[str], n: int, seed: int = 1) -> list:
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        mfr = rng.choice(brands)
+        r = rng.random()
+        if r < 0.6:
+            out.append(mfr + rng.choice(MODELS))
+        elif r < 0.75:
+            out.append(mfr + rng.choice(MODELS) + rng.choice(brands))  # Suffix-Hersteller
+        elif r < 0.8:
+            out.append(f"  {mfr} {rng.choice(MODELS)} ")
+        elif r < 0.85:
+            out.append(mfr)  # leerer Rest → kürzere Präfixe / Fallback
+        elif r < 0.95:
+            out.append('x' + rng.choice(MODELS) + 'Unknown Brand')
+        else:
+            out.append(rng.choice([None, '', 'ab', 'TeslaTesla', float('nan')]))
+    return out
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Trie vs. linear manufacturer/model splitting")
+    ap.add_argument("--strings", type=int, default=20_000, help="Strings per brand-list size")
+    ap.add_argument("--sizes", type=int, nargs="+", default=[len(MANUFACTURERS), 200, 500, 1000])
+    args = ap.parse_args()
+
+    failures = 0
+    print(f"{'brands':>7}  {'linear':>9}  {'trie':>9}  speedup  identical")
+    for size in args.sizes:
+        brands = brand_list(size)
+        prefix, suffix = BrandTrie(brands), BrandTrie(brands, suffix=True)
+        strings = sample_strings(brands, args.strings)
+
+        t0 = time.perf_counter()
+        linear = [split_manufacturer_model_linear(s, brands) for s in strings]
+        t_linear = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        trie = [split_manufacturer_model(s, prefix, suffix) for s in strings]
+        t_trie = time.perf_counter() - t0
+
+        same = linear == trie
+        failures += not same
+        print(f"{len(brands):>7}  {t_linear:>8.2f}s  {t_trie:>8.3f}s  {t_linear / t_trie:6.1f}x  {'yes' if same else 'NO'}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
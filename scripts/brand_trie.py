@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+brand_trie.py
+
+Präfix-/Suffix-Trie über Herstellernamen für fix_eu_data.split_manufacturer_model.
+
+Statt die Herstellerliste bei jedem Aufruf nach Länge zu sortieren und linear
+mit startswith/endswith zu prüfen, wird sie einmal in einen Trie übernommen
+(für Suffixe über die umgedrehten Namen). matches() läuft einmal über den
+Anfang bzw. das Ende des Strings und liefert alle passenden Namen, längster
+zuerst, wie die bisherige Schleife über sorted(..., key=-len). Der Aufwand
+hängt damit von der Länge des Treffers ab, nicht von der Anzahl der Hersteller.
+"""
+
+from __future__ import annotations
+
+from typing import Iterable
+
+_END = None  # Schlüssel für "hier endet ein Name"
+
+
+class BrandTrie:
+    """Trie over brand names; matches() returns the prefixes (or suffixes) of a text, longest first."""
+
+    def __init__(self, names: Iterable[str], suffix: bool = False):
+        self.suffix = suffix
+        self.root: dict = {}
+        self.size = 0
+        for name in names:
+            if not name:
+                continue
+            node = self.root
+            for ch in (reversed(name) if suffix else name):
+                node = node.setdefault(ch, {})
+            if _END not in node:
+                node[_END] = name
+                self.size += 1
+
+    def matches(self, text: str) -> list[str]:
+        """All names text starts with (suffix=False) or ends with (suffix=True), longest first."""
+        found = []
+        node = self.root
+        for ch in (reversed(text) if self.suffix else text):
+            node = node.get(ch)
+            if node is None:
+                break
+            if _END in node:
+                found.append(node[_END])
+        found.reverse()
+        return found
+
+    def __len__(self) -> int:
+        return self.size
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+canonicalize.py
+
+Kanonisierung von Hersteller-/Modellnamen über eindeutige Werte statt Zeilen.
+
+Die Roh-Scrapes wiederholen dieselben Strings über viele Zeilen; normalize_model,
+split_manufacturer_model (fix_eu_data.py) und normalize (build_lookup.py)
+rechnen ihre Regexe trotzdem pro Zeile. map_unique():
+
+- faktorisiert die Eingabespalte(n) (pd.factorize, Categoricals direkt über ihre
+  Codes), bei object-Spalten zusätzlich nach Typ (3 und '3' bleiben getrennt)
+- ruft die Funktion einmal pro eindeutigem Wert bzw. Wertetupel auf
+  (oder einmal für alle eindeutigen Werte mit batch=True)
+- verteilt die Ergebnisse per Code zurück auf die Zeilen
+
+Optional merkt sich ein Memo (SQLite, .canon_memo.sqlite; die Skripte legen es
+per memo_path_for() neben ihre Output-Datei, nicht ins Arbeitsverzeichnis) die
+Ergebnisse über Läufe hinweg. Jede Tabelle im Memo trägt einen Fingerprint aus dem Quelltext
+der Funktion und ihrer Daten (z. B. Herstellerliste); ändert sich dieser,
+wird die Tabelle beim Öffnen geleert.
+
+Verwendung:
+    from canonicalize import map_unique, open_memo
+    memo = open_memo('split_manufacturer_model', split_manufacturer_model, MANUFACTURERS)
+    mfr, model = map_unique(split_manufacturer_model, df['Manufacturer'], memo=memo, unpack=2)
+    memo.close()
+"""
+
+from __future__ import annotations
+
+import hashlib
+import inspect
+import json
+import math
+import os
+import sqlite3
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MEMO_PATH = '.canon_memo.sqlite'  # relativ: Arbeitsverzeichnis
+
+
+def memo_path_for(output_file: str) -> str:
+    """Memo file next to output_file (like <output>.journal.jsonl in the enrichment)."""
+    return os.path.join(os.path.dirname(os.path.abspath(output_file)), DEFAULT_MEMO_PATH)
+
+_type_of = np.frompyfunc(type, 1, 1)
+
+
+def fingerprint(*depends_on) -> str:
+    """Hash over the source of functions/modules and the repr of data the result depends on."""
+    h = hashlib.sha256()
+    for obj in depends_on:
+        if inspect.isfunction(obj) or inspect.ismodule(obj) or inspect.isclass(obj):
+            try:
+                text = inspect.getsource(obj)
+            except (OSError, TypeError):
+                text = f"{obj.__qualname__}:{obj.__code__.co_code.hex()}" if hasattr(obj, '__code__') else repr(obj)
+        else:
+            text = repr(obj)
+        h.update(text.encode('utf-8'))
+        h.update(b'\0')
+    return h.hexdigest()[:16]
+
+
+class CanonMemo:
+    """On-disk memo of one canonicalization function: JSON key tuple → JSON result."""
+
+    def __init__(self, path: str, name: str, version: str):
+        self.path = path
+        self.name = name
+        self.version = version
+        self.stats = {'hit': 0, 'computed': 0}
+        self._db = sqlite3.connect(path)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS versions (
+                name TEXT PRIMARY KEY,
+                version TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS memo (
+                name TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                PRIMARY KEY (name, key)
+            );
+        """)
+        row = self._db.execute("SELECT version FROM versions WHERE name = ?", (name,)).fetchone()
+        if row is None or row[0] != version:
+            self._db.execute("DELETE FROM memo WHERE name = ?", (name,))
+            self._db.execute("INSERT OR REPLACE INTO versions VALUES (?, ?)", (name, version))
+            self._db.commit()
+        self._cache = {
+            key: _decode(value)
+            for key, value in self._db.execute("SELECT key, value FROM memo WHERE name = ?", (name,))
+        }
+
+    def get(self, key: tuple, default=None):
+        encoded = _encode_key(key)
+        if encoded is None or encoded not in self._cache:
+            return default
+        self.stats['hit'] += 1
+        return self._cache[encoded]
+
+    def update(self, results: dict[tuple, object]) -> None:
+        rows = []
+        for key, value in results.items():
+            encoded = _encode_key(key)
+            if encoded is None:
+                continue
+            self._cache[encoded] = value
+            rows.append((self.name, encoded, json.dumps(value, ensure_ascii=False)))
+        self.stats['computed'] += len(results)
+        if rows:
+            self._db.executemany("INSERT OR REPLACE INTO memo VALUES (?, ?, ?)", rows)
+            self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def summary(self) -> str:
+        return f"{self.name}: {self.stats['hit']:,} from memo, {self.stats['computed']:,} computed"
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def open_memo(name: str, *depends_on, path: str | None = DEFAULT_MEMO_PATH) -> CanonMemo | None:
+    """Memo table `name`, reset whenever fingerprint(*depends_on) changes; None if path is None."""
+    if path is None:
+        return None
+    return CanonMemo(path, name, fingerprint(*depends_on))
+
+
+def _encode_key(key: tuple) -> str | None:
+    """JSON for keys made of str/int/float/bool/None; None (= not memoizable) otherwise."""
+    for v in key:
+        if v is None or isinstance(v, (str, bool)):
+            continue
+        if type(v) in (int, float) and not (type(v) is float and not math.isfinite(v)):
+            continue
+        return None
+    return json.dumps(list(key), ensure_ascii=False)
+
+
+def _decode(value: str):
+    v = json.loads(value)
+    return tuple(v) if isinstance(v, list) else v
+
+
+def unique_codes(*columns: pd.Series) -> tuple[np.ndarray, np.ndarray]:
+    """(codes, first): per row the ID of its distinct value tuple, and one row position per ID."""
+    codes = None
+    for col in columns:
+        parts = [col]
+        if col.dtype == object and pd.api.types.infer_dtype(col, skipna=True) not in ('string', 'empty'):
+            parts.append(pd.Series(_type_of(col.to_numpy()), index=col.index))
+        for part in parts:
+            c, uniques = pd.factorize(part, use_na_sentinel=False)
+            codes = c if codes is None else pd.factorize(codes * len(uniques) + c)[0]
+    codes = codes.astype('int64', copy=False)
+    first = np.empty(codes.max() + 1 if len(codes) else 0, dtype='int64')
+    first[codes[::-1]] = np.arange(len(codes) - 1, -1, -1)  # letzter Schreibzugriff = erstes Vorkommen
+    return codes, first
+
+
+def map_unique(fn: Callable, *columns: pd.Series, memo: CanonMemo | None = None,
+               batch: bool = False, unpack: int = 0, categorical: bool = False):
+    """
+    fn(*row_values) for every row, evaluated once per distinct value tuple.
+
+    batch=True: fn receives one Series per column with the distinct (not yet
+    memoized) values and returns an aligned Series.
+    unpack=n: fn returns n-tuples; the result is a tuple of n Series.
+    categorical=True: result as pandas Categorical (no per-row objects).
+    """
+    codes, first = unique_codes(*columns)
+    keys = list(zip(*(col.iloc[first].tolist() for col in columns)))
+    results = np.empty(len(keys), dtype=object)
+    missing = object()
+
+    todo = []
+    for j, key in enumerate(keys):
+        hit = memo.get(key, missing) if memo is not None else missing
+        if hit is missing:
+            todo.append(j)
+        else:
+            results[j] = hit
+    if todo:
+        if batch:
+            rows = first[todo]
+            out = fn(*(col.iloc[rows].reset_index(drop=True) for col in columns)).tolist()
+        else:
+            out = [fn(*keys[j]) for j in todo]
+        for j, value in zip(todo, out):
+            results[j] = value
+        if memo is not None:
+            memo.update({keys[j]: results[j] for j in todo})
+
+    index = columns[0].index
+    if categorical:
+        values, categories = pd.factorize(pd.Series(results, dtype=object))
+        return pd.Series(pd.Categorical.from_codes(values[codes], categories=categories), index=index)
+    if unpack:
+        return tuple(
+            pd.Series(np.array([r[k] for r in results], dtype=object)[codes], index=index, dtype=object)
+            for k in range(unpack)
+        )
+    return pd.Series(results[codes], index=index, dtype=object)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+columnar.py
+
+Typisierter Spalten-Writer für seitenweise JSON-Ergebnisse (Discodata).
+
+Statt alle Zeilen als list[dict] zu sammeln und erst am Ende einen DataFrame
+zu bauen, wird jede Seite sofort in Spalten übernommen:
+
+- 'category': Strings werden auf int32-Codes abgebildet (ein Dict pro Spalte),
+  gespeichert in array('i'); jeder Wert liegt also nur einmal im Speicher,
+  None/NaN wird zu Code -1 (fehlender Wert)
+- 'int' / 'float': array('q') / array('d') (None → NaN bei float)
+- Duplikate (über alle Spalten) werden beim Einfügen verworfen, nicht erst
+  nach dem vollständigen Download. Dafür bleibt pro eindeutiger Zeile ein
+  8-Byte-Digest (blake2b der kodierten Zeile) im Speicher – die einzige
+  Struktur neben den Spalten selbst, die mit der Zahl der eindeutigen Zeilen
+  wächst; Kollisionen sind bei 64 Bit praktisch ausgeschlossen. NaN-Werte
+  gelten dabei als gleich (wie bei drop_duplicates)
+
+to_frame() liefert pandas Categoricals mit sortierten Kategorien, d. h.
+sort_values() sortiert wie auf den ursprünglichen Strings.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import struct
+from array import array
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarWriter:
+    """Appends pages of row dicts into typed column arrays, optionally de-duplicating."""
+
+    _ARRAY_CODES = {'category': 'i', 'int': 'q', 'float': 'd'}
+
+    def __init__(self, column_types: dict[str, str], dedupe: bool = True):
+        for col, kind in column_types.items():
+            if kind not in self._ARRAY_CODES:
+                raise ValueError(f"Unknown column type {kind!r} for {col}")
+        self.column_types = dict(column_types)
+        self.dedupe = dedupe
+        self.columns = {col: array(self._ARRAY_CODES[kind]) for col, kind in column_types.items()}
+        self.categories: dict[str, dict[str, int]] = {
+            col: {} for col, kind in column_types.items() if kind == 'category'
+        }
+        self.present: set[str] = set()
+        self.rows_in = 0
+        self.duplicates = 0
+        self._row = struct.Struct('<' + ''.join(self._ARRAY_CODES[k] for k in self.column_types.values()))
+        self._seen: set[bytes] = set()  # 8-Byte-Digests statt ganzer Zeilen
+
+    def _encode(self, col: str, value):
+        kind = self.column_types[col]
+        if kind == 'category':
+            if value is None or value != value:  # None / NaN
+                return -1
+            codes = self.categories[col]
+            value = str(value).strip()  # wie bisher astype(str).str.strip()
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(codes)
+            return code
+        if kind == 'int':
+            return int(value)
+        return float('nan') if value is None else float(value)
+
+    def add(self, rows: list[dict]) -> int:
+        """Append one page; returns the number of new (non-duplicate) rows."""
+        added = 0
+        cols = list(self.column_types)
+        for row in rows:
+            self.rows_in += 1
+            self.present.update(c for c in cols if c in row)
+            encoded = tuple(self._encode(c, row.get(c)) for c in cols)
+            if self.dedupe:
+                digest = hashlib.blake2b(self._row.pack(*encoded), digest_size=8).digest()
+                if digest in self._seen:
+                    self.duplicates += 1
+                    continue
+                self._seen.add(digest)
+            for c, v in zip(cols, encoded):
+                self.columns[c].append(v)
+            added += 1
+        return added
+
+    def __len__(self) -> int:
+        return self.rows_in - self.duplicates
+
+    def to_frame(self) -> pd.DataFrame:
+        """DataFrame of all kept rows; columns that never occurred in the input are left out."""
+        data = {}
+        for col, kind in self.column_types.items():
+            if col not in self.present:
+                continue
+            values = np.frombuffer(self.columns[col], dtype=self.columns[col].typecode) \
+                if len(self.columns[col]) else np.array([], dtype=self.columns[col].typecode)
+            if kind == 'category':
+                labels = np.array(list(self.categories[col]), dtype=object)
+                order = np.argsort(labels, kind='stable')
+                remap = np.empty(len(order), dtype=np.int32)
+                remap[order] = np.arange(len(order), dtype=np.int32)
+                codes = np.where(values >= 0, remap[np.maximum(values, 0)], -1) if len(remap) else values
+                data[col] = pd.Categorical.from_codes(codes.astype(np.int32), categories=labels[order])
+            else:
+                data[col] = values.astype(np.int64 if kind == 'int' else np.float64)
+        return pd.DataFrame(data)
+
+    def summary(self) -> str:
+        return f"{self.rows_in:,} rows received, {self.duplicates:,} duplicates dropped, {len(self):,} kept"
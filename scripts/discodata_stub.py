@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+discodata_stub.py
+
+Lokaler Ersatz für den Discodata SQL-Endpunkt (https://discodata.eea.europa.eu/sql)
+zum Testen und Benchmarken ohne Netzwerk.
+
+- Gleicher Vertrag: GET /sql?query=<SQL>&p=<Seite>&nrOfHits=<Seitengröße>
+- Antwort {"results": [...]} bzw. {"errors": [{"error": "...", "errorcode": ...}]}
+- SQLite statt SQL Server: [CO2Emission].[latest].[co2cars] wird auf die
+  lokale Tabelle co2cars abgebildet, Paging per LIMIT/OFFSET
+- Tabelle co2cars wird synthetisch erzeugt (Year, Status, Mk, Cn, Ft, Fm, Zr, r,
+  Ewltp), Größe und Seed sind einstellbar
+- Optional künstliche Latenz pro Request, damit Paging/Parallelität realistisch messbar sind
+- Optional (--shuffle) liefert jede Ausführung einer Abfrage ohne ORDER BY die
+  Zeilen in anderer Reihenfolge, wie es SQL Server darf; Paging ohne ORDER BY
+  verliert bzw. verdoppelt dann Zeilen
+
+Verwendung:
+    python3 discodata_stub.py --rows 200000 --port 8765 --latency 0.1
+    python3 download_eu_plugins_discodata.py --base-url http://127.0.0.1:8765/sql --years 2021 2024
+
+    # oder per Umgebungsvariable
+    DISCODATA_BASE_URL=http://127.0.0.1:8765/sql python3 download_eu_plugins_discodata.py ...
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+TABLE_RE = re.compile(r'\[CO2Emission\]\.\[latest\]\.\[co2cars\]', re.IGNORECASE)
+ORDER_RE = re.compile(r'\bORDER\s+BY\b', re.IGNORECASE)
+
+MAKES = ['TESLA', 'VOLKSWAGEN', 'BMW', 'MERCEDES-BENZ', 'RENAULT', 'KIA', 'HYUNDAI', 'VOLVO', 'MG', 'BYD',
+         'AUDI', 'SKODA', 'PEUGEOT', 'FIAT', 'NISSAN', 'FORD', 'TOYOTA', 'POLESTAR', 'CUPRA', 'OPEL']
+FUELS = [('electricity', 'E'), ('petrol/electric', 'P'), ('diesel/electric', 'P'), ('petrol', 'M'), ('diesel', 'M')]
+
+
+def build_synthetic_db(path: str, rows: int = 100_000, seed: int = 42,
+                       years: tuple[int, int] = (2019, 2024)) -> None:
+    """(Re)create co2cars in the SQLite file at `path` with `rows` synthetic registrations."""
+    rng = random.Random(seed)
+    models = {mk: [f"{mk.title()} {chr(65 + i)}{rng.randint(1, 99)}" for i in range(rng.randint(5, 40))]
+              for mk in MAKES}
+
+    def row(_):
+        mk = rng.choice(MAKES)
+        ft, fm = rng.choice(FUELS)
+        zr = rng.randint(250, 650) if fm == 'E' else (rng.randint(30, 120) if fm == 'P' else None)
+        # wie im Original: gelegentlich abweichende Schreibweise mit Leerzeichen
+        cn = rng.choice(models[mk]) + (' ' if rng.random() < 0.02 else '')
+        return (rng.randint(*years), rng.choice('PF'), mk, cn, ft, fm, zr, rng.randint(1, 50),
+                0 if fm == 'E' else rng.randint(20, 180))
+
+    db = sqlite3.connect(path)
+    db.executescript("""
+        DROP TABLE IF EXISTS co2cars;
+        CREATE TABLE co2cars (
+            Year INTEGER, Status TEXT, Mk TEXT, Cn TEXT, Ft TEXT, Fm TEXT,
+            Zr INTEGER, r INTEGER, Ewltp INTEGER
+        );
+    """)
+    db.executemany("INSERT INTO co2cars VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", map(row, range(rows)))
+    db.execute("CREATE INDEX idx_year_status ON co2cars (Year, Status)")
+    db.commit()
+    db.close()
+
+
+def run_query(db: sqlite3.Connection, query: str, page: int, page_size: int, shuffle: bool = False) -> dict:
+    """One page of `query` in the Discodata JSON envelope; shuffle = random order unless ORDER BY is given."""
+    sql = TABLE_RE.sub('co2cars', query)
+    order = " ORDER BY random()" if shuffle and not ORDER_RE.search(sql) else ""
+    try:
+        cur = db.execute(f"SELECT * FROM ({sql}){order} LIMIT ? OFFSET ?", (page_size, (page - 1) * page_size))
+        cols = [d[0] for d in cur.description]
+        return {"results": [dict(zip(cols, r)) for r in cur.fetchall()]}
+    except sqlite3.Error as e:
+        return {"errors": [{"error": str(e), "errorcode": 400}]}
+
+
+class StubServer(ThreadingHTTPServer):
+    """HTTP server answering /sql from a SQLite file; counts requests."""
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], db_path: str, latency: float = 0.0, shuffle: bool = False):
+        super().__init__(address, _Handler)
+        self.db_path = db_path
+        self.latency = latency
+        self.shuffle = shuffle
+        self.requests = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def connection(self) -> sqlite3.Connection:
+        if not hasattr(self._local, 'db'):  # eine Verbindung pro Handler-Thread
+            self._local.db = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+        return self._local.db
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/sql"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path.rstrip('/') != '/sql':
+            self.send_error(404)
+            return
+
+        params = parse_qs(url.query)
+        try:
+            query = params['query'][0]
+            page = int(params.get('p', ['1'])[0])
+            page_size = int(params.get('nrOfHits', ['100'])[0])
+            if page < 1 or page_size < 1:
+                raise ValueError("p and nrOfHits must be >= 1")
+        except (KeyError, ValueError) as e:
+            payload = {"errors": [{"error": f"bad request: {e}", "errorcode": 400}]}
+        else:
+            payload = run_query(self.server.connection(), query, page, page_size, self.server.shuffle)
+
+        with self.server._lock:
+            self.server.requests += 1
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def start_stub(rows: int = 100_000, port: int = 0, latency: float = 0.0, seed: int = 42,
+               db_path: str | None = None, shuffle: bool = False) -> StubServer:
+    """
+    Seed a database (unless db_path already exists) and serve it on a
+    background thread; port 0 picks a free port (see server.base_url).
+    """
+    if db_path is None:
+        db_path = os.path.join(tempfile.mkdtemp(prefix='discodata_stub_'), 'co2cars.sqlite')
+    if not os.path.exists(db_path):
+        build_synthetic_db(db_path, rows, seed)
+
+    server = StubServer(('127.0.0.1', port), db_path, latency, shuffle)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Local SQLite stand-in for the Discodata SQL endpoint")
+    ap.add_argument("--rows", type=int, default=100_000, help="Synthetic co2cars rows (default 100000)")
+    ap.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic table")
+    ap.add_argument("--db", default=None, help="SQLite file (created if missing; default: temp file)")
+    ap.add_argument("--reseed", action="store_true", help="Rebuild --db even if it exists")
+    ap.add_argument("--port", type=int, default=8765, help="Port (default 8765)")
+    ap.add_argument("--latency", type=float, default=0.0, help="Artificial delay per request in seconds")
+    ap.add_argument("--shuffle", action="store_true", help="Random row order per execution unless ORDER BY is given")
+    args = ap.parse_args()
+
+    if args.db and args.reseed and os.path.exists(args.db):
+        os.remove(args.db)
+
+    server = start_stub(args.rows, args.port, args.latency, args.seed, args.db, args.shuffle)
+    print(f"Discodata stub on {server.base_url} ({server.db_path})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"\n{server.requests} requests served")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -8,6 +8,8 @@ What you get:
 - A CSV of DISTINCT model entries per reporting year:
   Year, Status, Mk (make), Cn (commercial name), Ft (fuel type), Fm (fuel mode)
 - Filtered to plug‑in vehicles via Zr (electric range) > 0
+- With --aggregate: one row per (Year, Status, Mk, Cn, Ft, Fm), grouped on the
+  server, plus Records (COUNT(*)), Registrations (SUM(r)) and AvgZr (AVG(Zr))
 
 Notes:
 - This is an official, registration-based dataset (new registrations), not a
@@ -22,102 +24,320 @@ Usage (examples):
   python download_eu_plugins_discodata.py --out eu_plugins_models.csv
   python download_eu_plugins_discodata.py --years 2022 2025 --status P F
   python download_eu_plugins_discodata.py --last-n-years 3 --status P
+  python download_eu_plugins_discodata.py --cache-dir .http_cache --offline
+  python download_eu_plugins_discodata.py --workers 6 --rps 4
+  python download_eu_plugins_discodata.py --partition-dir .co2cars_partitions --last-n-years 3
+  python download_eu_plugins_discodata.py --aggregate --out eu_plugins_models_weighted.csv
+  python download_eu_plugins_discodata.py --base-url http://127.0.0.1:8765/sql   # discodata_stub.py
+
+Pages are planned with a COUNT(*) query first and then fetched concurrently
+(--workers threads, --rps shared across them) and merged in page order.
+
+Pages are streamed into a typed columnar writer (columnar.py, categorical
+Status/Mk/Cn/Ft/Fm) and de-duplicated as they arrive, so only the pages
+currently in flight are held as JSON.
+
+With --partition-dir every (Year, Status) slice is stored as its own file;
+Final slices already on disk are not queried again (see partition_cache.py).
 
 """
 from __future__ import annotations
 
 import argparse
+import json
+import math
+import os
 import sys
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
 from urllib.parse import quote
 
 import pandas as pd
 import requests
 
+from columnar import ColumnarWriter
+from http_cache import ResponseCache, add_cache_args, cache_from_args
+from http_client import TokenBucket, make_session
+from partition_cache import PartitionCache
+
+BASE = os.environ.get("DISCODATA_BASE_URL", "https://discodata.eea.europa.eu/sql")
+DEFAULT_WORKERS = 4
+DEFAULT_RPS = 4.0
+COLUMN_TYPES = {"Year": "int", "Status": "category", "Mk": "category", "Cn": "category",
+                "Ft": "category", "Fm": "category"}
+AGGREGATE_COLUMN_TYPES = {**COLUMN_TYPES, "Records": "int", "Registrations": "float", "AvgZr": "float"}
+SORT_COLUMNS = ["Year", "Status", "Mk", "Cn", "Ft", "Fm"]
 
-BASE = "https://discodata.eea.europa.eu/sql"
 
+def sql_url(query: str, page: int = 1, page_size: int = 1000) -> str:
+    return f"{BASE}?query={quote(query)}&p={page}&nrOfHits={page_size}"
 
-def call_sql(query: str, page: int = 1, page_size: int = 1000, timeout: int = 30) -> dict:
+
+def call_sql(query: str, page: int = 1, page_size: int = 1000, timeout: int = 30,
+             cache: ResponseCache | None = None, session: requests.Session | None = None,
+             before_request: Callable[[], None] | None = None) -> dict:
     """
     Call Discodata SQL REST endpoint.
 
     The API returns JSON:
       {"results":[{...},{...}]}  or  {"errors":[{"error":"...", "errorcode":...}]}
+
+    With a ResponseCache the (query, page, page size) URL is served from disk.
+    Error payloads (HTTP 200 with "errors") are never stored, so a transient
+    backend error is not replayed for the cache TTL or under --offline.
+    before_request() runs right before a real request (rate limiter), not on cache hits.
     """
-    url = f"{BASE}?query={quote(query)}&p={page}&nrOfHits={page_size}"
-    r = requests.get(url, timeout=timeout)
+    url = sql_url(query, page, page_size)
+    if cache is not None:
+        return json.loads(cache.get_text(url, session=session, timeout=timeout, validate=_check_payload,
+                                         before_request=before_request))
+    if before_request is not None:
+        before_request()
+    r = (session or requests).get(url, timeout=timeout)
     r.raise_for_status()
     return r.json()
 
 
-def fetch_all_pages(query: str, page_size: int = 2000, sleep_s: float = 0.15) -> list[dict]:
-    """Fetch all pages until results are empty."""
-    out: list[dict] = []
-    page = 1
+def _results(payload: dict) -> list[dict]:
+    if "errors" in payload:
+        raise RuntimeError(payload["errors"][0].get("error", str(payload["errors"][0])))
+    return payload.get("results", [])
+
+
+def _check_payload(text: str) -> None:
+    """Cache validator: raises for bodies that are not a successful Discodata response."""
+    payload = json.loads(text)
+    if not isinstance(payload, dict):
+        raise ValueError(f"Unexpected Discodata response: {text[:200]!r}")
+    _results(payload)
+
+
+def ordered_query(query: str) -> str:
+    """
+    `query` with ORDER BY SORT_COLUMNS. Pages (p=N) are separate executions;
+    without a total order the server may order each one differently, so rows
+    could repeat or go missing across pages. Not for derived tables (COUNT).
+    """
+    return f"{query} ORDER BY {', '.join(SORT_COLUMNS)}"
+
+
+def count_rows(query: str, cache: ResponseCache | None = None,
+               session: requests.Session | None = None) -> int:
+    """Number of rows `query` returns (COUNT(*) over it as a derived table)."""
+    rows = _results(call_sql(f"SELECT COUNT(*) AS n FROM ({query}) AS q", page=1, page_size=1,
+                             cache=cache, session=session))
+    return int(rows[0]["n"]) if rows else 0
+
+
+def iter_pages_sequential(query: str, page_size: int = 2000, sleep_s: float = 0.15,
+                          cache: ResponseCache | None = None, start_page: int = 1,
+                          session: requests.Session | None = None) -> Iterator[list[dict]]:
+    """Yield pages of `query` (ordered by SORT_COLUMNS) from start_page on until results are empty."""
+    query = ordered_query(query)
+    page = start_page
     while True:
-        payload = call_sql(query, page=page, page_size=page_size)
-        if "errors" in payload:
-            raise RuntimeError(payload["errors"][0].get("error", str(payload["errors"][0])))
-        rows = payload.get("results", [])
+        sent = []  # before_request-Hook: nur bei echtem Request
+        rows = _results(call_sql(query, page=page, page_size=page_size, cache=cache, session=session,
+                                 before_request=lambda: sent.append(1)))
         if not rows:
-            break
-        out.extend(rows)
+            return
+        yield rows
         page += 1
-        time.sleep(sleep_s)  # be kind to the endpoint
-    return out
+        if sent:
+            time.sleep(sleep_s)  # be kind to the endpoint
+
+
+def iter_pages(query: str, page_size: int = 2000, sleep_s: float = 0.15,
+               cache: ResponseCache | None = None, workers: int = DEFAULT_WORKERS,
+               rps: float = DEFAULT_RPS) -> Iterator[list[dict]]:
+    """
+    Yield all pages of `query` in page order: COUNT(*) first, then the known
+    pages concurrently (`workers` threads sharing `rps`). At most `workers`
+    pages are in flight or waiting to be consumed at any time. Pages are cut
+    from ordered_query(query), so concurrent pages never overlap.
+
+    If the table grew between COUNT and fetch (last page full), the remaining
+    pages are fetched sequentially; if COUNT fails, everything is.
+    """
+    workers = max(1, workers)
+    session = make_session(pool_size=workers)
+    try:
+        total = count_rows(query, cache=cache, session=session)
+    except Exception as e:
+        print(f"COUNT(*) failed ({e}); falling back to sequential paging", file=sys.stderr)
+        yield from iter_pages_sequential(query, page_size, sleep_s, cache, session=session)
+        return
+
+    n_pages = math.ceil(total / page_size)
+    print(f"COUNT: {total:,} rows → {n_pages} page(s) of {page_size}, {workers} worker(s) at {rps:g} req/s")
+    if n_pages == 0:
+        return
+
+    limiter = TokenBucket(rps)
+    paged = ordered_query(query)
 
+    def fetch_page(page: int) -> list[dict]:
+        return _results(call_sql(paged, page=page, page_size=page_size, cache=cache, session=session,
+                                 before_request=limiter.acquire))
 
-def get_max_year() -> int:
+    rows: list[dict] = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        next_page = 1
+        while pending or next_page <= n_pages:
+            while next_page <= n_pages and len(pending) < workers:  # Fenster statt alle Seiten auf einmal
+                pending.append(pool.submit(fetch_page, next_page))
+                next_page += 1
+            rows = pending.popleft().result()
+            yield rows
+
+    if len(rows) >= page_size:
+        yield from iter_pages_sequential(query, page_size, sleep_s, cache, start_page=n_pages + 1,
+                                         session=session)
+
+
+def fetch_all_pages(query: str, page_size: int = 2000, sleep_s: float = 0.15,
+                    cache: ResponseCache | None = None, workers: int = DEFAULT_WORKERS,
+                    rps: float = DEFAULT_RPS) -> list[dict]:
+    """All rows of `query` as one list (see iter_pages)."""
+    return [row for rows in iter_pages(query, page_size, sleep_s, cache, workers, rps) for row in rows]
+
+
+def ingest_pages(pages: Iterator[list[dict]], column_types: dict[str, str] = COLUMN_TYPES,
+                 dedupe: bool = True) -> pd.DataFrame:
+    """Stream pages into a (de-duplicating) ColumnarWriter and return the typed frame."""
+    writer = ColumnarWriter(column_types, dedupe=dedupe)
+    for rows in pages:
+        writer.add(rows)
+    print(f"Ingested: {writer.summary()}")
+    return writer.to_frame()
+
+
+def get_max_year(cache: ResponseCache | None = None) -> int:
     q = "SELECT max(Year) as maxYear FROM [CO2Emission].[latest].[co2cars]"
-    payload = call_sql(q, page=1, page_size=1)
-    if "errors" in payload:
-        raise RuntimeError(payload["errors"][0].get("error", str(payload["errors"][0])))
-    rows = payload.get("results", [])
+    rows = _results(call_sql(q, page=1, page_size=1, cache=cache))
     if not rows or rows[0].get("maxYear") is None:
         raise RuntimeError("Could not determine max Year from the dataset.")
     return int(rows[0]["maxYear"])
 
 
-def build_query(min_year: int, max_year: int, statuses: list[str]) -> str:
+def build_query(min_year: int, max_year: int, statuses: list[str], aggregate: bool = False) -> str:
     # Plug‑in vehicles proxy: electric range (Zr) present and > 0
     status_clause = " OR ".join([f"Status = '{s}'" for s in statuses])
-    q = f"""
+    if aggregate:
+        select = """
+SELECT
+  Year, Status, Mk, Cn, Ft, Fm,
+  COUNT(*) AS Records,
+  SUM(CAST(r AS FLOAT)) AS Registrations,
+  AVG(CAST(Zr AS FLOAT)) AS AvgZr"""
+        group_by = "GROUP BY Year, Status, Mk, Cn, Ft, Fm"
+    else:
+        select = """
 SELECT DISTINCT
-  Year, Status, Mk, Cn, Ft, Fm
+  Year, Status, Mk, Cn, Ft, Fm"""
+        group_by = ""
+    q = f"""{select}
 FROM [CO2Emission].[latest].[co2cars]
 WHERE Year >= {min_year}
   AND Year <= {max_year}
   AND ({status_clause})
   AND Zr IS NOT NULL
   AND Zr > 0
+{group_by}
 """
     return " ".join(q.split())  # compact whitespace
 
 
+def combine_aggregates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Merge aggregate rows whose keys only became equal after trimming
+    (e.g. 'Tesla ' and 'Tesla'): counts are summed, AvgZr is record-weighted.
+    """
+    keys = [c for c in SORT_COLUMNS if c in df.columns]
+    if not df.duplicated(keys).any():
+        return df
+    df = df.assign(_zr_sum=df["AvgZr"] * df["Records"])
+    out = df.groupby(keys, observed=True, dropna=False, sort=False).agg(
+        Records=("Records", "sum"), Registrations=("Registrations", "sum"), _zr_sum=("_zr_sum", "sum"),
+    ).reset_index()
+    out["AvgZr"] = out.pop("_zr_sum") / out["Records"]
+    return out
+
+
+def iter_partitions(min_year: int, max_year: int, statuses: list[str], store: PartitionCache,
+                    fetch: Callable[[str], pd.DataFrame], refresh: bool = False,
+                    aggregate: bool = False) -> Iterator[list[dict]]:
+    """
+    One query per (Year, Status), yielded as a page of rows; Final partitions
+    already in `store` are read from disk, Provisional and missing ones are
+    fetched with fetch(query) -> DataFrame and saved.
+    """
+    served = fetched = 0
+    for year in range(min_year, max_year + 1):
+        for status in statuses:
+            query = build_query(min_year=year, max_year=year, statuses=[status], aggregate=aggregate)
+            if not refresh and store.is_cached_final(year, status, query):
+                part = store.load(year, status, query)
+                served += 1
+            else:
+                part = fetch(query)
+                store.save(year, status, query, part)
+                print(f"  {year}/{status}: {len(part):,} rows fetched")
+                fetched += 1
+            yield part.to_dict("records")
+
+    print(f"Partitions: {served} Final from {store.root}, {fetched} fetched")
+
+
 def main() -> int:
+    global BASE
     ap = argparse.ArgumentParser()
     ap.add_argument("--out", default="eu_plugins_models.csv", help="Output CSV path")
     ap.add_argument("--page-size", type=int, default=2000, help="API page size (nrOfHits)")
-    ap.add_argument("--sleep", type=float, default=0.15, help="Sleep between pages (seconds)")
+    ap.add_argument("--sleep", type=float, default=0.15, help="Sleep between pages when paging sequentially (seconds)")
+    ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent page fetches")
+    ap.add_argument("--rps", type=float, default=DEFAULT_RPS,
+                    help=f"Requests/sec shared by all workers (default {DEFAULT_RPS:g}, 0 = unlimited)")
     ap.add_argument("--status", nargs="+", default=["P", "F"], help="Status values to include (P and/or F)")
     ap.add_argument("--years", nargs=2, type=int, metavar=("MIN_YEAR", "MAX_YEAR"),
                     help="Explicit year range (inclusive). Example: --years 2022 2025")
+    ap.add_argument("--last-n-years", type=int, default=None,
+                    help="If --years not provided: the last N years up to the dataset max year")
     ap.add_argument("--since-year", type=int, default=2023,
                     help="If --years not provided: use since-year .. max-year (default 2023)")
     ap.add_argument("--max-year", type=int, default=2025,
                     help="When --years not provided: upper bound of the year range (default 2025). Will be capped at dataset max year if needed.")
+    ap.add_argument("--aggregate", action="store_true",
+                    help="GROUP BY on the server: one row per model and year with Records, Registrations, AvgZr")
+    ap.add_argument("--partition-dir", default=None,
+                    help="Store results per (Year, Status); Final partitions on disk are not re-queried")
+    ap.add_argument("--refresh", action="store_true", help="With --partition-dir: re-fetch Final partitions too")
+    ap.add_argument("--base-url", default=None,
+                    help=f"SQL endpoint (default {BASE}; env DISCODATA_BASE_URL), e.g. a local discodata_stub.py")
+    add_cache_args(ap)
     args = ap.parse_args()
+    cache = cache_from_args(args)
+
+    if args.base_url:
+        BASE = args.base_url
 
     statuses = [s.strip().upper() for s in args.status]
     for s in statuses:
         if s not in {"P", "F"}:
             ap.error("Status must be P and/or F")
+    if args.last_n_years is not None and args.last_n_years <= 0:
+        ap.error("--last-n-years must be a positive number of years")
 
     if args.years:
         min_year, max_year = args.years
+    elif args.last_n_years is not None:
+        max_year = get_max_year(cache)
+        min_year = max_year - args.last_n_years + 1
     else:
-        dataset_max = get_max_year()
+        dataset_max = get_max_year(cache)
         min_year = args.since_year
         requested_max = args.max_year
         if dataset_max < min_year:
@@ -131,30 +351,41 @@ def main() -> int:
         if max_year < min_year:
             ap.error("Computed max_year < min_year after capping to dataset max; try --years to specify an explicit valid range.")
 
-    query = build_query(min_year=min_year, max_year=max_year, statuses=statuses)
     print(f"Querying Discodata for years {min_year}..{max_year}, status={statuses} ...")
 
-    rows = fetch_all_pages(query, page_size=args.page_size, sleep_s=args.sleep)
-    df = pd.DataFrame(rows)
+    def pages(query: str) -> Iterator[list[dict]]:
+        return iter_pages(query, page_size=args.page_size, sleep_s=args.sleep, cache=cache,
+                          workers=args.workers, rps=args.rps)
+
+    # Strings werden beim Einlesen getrimmt, Duplikate seitenweise verworfen
+    # (Aggregat-Zeilen sind serverseitig eindeutig; gleiche Zahlen sind dort kein Duplikat)
+    column_types = AGGREGATE_COLUMN_TYPES if args.aggregate else COLUMN_TYPES
+    dedupe = not args.aggregate
+    if args.partition_dir:
+        store = PartitionCache(args.partition_dir)
+        df = ingest_pages(iter_partitions(min_year, max_year, statuses, store,
+                                          lambda query: ingest_pages(pages(query), column_types, dedupe),
+                                          refresh=args.refresh, aggregate=args.aggregate), column_types, dedupe)
+    else:
+        query = build_query(min_year=min_year, max_year=max_year, statuses=statuses, aggregate=args.aggregate)
+        df = ingest_pages(pages(query), column_types, dedupe)
+    if cache is not None:
+        print(cache.summary())
 
     if df.empty:
         print("No rows returned. Try widening the year range or checking endpoint availability.", file=sys.stderr)
         return 2
 
-    # Normalize + de-duplicate
-    keep_cols = ["Year", "Status", "Mk", "Cn", "Ft", "Fm"]
-    df = df[[c for c in keep_cols if c in df.columns]].copy()
-
-    # Clean strings
-    for c in ["Status", "Mk", "Cn", "Ft", "Fm"]:
-        if c in df.columns:
-            df[c] = df[c].astype(str).str.strip()
-
-    df = df.drop_duplicates().sort_values(["Year", "Status", "Mk", "Cn", "Ft", "Fm"], kind="mergesort")
+    if args.aggregate:
+        df = combine_aggregates(df)
+        df["AvgZr"] = df["AvgZr"].round(2)
+    df = df.sort_values([c for c in SORT_COLUMNS if c in df.columns], kind="mergesort")
 
     out_path = args.out
     df.to_csv(out_path, index=False, encoding="utf-8")
     print(f"Saved {len(df):,} distinct model rows to: {out_path}")
+    if args.aggregate:
+        print(f"  {int(df['Records'].sum()):,} records, {df['Registrations'].sum():,.0f} registrations")
     return 0
 
 
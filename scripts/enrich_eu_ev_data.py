@@ -8,6 +8,14 @@ Reichert EU EV-Daten mit EU-spezifischen Informationen an:
 - Manuelle Entriegelung des Ladekabels
 
 Nutzt 3-stufige Lookup-Hierarchie: Modell > Plattform > Hersteller
+(vorkompiliert als EmergencyReleaseIndex, angewendet pro eindeutigem
+(Manufacturer, Model)-Paar)
+
+Plug Type und Autocharge laufen spaltenweise: Tesla/Nissan-Ausnahmen als
+Masken über die Kategorien, EU_AUTOCHARGE_LOOKUP als Tabelle per Merge auf
+Manufacturer
+(Prüfung + Benchmark: bench_enrich_eu.py). --rowwise nutzt den bisherigen
+df.apply-Pfad.
 
 Verwendung:
     python3 enrich_eu_ev_data.py --input ev_database_normalized.csv --output ev_eu_enriched.csv
@@ -17,222 +25,32 @@ from __future__ import annotations
 
 import argparse
 import sys
+import numpy as np
 import pandas as pd
 from typing import Dict, Any
 
+from canonicalize import map_unique
+from rule_tables import load_rules
+
 
 # ============================================================================
 # EU-SPEZIFISCHE LOOKUP-TABLES
 # ============================================================================
 
-# EU Autocharge/Plug & Charge Support
-EU_AUTOCHARGE_LOOKUP: Dict[str, Dict[str, Any]] = {
-    # VW Group
-    "Audi": {
-        "default": "Ja - Plug & Charge (ab MY2023) via NewMotion",
-        "networks": "NewMotion (Electrify Europe), Ionity, Shell Recharge",
-        "min_year": 2023,
-    },
-    "Porsche": {
-        "default": "Ja - Plug & Charge (ab MY2023)",
-        "networks": "Porsche Charging Service, Electrify Europe, Ionity",
-        "min_year": 2023,
-    },
-    "Volkswagen": {
-        "default": "Ja - Plug & Charge (ab MY2023)",
-        "networks": "Electrify Europe (NewMotion), Ionity",
-        "min_year": 2023,
-    },
-
-    # BMW Group
-    "BMW": {
-        "default": "Ja - Plug & Charge (ab MY2023) via BMW ChargeNow",
-        "networks": "BMW ChargeNow, Electrify Europe, Ionity",
-        "min_year": 2023,
-    },
-    "Mini": {
-        "default": "Nein",
-        "networks": "N/A",
-    },
-
-    # Mercedes
-    "Mercedes-Benz": {
-        "default": "Ja - Plug & Charge (ab MY2023)",
-        "networks": "Mercedes me Charge, Electrify Europe, Ionity",
-        "min_year": 2023,
-    },
-
-    # Hyundai Group
-    "Hyundai": {
-        "default": "Ja - Plug & Charge (ab MY2023)",
-        "networks": "Electrify Europe, Ionity, Shell Recharge",
-        "min_year": 2023,
-    },
-    "Kia": {
-        "default": "Ja - Plug & Charge (ab MY2023)",
-        "networks": "Electrify Europe, Ionity, Shell Recharge",
-        "min_year": 2023,
-    },
-    "Genesis": {
-        "default": "Ja - Plug & Charge (ab MY2023)",
-        "networks": "Electrify Europe, Ionity",
-        "min_year": 2023,
-    },
-
-    # Volvo/Polestar
-    "Volvo": {
-        "default": "Ja - Plug & Charge (neuere Modelle)",
-        "networks": "Electrify Europe, Ionity",
-        "min_year": 2023,
-    },
-    "Polestar": {
-        "default": "Ja - Plug & Charge (neuere Modelle)",
-        "networks": "Electrify Europe, Ionity",
-        "min_year": 2023,
-    },
-
-    # Stellantis (PSA Group)
-    "Peugeot": {
-        "default": "Partiell - ab MY2023",
-        "networks": "Electrify Europe, Ionity (begrenzt)",
-        "min_year": 2023,
-    },
-    "Opel": {
-        "default": "Partiell - ab MY2023",
-        "networks": "Electrify Europe, Ionity",
-        "min_year": 2023,
-    },
-    "Citroën": {
-        "default": "Nein",
-        "networks": "N/A",
-    },
-    "CUPRA": {
-        "default": "Nein",
-        "networks": "N/A",
-    },
-    "Fiat": {
-        "default": "Nein",
-        "networks": "N/A",
-    },
-
-    # Ford
-    "Ford": {
-        "default": "Ja - Plug & Charge (ab MY2024)",
-        "networks": "Electrify America (EU via Ionity)",
-        "min_year": 2024,
-    },
-
-    # Tesla
-    "Tesla": {
-        "default": "Teilweise - NACS Adapter für EU Type 2",
-        "networks": "Tesla Supercharger (mit Adapter)",
-        "min_year": 2020,
-    },
-
-    # BYD, NIO, Xpeng, etc. (Chinesische Hersteller)
-    "BYD": {
-        "default": "Nein",
-        "networks": "N/A",
-    },
-    "MG": {
-        "default": "Nein",
-        "networks": "N/A",
-    },
-    "Nissan": {
-        "default": "Nein",
-        "networks": "N/A (CHAdeMO)",
-    },
-    "Škoda": {
-        "default": "Partiell - ab MY2023",
-        "networks": "Electrify Europe, Ionity",
-        "min_year": 2023,
-    },
-    "Lucid": {
-        "default": "Ja - Plug & Charge",
-        "networks": "Electrify Europe, Ionity",
-        "min_year": 2022,
-    },
-    "Rivian": {
-        "default": "Ja - Plug & Charge (neuere)",
-        "networks": "Rivian Adventure Network (EU), Electrify Europe",
-        "min_year": 2023,
-    },
-}
+# Tabellen in rules/enrich_eu_rules.json (Reihenfolge = Priorität, erste passende Regel gewinnt)
+_RULES = load_rules('enrich_eu_rules')
 
+# EU Autocharge/Plug & Charge Support
+EU_AUTOCHARGE_LOOKUP: Dict[str, Dict[str, Any]] = _RULES['autocharge']
 
 # EU Emergency Release (Modell-spezifisch)
-EU_EMERGENCY_RELEASE_BY_MODEL: Dict[tuple, str] = {
-    # Audi
-    ("Audi", "Q4"): "Kofferraum: Gelbe Schlaufe unter Ladeboden, links Seite",
-    ("Audi", "e-tron"): "Motorhaube: Kleine Klappe direkt über Ladeanschluss",
-
-    # BMW (siehe Phase 1 - aus US bereits vorhanden)
-    ("BMW", "iX"): "Kofferraum rechte Seite: Verkleidung abnehmen, Notentriegelungshebel",
-    ("BMW", "i4"): "⚠️ KEIN mechanischer Notentriegelungsmechanismus",
-
-    # Peugeot/Opel (meist ähnlich)
-    ("Peugeot", "e-208"): "Kofferraum: Gelbe Schlaufe unter Ladeboden",
-    ("Opel", "Corsa"): "Kofferraum: Gelbe Schlaufe unter Ladeboden",
-
-    # Tesla (weltweit gleich)
-    ("Tesla", "Model"): "Kofferraum: Oranges Notentriegelungskabel, oder Touchscreen Service",
-
-    # Volkswagen (MEB Plattform)
-    ("Volkswagen", "ID"): "Kofferraum Beifahrerseite: Gelbe Schlaufe",
-
-    # Ford
-    ("Ford", "Mustang"): "Kofferraum: Flexibler Tab neben Ladeanschluss",
-
-    # Volvo/Polestar (Volvo-Plattform)
-    ("Volvo", "EX"): "Kofferraum links: Kappe abhebeln, Hebel darunter ziehen",
-    ("Polestar", "2"): "Kofferraum links: Bodenpanel anheben, Hebel ziehen",
-
-    # Hyundai/Kia (E-GMP Plattform)
-    ("Hyundai", "Ioniq"): "Kofferraum rechts: Runde Kunststoffkappe abziehen",
-    ("Kia", "EV6"): "Kofferraum rechts: Runde Kunststoffkappe abziehen",
-    ("Kia", "EV9"): "Kofferraum rechts: Runde Kunststoffkappe abziehen",
-
-    # Nissan
-    ("Nissan", "LEAF"): "Druckknopf am Stecker selbst (CHAdeMO)",
-    ("Nissan", "ARIYA"): "Motorhaube: Einmaliger mechanischer Mechanismus",
-}
-
+EU_EMERGENCY_RELEASE_BY_MODEL: Dict[tuple, str] = _RULES['emergency_release_by_model']
 
 # EU Emergency Release (Plattform-basiert)
-EU_EMERGENCY_RELEASE_BY_PLATFORM: Dict[str, str] = {
-    "Audi": "Kofferraum oder Motorhaube je nach Modell - siehe Betriebsanleitung",
-    "BMW": "Modellabhängig: iX (Kofferraum rechts), i4/i5 (kein Mechanismus)",
-    "Mercedes-Benz": "Kofferraum Beifahrerseite: Verkleidung abnehmen, Seil ziehen",
-    "Ford": "Unterschiedlich je Modell - Owner's Manual konsultieren",
-    "Volkswagen": "Kofferraum Beifahrerseite: Gelbe Notentriegelungsschlaufe",
-    "Peugeot": "Kofferraum: Gelbe Schlaufe unter Ladeboden",
-    "Opel": "Kofferraum: Gelbe Schlaufe unter Ladeboden",
-    "Volvo": "Kofferraum links: Bodenpanel anheben",
-    "Hyundai": "Kofferraum rechts (E-GMP): Kunststoffkappe abziehen",
-    "Kia": "Kofferraum rechts (E-GMP): Kunststoffkappe abziehen",
-    "Nissan": "LEAF: am Stecker; ARIYA: Motorhaube links hinten",
-    "Tesla": "Kofferraum: Oranges Notentriegelungskabel",
-    "Porsche": "Außen am Fahrzeug: schwarzer Knopf zwischen Tür und Kotflügel",
-    "Škoda": "MEB-Plattform: Kofferraum Beifahrerseite, gelbe Schlaufe",
-    "Polestar": "Volvo-Plattform: Kofferraum links",
-    "Lucid": "Touchscreen Service-Modus oder mechanisch near charging port",
-    "Rivian": "Zentral-Display > Ladeport entriegeln; mechanisch mit T-Schlüsseln",
-}
-
+EU_EMERGENCY_RELEASE_BY_PLATFORM: Dict[str, str] = _RULES['emergency_release_by_platform']
 
 # EU Emergency Release (Hersteller-Fallback)
-EU_EMERGENCY_RELEASE_BY_MAKE: Dict[str, str] = {
-    "Citroën": "Owner's Manual konsultieren",
-    "CUPRA": "Wahrscheinlich VW MEB: Kofferraum Beifahrerseite",
-    "Fiat": "500e: Kofferraum - ähnlich Peugeot",
-    "MG": "Dokumentation begrenzt - Pannendienst kontaktieren",
-    "BYD": "Dokumentation begrenzt - Hersteller kontaktieren",
-    "Mini": "Ähnlich BMW - Owner's Manual konsultieren",
-    "Suzuki": "Dokumentation begrenzt",
-    "Leapmotor": "Chinesischer Hersteller - Owner's Manual konsultieren",
-    "Ora": "Chinesischer Hersteller - Owner's Manual konsultieren",
-    "Xpeng": "Chinesischer Hersteller - Owner's Manual konsultieren",
-}
+EU_EMERGENCY_RELEASE_BY_MAKE: Dict[str, str] = _RULES['emergency_release_by_make']
 
 
 # ============================================================================
@@ -299,43 +117,246 @@ def determine_autocharge_eu(row: pd.Series) -> str:
 # EMERGENCY RELEASE BESTIMMUNG
 # ============================================================================
 
+EMERGENCY_RELEASE_DEFAULT = "Nicht dokumentiert – Owner's Manual des Fahrzeugs konsultieren"
+
+
+class EmergencyReleaseIndex:
+    """
+    Die drei Stufen (Modell > Plattform > Hersteller), einmal vorkompiliert.
+
+    Ein Regel-Schlüssel greift, wenn er (case-insensitive) im Herstellernamen
+    enthalten ist. Statt alle Schlüssel zu prüfen, werden alle Teilstrings
+    des Herstellernamens im Index nachgeschlagen – der Aufwand hängt von der
+    Namenslänge ab, nicht von der Anzahl der Regeln. Pro Hersteller wird das
+    Ergebnis (Modellregeln in Tabellenreihenfolge + Fallback) einmal gemerkt;
+    pro Modell gewinnt wie bisher die erste passende Regel.
+    """
+
+    def __init__(self, by_model: Dict[tuple, str], by_platform: Dict[str, str],
+                 by_make: Dict[str, str], default: str = EMERGENCY_RELEASE_DEFAULT):
+        self.default = default
+        # Hersteller-Schlüssel (lower) → [(Reihenfolge, Modell-Schlüssel lower, Beschreibung)]
+        self._model_rules: Dict[str, list] = {}
+        for order, ((mfr_key, model_key), description) in enumerate(by_model.items()):
+            self._model_rules.setdefault(mfr_key.lower(), []).append((order, model_key.lower(), description))
+        self._platform = self._first_by_key(by_platform)
+        self._make = self._first_by_key(by_make)
+        self._max_key_len = max(map(len, [*self._model_rules, *self._platform, *self._make]), default=0)
+        self._resolved: Dict[str, tuple] = {}
+
+    @staticmethod
+    def _first_by_key(table: Dict[str, str]) -> Dict[str, tuple]:
+        index: Dict[str, tuple] = {}
+        for order, (key, description) in enumerate(table.items()):
+            index.setdefault(key.lower(), (order, description))
+        return index
+
+    def _substrings(self, text: str) -> set:
+        """All substrings of text up to the longest rule key (incl. '')."""
+        n = len(text)
+        return {text[i:j] for i in range(n + 1) for j in range(i, min(n, i + self._max_key_len) + 1)}
+
+    def for_manufacturer(self, manufacturer: str) -> tuple:
+        """(model rules in table order, fallback description) for one manufacturer string."""
+        resolved = self._resolved.get(manufacturer)
+        if resolved is None:
+            keys = self._substrings(manufacturer.lower())
+            model_rules = sorted(rule for key in keys for rule in self._model_rules.get(key, ()))
+            fallback = self.default
+            for tier in (self._platform, self._make):
+                hits = [tier[key] for key in keys if key in tier]
+                if hits:
+                    fallback = min(hits)[1]
+                    break
+            resolved = self._resolved[manufacturer] = (
+                [(model_key, description) for _, model_key, description in model_rules], fallback)
+        return resolved
+
+    def lookup(self, manufacturer: str, model: str) -> str:
+        model_rules, fallback = self.for_manufacturer(manufacturer)
+        if model_rules:
+            model = model.lower()
+            for model_key, description in model_rules:
+                if model_key in model:
+                    return description
+        return fallback
+
+
+EMERGENCY_RELEASE_INDEX = EmergencyReleaseIndex(
+    EU_EMERGENCY_RELEASE_BY_MODEL, EU_EMERGENCY_RELEASE_BY_PLATFORM, EU_EMERGENCY_RELEASE_BY_MAKE)
+
+
+def emergency_release_for(manufacturer, model, index: EmergencyReleaseIndex = EMERGENCY_RELEASE_INDEX) -> str:
+    """Notentriegelung für ein (Manufacturer, Model)-Paar, Rohwerte wie in der CSV."""
+    return index.lookup(str(manufacturer).strip(), str(model).strip())
+
+
 def determine_emergency_release_eu(row: pd.Series) -> str:
     """
     Bestimme Notentriegelung in 3 Stufen.
     Ähnlich wie US-Version aber mit EU-spezifischen Daten.
     """
+    return emergency_release_for(row.get("Manufacturer", ""), row.get("Model", ""))
+
+
+def determine_emergency_release_eu_linear(row: pd.Series,
+                                          by_model: Dict[tuple, str] = EU_EMERGENCY_RELEASE_BY_MODEL,
+                                          by_platform: Dict[str, str] = EU_EMERGENCY_RELEASE_BY_PLATFORM,
+                                          by_make: Dict[str, str] = EU_EMERGENCY_RELEASE_BY_MAKE) -> str:
+    """Bisheriger Pfad: lineare Suche über alle drei Tabellen (Referenz für bench_enrich_eu.py)."""
     manufacturer = str(row.get("Manufacturer", "")).strip()
     model = str(row.get("Model", "")).strip()
 
     # Stufe 1: Modell-spezifisch
-    for (mfr_key, model_key), description in EU_EMERGENCY_RELEASE_BY_MODEL.items():
+    for (mfr_key, model_key), description in by_model.items():
         if mfr_key.lower() in manufacturer.lower() and model_key.lower() in model.lower():
             return description
 
     # Stufe 2: Plattform/Hersteller
-    for mfr_key, description in EU_EMERGENCY_RELEASE_BY_PLATFORM.items():
+    for mfr_key, description in by_platform.items():
         if mfr_key.lower() in manufacturer.lower():
             return description
 
     # Stufe 3: Hersteller-Fallback
-    for mfr_key, description in EU_EMERGENCY_RELEASE_BY_MAKE.items():
+    for mfr_key, description in by_make.items():
         if mfr_key.lower() in manufacturer.lower():
             return description
 
-    return "Nicht dokumentiert – Owner's Manual des Fahrzeugs konsultieren"
+    return EMERGENCY_RELEASE_DEFAULT
+
+
+def _column(df: pd.DataFrame, name: str, default: Any = "") -> pd.Series:
+    return df[name] if name in df.columns else pd.Series(default, index=df.index, dtype=object)
+
+
+# ============================================================================
+# VEKTORISIERTE ANREICHERUNG (Plug Type / Autocharge)
+# ============================================================================
+
+PLUG_TYPE_DEFAULT = "Type 2 + CCS2"
+PLUG_TYPE_TESLA_NACS = "NACS (Berlin Giga) / Type 2 mit Adapter"
+PLUG_TYPE_CHADEMO = "CHAdeMO + Type 2"
+AUTOCHARGE_UNKNOWN = "Unbekannt - Hersteller nicht in Datenbank"
+
+
+def autocharge_table(lookup: Dict[str, Dict[str, Any]] = EU_AUTOCHARGE_LOOKUP) -> pd.DataFrame:
+    """EU_AUTOCHARGE_LOOKUP als Tabelle: Manufacturer, min_year, fertiger Ausgabetext."""
+    rows = []
+    for manufacturer, info in lookup.items():
+        if not info:
+            continue  # leerer Eintrag = "nicht in Datenbank"
+        default = info.get("default", "Unbekannt")
+        networks = info.get("networks", "")
+        rows.append({
+            "Manufacturer": manufacturer,
+            "min_year": info.get("min_year", 2023),
+            "Autocharge Support": f"{default} | Netzwerke: {networks}" if networks else default,
+        })
+    return pd.DataFrame(rows, columns=["Manufacturer", "min_year", "Autocharge Support"])
+
+
+AUTOCHARGE_TABLE = autocharge_table()
+
+
+def _str_column(df: pd.DataFrame, name: str) -> pd.Series:
+    """str(value).strip() pro Zeile wie row.get(name, "") in den Zeilenfunktionen (als Categorical)."""
+    return map_unique(lambda v: str(v).strip(), _column(df, name), categorical=True)
+
+
+def _categorical(values: pd.Series) -> pd.Categorical:
+    return values.array if isinstance(values.dtype, pd.CategoricalDtype) else pd.Categorical(values)
+
+
+def _contains(values: pd.Series, pattern: str) -> np.ndarray:
+    """`pattern in value` pro Zeile, ausgewertet nur auf den Kategorien."""
+    cat = _categorical(values)
+    hits = np.append(np.asarray(cat.categories.str.contains(pattern, regex=False), dtype=bool), False)
+    return hits[cat.codes]  # Code -1 (fehlend) → letzter Eintrag False
+
+
+def _model_years(df: pd.DataFrame) -> np.ndarray:
+    """int(Model Year) pro Zeile (Default 2024); ungültige Werte lösen wie int() einen Fehler aus."""
+    if "Model Year" not in df.columns:
+        return np.full(len(df), 2024, dtype="int64")
+    years = df["Model Year"]
+    if isinstance(years.dtype, np.dtype) and years.dtype.kind in "iu":
+        return years.to_numpy(dtype="int64")
+    return map_unique(int, years).to_numpy(dtype="int64")
+
+
+def plug_type_series(manufacturer: pd.Series, model: pd.Series, years: np.ndarray) -> pd.Series:
+    """Vektorisierte determine_plug_type_eu (gleiche Reihenfolge der Ausnahmen)."""
+    tesla = _contains(manufacturer, "Tesla")
+    nissan_leaf = _contains(manufacturer, "Nissan") & _contains(model, "LEAF")
+    plug = np.select(
+        [tesla & (years >= 2024), ~tesla & nissan_leaf & (years < 2024)],
+        [PLUG_TYPE_TESLA_NACS, PLUG_TYPE_CHADEMO],
+        default=PLUG_TYPE_DEFAULT,
+    )
+    return pd.Series(plug, index=manufacturer.index, dtype=object)
+
+
+def autocharge_series(manufacturer: pd.Series, years: np.ndarray,
+                      table: pd.DataFrame = AUTOCHARGE_TABLE) -> pd.Series:
+    """
+    Vektorisierte determine_autocharge_eu: Merge der Hersteller-Kategorien auf
+    die Tabelle, per Code auf die Zeilen verteilt, dann min_year-Vergleich.
+    """
+    cat = _categorical(manufacturer)
+    merged = pd.DataFrame({"Manufacturer": np.asarray(cat.categories, dtype=object)}).merge(
+        table, on="Manufacturer", how="left")
+    codes = np.where(cat.codes >= 0, cat.codes, len(merged))  # fehlend → Zusatzzeile (unbekannt)
+    text = np.append(merged["Autocharge Support"].to_numpy(dtype=object), None)[codes]
+    min_year = np.append(merged["min_year"].to_numpy(dtype="float64", na_value=np.nan), np.nan)[codes]
+    known = pd.notna(text)
+    out = np.where(known, np.where(years < min_year, "Nein", text), AUTOCHARGE_UNKNOWN)
+    return pd.Series(out, index=manufacturer.index, dtype=object)
 
 
 # ============================================================================
 # MAIN
 # ============================================================================
 
-def enrich_csv(input_file: str, output_file: str) -> int:
+def enrich_frame_rowwise(df: pd.DataFrame) -> pd.DataFrame:
+    """Schritte 1–3 zeilenweise per df.apply (bisheriger Pfad, Referenz)."""
+    print("  1. Füge Plug Type hinzu...")
+    df["Plug Type"] = df.apply(determine_plug_type_eu, axis=1)
+
+    print("  2. Füge Autocharge Support hinzu...")
+    df["Autocharge Support"] = df.apply(determine_autocharge_eu, axis=1)
+
+    print("  3. Füge Emergency Release Location hinzu...")
+    df["Emergency Release Location"] = df.apply(determine_emergency_release_eu, axis=1)
+    return df
+
+
+def enrich_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Schritte 1–3 spaltenweise, gleiche Ergebnisse wie enrich_frame_rowwise."""
+    manufacturer = _str_column(df, "Manufacturer")
+    model = _str_column(df, "Model")
+    years = _model_years(df)
+
+    print("  1. Füge Plug Type hinzu...")
+    df["Plug Type"] = plug_type_series(manufacturer, model, years)
+
+    print("  2. Füge Autocharge Support hinzu...")
+    df["Autocharge Support"] = autocharge_series(manufacturer, years)
+
+    print("  3. Füge Emergency Release Location hinzu...")
+    # einmal pro eindeutigem (Manufacturer, Model)-Paar
+    df["Emergency Release Location"] = map_unique(
+        emergency_release_for, _column(df, "Manufacturer"), _column(df, "Model"))
+    return df
+
+
+def enrich_csv(input_file: str, output_file: str, vectorized: bool = True) -> int:
     """
     Hauptfunktion für Anreicherung.
 
     Args:
         input_file: Input CSV Pfad (normalisiert)
         output_file: Output CSV Pfad (angereichert)
+        vectorized: Masken/Merge statt df.apply pro Zeile (gleiche Ausgabe)
 
     Returns:
         Exit code
@@ -356,14 +377,10 @@ def enrich_csv(input_file: str, output_file: str) -> int:
     # Anreicherung
     print("Reichere Daten an...\n")
 
-    print("  1. Füge Plug Type hinzu...")
-    df["Plug Type"] = df.apply(determine_plug_type_eu, axis=1)
-
-    print("  2. Füge Autocharge Support hinzu...")
-    df["Autocharge Support"] = df.apply(determine_autocharge_eu, axis=1)
-
-    print("  3. Füge Emergency Release Location hinzu...")
-    df["Emergency Release Location"] = df.apply(determine_emergency_release_eu, axis=1)
+    if vectorized:
+        df = enrich_frame(df)
+    else:
+        df = enrich_frame_rowwise(df)
 
     # Stats
     print(f"\n{'='*60}")
@@ -413,10 +430,15 @@ def parse_args() -> argparse.Namespace:
         default="/sessions/confident-cool-euler/mnt/Lemonflow/ev_eu_enriched.csv",
         help="Output CSV"
     )
+    p.add_argument(
+        "--rowwise",
+        action="store_true",
+        help="Bisherigen zeilenweisen df.apply-Pfad statt Masken/Merge verwenden"
+    )
     return p.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    exit_code = enrich_csv(args.input, args.output)
+    exit_code = enrich_csv(args.input, args.output, vectorized=not args.rowwise)
     raise SystemExit(exit_code)
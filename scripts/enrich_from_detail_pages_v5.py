@@ -14,7 +14,28 @@ Verwendung:
         --input ev_database_normalized_v4.csv \
         --output ev_database_enriched_details.csv \
         --workers 5 \
+        --rps 5 \
         --max-vehicles 100
+
+    # Wiederholter Lauf ohne Netzwerk (nur Replay aus dem HTTP-Cache):
+    python3 enrich_from_detail_pages_v5.py -i raw.csv -o enriched.csv --cache-dir .http_cache --offline
+
+    # Pipeline: Fetch-Threads → Queue → Parse-Prozesse → 1 Writer
+    python3 enrich_from_detail_pages_v5.py -i raw.csv -o enriched.csv --pipeline --workers 8 --parse-workers 4
+
+    # Mit begrenztem Budget die wertvollsten Lücken zuerst füllen
+    python3 enrich_from_detail_pages_v5.py -i raw.csv -o enriched.csv --budget-requests 200 --budget-seconds 600
+
+    # HTML archivieren; nach Änderung der Regexe lokal neu parsen (ohne Budget, Journal wird fortgeschrieben)
+    python3 enrich_from_detail_pages_v5.py -i raw.csv -o enriched.csv --archive detail_pages.sqlite
+    python3 enrich_from_detail_pages_v5.py -i raw.csv -o enriched.csv --archive detail_pages.sqlite --reparse-archive
+
+    # Abgebrochenen Lauf fortsetzen (Journal: <output>.journal.jsonl)
+    python3 enrich_from_detail_pages_v5.py -i raw.csv -o enriched.csv --resume
+
+    # Inkrementell: nur neue/geänderte /car/<id>/ Seiten laden, Rest aus dem letzten Lauf übernehmen
+    python3 enrich_from_detail_pages_v5.py -i raw_new.csv -o enriched_new.csv \
+        --previous-raw raw_old.csv --previous-output enriched_old.csv
 """
 
 import pandas as pd
@@ -27,108 +48,222 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from threading import Lock
 from collections import defaultdict
 
+import fast_parse
+from canonicalize import fingerprint
+from fast_parse import visible_text
+from http_cache import ResponseCache, add_cache_args, cache_from_args
+from html_archive import HtmlArchive
+from http_client import TokenBucket, make_session
+from incremental import car_id_from_url, diff_listings, previous_specs_by_car_id, print_diff_summary
+from journal import EnrichmentJournal
+from pipeline import FetchParsePipeline
+from scheduler import Budget, BudgetExhausted, group_by_car_id, manufacturer_fill_rates, prioritize
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
 }
 TIMEOUT = 15
-REQUEST_DELAY = 0.3  # Zwischen Requests
+REQUEST_DELAY = 0.3  # Zwischen Requests (nur ohne globalen Limiter)
+REQUESTS_PER_SECOND = 5.0  # Globales Budget für alle Worker zusammen
 
 # ============================================================================
 # SPEC EXTRACTION
 # ============================================================================
 
-def extract_specs_from_detail_html(html: str) -> dict:
-    """Extract battery and charging specs from detail page HTML."""
+def detail_page_text(html: str, fast: bool = True) -> str:
+    """
+    Visible text of a detail page. The fast path streams the text without
+    building a tree (fast_parse.visible_text); BeautifulSoup is the fallback.
+    """
+    if fast:
+        try:
+            return visible_text(html)
+        except Exception as e:
+            print(f"      Fast parser failed ({e}), falling back to html.parser")
+    return BeautifulSoup(html, 'html.parser').get_text()
+
 
-    specs = {
+def _empty_specs() -> dict:
+    return {
         'battery_capacity': None,
         'charging_ac': None,
         'charging_dc': None,
     }
 
-    if not html:
-        return specs
 
+def extract_specs_from_detail_html(html: str, fast: bool = True) -> dict:
+    """Extract battery and charging specs from detail page HTML (empty specs on error)."""
     try:
-        soup = BeautifulSoup(html, 'html.parser')
-        text = soup.get_text()
-
-        # ===== BATTERIE CAPACITY =====
-        # Patterns: "108.7 kWh", "115.0 kWh"
-        battery_match = re.search(r'(\d+(?:\.\d+)?)\s*kWh(?:\s+Useable)?', text)
-        if battery_match:
-            battery_val = float(battery_match.group(1))
-            if 10 <= battery_val <= 150:
-                specs['battery_capacity'] = battery_val
-
-        # ===== AC CHARGING =====
-        # Patterns: "11 kW AC", "11.0 kW On-Board"
-        ac_match = re.search(r'(\d+(?:\.\d+)?)\s*kW\s+(?:AC|On-Board)', text, re.IGNORECASE)
-        if ac_match:
-            ac_val = float(ac_match.group(1))
-            if 3 <= ac_val <= 22:
-                specs['charging_ac'] = ac_val
-
-        # ===== DC CHARGING =====
-        # Patterns: "400 kW DC", "230 kW DC", "350 kW DC"
-        # Find the MAIN DC rate (usually first or max value)
-        dc_matches = re.findall(r'(\d+(?:\.\d+)?)\s*kW\s+DC', text, re.IGNORECASE)
-        if dc_matches:
-            # Use first occurrence (usually the main charging capability)
-            dc_val = float(dc_matches[0])
-            if 50 <= dc_val <= 350:  # DC is typically > 50 kW
-                specs['charging_dc'] = dc_val
-
-        return specs
-
+        return _extract_specs(html, fast)
     except Exception as e:
         print(f"      Error parsing HTML: {e}")
+        return _empty_specs()
+
+
+def _extract_specs(html: str, fast: bool = True) -> dict:
+    """extract_specs_from_detail_html without the error handling – raises, so failures are never memoized."""
+
+    specs = _empty_specs()
+
+    if not html:
         return specs
 
+    text = detail_page_text(html, fast)
+
+    # ===== BATTERIE CAPACITY =====
+    # Patterns: "108.7 kWh", "115.0 kWh"
+    battery_match = re.search(r'(\d+(?:\.\d+)?)\s*kWh(?:\s+Useable)?', text)
+    if battery_match:
+        battery_val = float(battery_match.group(1))
+        if 10 <= battery_val <= 150:
+            specs['battery_capacity'] = battery_val
+
+    # ===== AC CHARGING =====
+    # Patterns: "11 kW AC", "11.0 kW On-Board"
+    ac_match = re.search(r'(\d+(?:\.\d+)?)\s*kW\s+(?:AC|On-Board)', text, re.IGNORECASE)
+    if ac_match:
+        ac_val = float(ac_match.group(1))
+        if 3 <= ac_val <= 22:
+            specs['charging_ac'] = ac_val
+
+    # ===== DC CHARGING =====
+    # Patterns: "400 kW DC", "230 kW DC", "350 kW DC"
+    # Find the MAIN DC rate (usually first or max value)
+    dc_matches = re.findall(r'(\d+(?:\.\d+)?)\s*kW\s+DC', text, re.IGNORECASE)
+    if dc_matches:
+        # Use first occurrence (usually the main charging capability)
+        dc_val = float(dc_matches[0])
+        if 50 <= dc_val <= 350:  # DC is typically > 50 kW
+            specs['charging_dc'] = dc_val
+
+    return specs
+
+
+# Parse-Memo-Schlüssel im Archiv: ändert sich mit jedem Edit am Extraktor, kein Hochzählen von Hand
+EXTRACTOR_FINGERPRINT = fingerprint(fast_parse, detail_page_text, _extract_specs)
+MEMO_EXTRACTOR = 'detail_specs'
+
+
+def fetch_detail_page(detail_url: str, request_delay: float = 0.3, cache: ResponseCache | None = None,
+                      session: requests.Session | None = None, limiter: TokenBucket | None = None,
+                      budget: Budget | None = None) -> str | None:
+    """
+    Fetch a single detail page (through the response cache if given).
 
-def fetch_detail_page(detail_url: str, request_delay: float = 0.3) -> str | None:
-    """Fetch a single detail page."""
+    With a shared limiter the global token bucket paces requests; otherwise
+    each call sleeps request_delay as before. The budget is only charged for
+    real network requests (not for fresh cache hits); raises BudgetExhausted
+    when it refuses one.
+    """
 
     if not detail_url:
         return None
 
+    def wait_turn():
+        if budget is not None and not budget.take():
+            raise BudgetExhausted(detail_url)
+        if limiter is not None:
+            limiter.acquire()
+        else:
+            time.sleep(request_delay)  # Rate limiting
+
     try:
         full_url = f"https://ev-database.org{detail_url}" if detail_url.startswith('/') else detail_url
 
-        time.sleep(request_delay)  # Rate limiting
+        if cache is not None:
+            # wait_turn nur bei echtem Request (auch wenn der Eintrag gerade abläuft)
+            return cache.get_text(full_url, session=session, headers=HEADERS, timeout=TIMEOUT,
+                                  before_request=wait_turn)
 
-        response = requests.get(full_url, headers=HEADERS, timeout=TIMEOUT)
+        wait_turn()
+
+        response = (session or requests).get(full_url, headers=HEADERS, timeout=TIMEOUT)
         response.raise_for_status()
 
         return response.text
 
+    except BudgetExhausted:
+        raise
     except Exception as e:
         return None
 
 
-def enrich_single_vehicle(index: int, row: pd.Series, request_delay: float = 0.3) -> tuple[int, dict]:
+def enrich_single_vehicle(index: int, row: pd.Series, request_delay: float = 0.3,
+                          cache: ResponseCache | None = None, fast_parser: bool = True,
+                          session: requests.Session | None = None,
+                          limiter: TokenBucket | None = None, budget: Budget | None = None,
+                          archive: HtmlArchive | None = None) -> tuple[int, dict]:
     """
     Enrich a single vehicle by fetching detail page.
 
     Returns:
-        (index, specs_dict)
+        (index, specs_dict) – specs_dict is empty if the fetch failed, None if
+        the budget refused the request
     """
 
     detail_url = row.get('Detail URL', '') if hasattr(row, 'get') else row['Detail URL']
 
-    html = fetch_detail_page(detail_url, request_delay)
-    specs = extract_specs_from_detail_html(html) if html else {}
+    try:
+        html = fetch_detail_page(detail_url, request_delay, cache, session, limiter, budget)
+    except BudgetExhausted:
+        return (index, None)
+    if not html:
+        return (index, {})
+    if archive is not None:
+        archive.put(car_id_from_url(detail_url) or detail_url, detail_url, html)
+        return (index, parse_archived(archive, html, fast_parser))
+
+    return (index, extract_specs_from_detail_html(html, fast_parser))
+
 
-    return (index, specs)
+def parse_archived(archive: HtmlArchive, html: str, fast_parser: bool = True) -> dict:
+    """
+    Specs of html, memoized in the archive by (HTML hash, EXTRACTOR_FINGERPRINT,
+    fast_parser). A parse error yields {} (failed, retried with --resume) and is not memoized.
+    """
+    try:
+        return archive.parse(html, MEMO_EXTRACTOR, EXTRACTOR_FINGERPRINT, _extract_specs, fast_parser)
+    except Exception as e:
+        print(f"      Error parsing HTML: {e}")
+        return {}
 
 
 # ============================================================================
 # MAIN
 # ============================================================================
 
-def enrich_from_details(input_file: str, output_file: str, workers: int = 5, max_vehicles: int = None) -> int:
+def enrich_from_details(input_file: str, output_file: str, workers: int = 5, max_vehicles: int = None,
+                        cache: ResponseCache | None = None, previous_raw: str = None,
+                        previous_output: str = None, fast_parser: bool = True,
+                        rps: float = REQUESTS_PER_SECOND, journal_file: str = None,
+                        resume: bool = False, pipeline: bool = False, parse_workers: int = 2,
+                        order: str = 'priority', budget_requests: int = None,
+                        budget_seconds: float = None, archive: HtmlArchive | None = None,
+                        reparse: bool = False) -> int:
     """
     Enrich vehicle specs by fetching detail pages in parallel.
+
+    All workers share one pooled Session (keep-alive) and one token bucket, so
+    the request rate against the origin is `rps` regardless of `workers`.
+
+    Every fetched result is appended to a JSONL journal (default
+    <output_file>.journal.jsonl). The journal is never truncated: it is also
+    the hit-rate history for order='priority' (the newest entry per URL wins
+    on load). With resume=True URLs already in the journal
+    are not fetched again.
+
+    With pipeline=True, `workers` threads only download and `parse_workers`
+    processes parse (pipeline.FetchParsePipeline); otherwise each thread does both.
+
+    order='priority' fetches rows by expected yield first (scheduler.prioritize);
+    budget_requests / budget_seconds stop fetching once the budget is used up.
+
+    reparse=True re-extracts every archived page offline: no budget, no resume
+    or priority filtering, and results are appended to the existing journal.
+
+    With previous_raw/previous_output (raw input and enriched output of the last
+    run) unchanged car IDs take their specs from the previous enriched file and
+    are only fetched again if Battery or DC is still missing afterwards.
     """
 
     print(f"{'='*80}")
@@ -158,37 +293,177 @@ def enrich_from_details(input_file: str, output_file: str, workers: int = 5, max
     print(f"  DC Charging: {len(df) - dc_missing}/{len(df)} ({100*(len(df)-dc_missing)/len(df):.1f}%)")
     print(f"  AC Charging: {len(df) - ac_missing}/{len(df)} ({100*(len(df)-ac_missing)/len(df):.1f}%)\n")
 
-    # Find vehicles that need enrichment (with Detail URL)
+    # Inkrementell: unveränderte Fahrzeuge aus dem vorherigen Lauf übernehmen
+    car_ids = df['Detail URL'].map(car_id_from_url)
+    unchanged = pd.Series(False, index=df.index)
+
+    if previous_raw and previous_output:
+        try:
+            prev_raw_df = pd.read_csv(previous_raw)
+            prev_specs = previous_specs_by_car_id(prev_raw_df, pd.read_csv(previous_output))
+        except Exception as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            return 1
+
+        diff = diff_listings(prev_raw_df, df)
+        print_diff_summary(diff)
+
+        unchanged = car_ids.isin(diff['unchanged'])
+        for col in prev_specs.columns:
+            carried = car_ids[unchanged].map(prev_specs[col])
+            df.loc[unchanged, col] = df.loc[unchanged, col].fillna(carried)
+
+    # Find vehicles that need enrichment (with Detail URL). Unveränderte Fahrzeuge
+    # fallen hier nur heraus, wenn die übernommenen Werte vollständig sind; fehlt
+    # Battery/DC noch (z. B. Fetch im letzten Lauf fehlgeschlagen), wird erneut geladen
     needs_details = (
         (df['Battery Capacity kWh'].isna() | df['Charging Rate DC Fast (kW)'].isna()) &
         (df['Detail URL'].notna())
     )
+    if unchanged.any():
+        print(f"Unverändert, aber noch unvollständig (erneut laden): {(needs_details & unchanged).sum()}")
 
     vehicles_to_process = df[needs_details].index.tolist()
 
     print(f"Fahrzeuge mit fehlenden Specs: {len(vehicles_to_process)}")
-    print(f"Fetching Detail-Seiten mit {workers} parallel workers...\n")
 
-    # Fetch in parallel
+    # Checkpoint-Journal: bereits erledigte URLs übernehmen statt neu laden
+    journal = EnrichmentJournal(journal_file or f"{output_file}.journal.jsonl")
     specs_dict = {}
-    processed = 0
-
-    with ThreadPoolExecutor(max_workers=workers) as executor:
-        futures = {}
 
+    done = journal.load()
+    if resume and not reparse:
+        done_by_car_id = {car_id_from_url(url): specs for url, specs in done.items() if car_id_from_url(url)}
         for idx in vehicles_to_process:
-            future = executor.submit(enrich_single_vehicle, idx, df.loc[idx], REQUEST_DELAY)
-            futures[future] = idx
-
-        for future in as_completed(futures):
-            idx, specs = future.result()
+            specs = done.get(df.at[idx, 'Detail URL'], done_by_car_id.get(car_ids[idx]))
+            if specs is not None:
+                specs_dict[idx] = specs
+        resumed = len(specs_dict)
+        vehicles_to_process = [idx for idx in vehicles_to_process if idx not in specs_dict]
+        print(f"Resume: {resumed} aus Journal übernommen ({journal.path}), {len(vehicles_to_process)} offen")
+
+    # Reihenfolge nach erwartetem Ertrag (Trefferquoten aus dem bisherigen Journal)
+    if order == 'priority' and not reparse:
+        vehicles_to_process = prioritize(df, vehicles_to_process, manufacturer_fill_rates(df, done))
+        print(f"Reihenfolge: nach erwartetem Ertrag (fehlende Felder × Hersteller-Trefferquote)")
+
+    budget = None
+    if not reparse and (budget_requests is not None or budget_seconds is not None):
+        budget = Budget(budget_requests, budget_seconds)
+        print(f"Budget: max. {'∞' if budget_requests is None else budget_requests} Requests, "
+              f"{'∞' if budget_seconds is None else budget_seconds} s")
+
+    # Coalescing: ein Request pro /car/<id>/, das Ergebnis gilt für alle Zeilen dieser ID
+    rows_by_key = group_by_car_id(df, vehicles_to_process)
+    print(f"Coalescing: {len(vehicles_to_process)} Zeilen → {len(rows_by_key)} Detail-Requests")
+
+    if not reparse:
+        print(f"Fetching Detail-Seiten mit {workers} parallel workers (max. {rps:g} Requests/s gesamt)...\n")
+
+    # Fetch in parallel – eine Session + ein Limiter für alle Worker
+    session = make_session(pool_size=workers, headers=HEADERS)
+    limiter = TokenBucket(rps)
+    processed = 0
+    skipped = 0  # vom Budget abgelehnt, zählen nicht als geladen
+    refused_urls = set()
+
+    def record(key: str, url: str, specs: dict | None) -> None:
+        """
+        Single place where results are applied (thread mode: main thread,
+        pipeline: writer thread); fans one fetched page out to all its rows.
+        specs None (or a URL the budget refused) = not fetched, nothing recorded.
+        """
+        nonlocal processed, skipped
+        if specs is None or url in refused_urls:
+            skipped += 1
+            return
+        for idx in rows_by_key[key]:
             specs_dict[idx] = specs
-            processed += 1
-
-            if processed % max(1, len(vehicles_to_process) // 10) == 0:
-                print(f"  Progress: {processed}/{len(vehicles_to_process)}")
-
-    print(f"\n✅ Fetched {processed} detail pages\n")
+            if specs:  # nur erfolgreiche Fetches, Fehler werden bei --resume wiederholt
+                journal.append(idx, df.at[idx, 'Detail URL'], specs)
+        processed += 1
+
+        if processed % max(1, len(rows_by_key) // 10) == 0:
+            print(f"  Progress: {processed}/{len(rows_by_key)}")
+
+    def fetch_and_archive(url: str) -> str | None:
+        try:
+            html = fetch_detail_page(url, REQUEST_DELAY, cache, session, limiter, budget)
+        except BudgetExhausted:
+            refused_urls.add(url)
+            return None
+        if html and archive is not None:
+            archive.put(car_id_from_url(url) or url, url, html)
+        return html
+
+    if reparse:
+        # Offline: archivierte Seiten neu parsen, kein Netzwerk
+        not_archived = 0
+        with journal.open(append=True):
+            for key, rows in rows_by_key.items():
+                html = archive.get(key)
+                if html is None:
+                    not_archived += 1
+                    continue
+                record(key, df.at[rows[0], 'Detail URL'], parse_archived(archive, html, fast_parser))
+        print(f"\nRe-Parse aus {archive.path}: {len(rows_by_key) - not_archived} Seiten, {not_archived} nicht archiviert")
+
+    elif pipeline:
+        # Mit Archiv: Memo vor dem Prozess-Pool prüfen, neue Ergebnisse schreibt der Writer-Thread
+        memo = {}
+        if archive is not None:
+            memo = dict(
+                memo_get=lambda html: archive.memo_get(html, MEMO_EXTRACTOR, EXTRACTOR_FINGERPRINT, (fast_parser,)),
+                memo_put=lambda html, specs: archive.memo_put(html, MEMO_EXTRACTOR, EXTRACTOR_FINGERPRINT, specs,
+                                                              (fast_parser,)),
+            )
+        engine = FetchParsePipeline(
+            fetch=fetch_and_archive,
+            parse=_extract_specs if archive is not None else extract_specs_from_detail_html,
+            parse_args=(fast_parser,),
+            fetch_workers=workers,
+            parse_workers=parse_workers,
+            **memo,
+        )
+        with journal.open(append=True):
+            try:
+                engine.run(((key, df.at[rows[0], 'Detail URL']) for key, rows in rows_by_key.items()), record)
+            except KeyboardInterrupt:
+                print(f"\n⚠ Abgebrochen nach {processed} Seiten – Fortsetzen mit --resume ({journal.path})")
+                return 130
+        print(f"\n{engine.report()}")
+
+    else:
+        with journal.open(append=True), ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {}
+
+            for key, rows in rows_by_key.items():
+                future = executor.submit(enrich_single_vehicle, key, df.loc[rows[0]], REQUEST_DELAY, cache,
+                                         fast_parser, session, limiter, budget, archive)
+                futures[future] = key
+
+            try:
+                for future in as_completed(futures):
+                    try:
+                        key, specs = future.result()
+                    except Exception as e:
+                        print(f"  ⚠ Worker failed for {futures[future]}: {e}")
+                        continue
+                    record(key, df.at[rows_by_key[key][0], 'Detail URL'], specs)
+
+            except KeyboardInterrupt:
+                executor.shutdown(wait=False, cancel_futures=True)
+                print(f"\n⚠ Abgebrochen nach {processed} Seiten – Fortsetzen mit --resume ({journal.path})")
+                return 130
+
+    print(f"\n✅ {'Re-parsed' if reparse else 'Fetched'} {processed} detail pages"
+          + (f" ({skipped} wegen Budget übersprungen)" if skipped else "") + "\n")
+    if budget is not None:
+        print(f"{budget.summary()}\n")
+    if cache is not None:
+        print(f"{cache.summary()}\n")
+    if archive is not None:
+        print(f"{archive.summary()}\n")
 
     # Apply enrichment to DataFrame
     print(f"Applying enrichment to DataFrame...")
@@ -235,9 +510,37 @@ if __name__ == "__main__":
     parser.add_argument('--input', '-i', required=True, help='Input CSV')
     parser.add_argument('--output', '-o', required=True, help='Output CSV')
     parser.add_argument('--workers', '-w', type=int, default=5, help='Number of parallel workers')
+    parser.add_argument('--rps', type=float, default=REQUESTS_PER_SECOND,
+                        help=f'Global requests/sec for all workers together (default {REQUESTS_PER_SECOND:g}, 0 = unlimited)')
     parser.add_argument('--max-vehicles', '-m', type=int, default=None, help='Max vehicles to process (for testing)')
+    parser.add_argument('--previous-raw', default=None, help='Raw CSV of the last run (incremental mode)')
+    parser.add_argument('--previous-output', default=None, help='Enriched CSV of the last run (incremental mode)')
+    parser.add_argument('--parser', choices=['fast', 'bs4'], default='fast',
+                        help='HTML parser: fast (streaming text) or bs4 (full html.parser tree)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='Fetch on --workers threads, parse on --parse-workers processes')
+    parser.add_argument('--parse-workers', type=int, default=2, help='Parser processes for --pipeline')
+    parser.add_argument('--order', choices=['priority', 'csv'], default='priority',
+                        help='Fetch order: expected yield first (default) or CSV order')
+    parser.add_argument('--budget-requests', type=int, default=None, help='Stop after this many detail requests')
+    parser.add_argument('--budget-seconds', type=float, default=None, help='Stop fetching after this many seconds')
+    parser.add_argument('--journal', default=None, help='Checkpoint journal (default: <output>.journal.jsonl)')
+    parser.add_argument('--resume', action='store_true', help='Skip URLs already recorded in the journal')
+    parser.add_argument('--archive', default=None,
+                        help='SQLite archive of compressed detail HTML + parse memo (keyed by car ID)')
+    parser.add_argument('--reparse-archive', action='store_true',
+                        help='Re-run extraction on archived pages only, without network access')
+    add_cache_args(parser)
 
     args = parser.parse_args()
-
-    exit_code = enrich_from_details(args.input, args.output, args.workers, args.max_vehicles)
+    if bool(args.previous_raw) != bool(args.previous_output):
+        parser.error("--previous-raw and --previous-output must be given together")
+    if args.reparse_archive and not args.archive:
+        parser.error("--reparse-archive requires --archive")
+
+    exit_code = enrich_from_details(args.input, args.output, args.workers, args.max_vehicles, cache_from_args(args),
+                                    args.previous_raw, args.previous_output, args.parser == 'fast', args.rps,
+                                    args.journal, args.resume, args.pipeline, args.parse_workers,
+                                    args.order, args.budget_requests, args.budget_seconds,
+                                    HtmlArchive(args.archive) if args.archive else None, args.reparse_archive)
     sys.exit(exit_code)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+fast_parse.py
+
+Schnelle Parser-Pfade für ev-database.org Listing- und Detail-Seiten.
+
+- Listing: BeautifulSoup mit SoupStrainer('a') – es wird nur der <a>-Teilbaum
+  aufgebaut statt der ganzen Seite (lxml als Tokenizer, falls installiert)
+- Detail: Streaming-Tokenizer, der nur den sichtbaren Text sammelt (ohne Baum),
+  mit denselben Ausschlüssen wie BeautifulSoup.get_text() (script, style,
+  template, rt, rp, Kommentare); lxml als Tokenizer, falls installiert
+
+Der bisherige Pfad (BeautifulSoup(html, 'html.parser')) bleibt in den Skripten
+als Fallback (--parser bs4) erhalten.
+"""
+
+from __future__ import annotations
+
+from html.parser import HTMLParser
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml.etree as _etree
+except ImportError:  # lxml ist optional
+    _etree = None
+
+
+LISTING_PARSER = 'lxml' if _etree is not None else 'html.parser'
+TITLE_LINKS = SoupStrainer('a')
+
+# Wie bs4's HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS: Text darin zählt nicht zu get_text()
+HIDDEN_TEXT_TAGS = frozenset({'script', 'style', 'template', 'rt', 'rp'})
+
+
+def listing_soup(html: str) -> BeautifulSoup:
+    """Soup containing only the <a> elements of a listing page."""
+    return BeautifulSoup(html, LISTING_PARSER, parse_only=TITLE_LINKS)
+
+
+class _TextCollector:
+    """Collects visible text; shared by the html.parser and lxml tokenizers."""
+
+    def __init__(self):
+        self.parts: list[str] = []
+        self.hidden_depth = 0
+
+    def start(self, tag, attrib=None):
+        if tag in HIDDEN_TEXT_TAGS:
+            self.hidden_depth += 1
+
+    def end(self, tag):
+        if tag in HIDDEN_TEXT_TAGS and self.hidden_depth:
+            self.hidden_depth -= 1
+
+    def data(self, data):
+        if not self.hidden_depth:
+            self.parts.append(data)
+
+    def close(self) -> str:
+        return ''.join(self.parts)
+
+
+class _StdlibTextParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.collector = _TextCollector()
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag)
+
+    def handle_startendtag(self, tag, attrs):
+        pass  # <br/> etc.: kein Inhalt
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+    def unknown_decl(self, data):
+        if data.startswith('CDATA['):  # bs4 zählt CDATA zum Text
+            self.collector.data(data[len('CDATA['):])
+
+
+def visible_text(html: str) -> str:
+    """Visible page text, equivalent to BeautifulSoup(html).get_text() for regex matching."""
+    if _etree is not None:
+        parser = _etree.HTMLParser(target=_TextCollector())
+        parser.feed(html)
+        return parser.close()
+
+    parser = _StdlibTextParser()
+    parser.feed(html)
+    parser.close()
+    return parser.collector.close()
@@ -3,15 +3,26 @@
 fix_eu_data.py
 
 Korrigiert die rohen EV-Daten: Splittet Hersteller/Modell-Strings korrekt.
+Jeder eindeutige String wird nur einmal gesplittet (canonicalize.map_unique).
+
+Hersteller am Anfang/Ende werden über einen Präfix- und einen Suffix-Trie
+(brand_trie.py) gesucht, die einmal beim Import gebaut werden;
+split_manufacturer_model_linear ist die bisherige Schleife über die sortierte
+Liste (Referenz für bench_split.py).
+
+Das Memo liegt als .canon_memo.sqlite neben OUTPUT_CSV (--memo PATH, --no-memo).
 """
 
+import argparse
+
 import pandas as pd
 import re
 
-df = pd.read_csv('/sessions/confident-cool-euler/mnt/Lemonflow/ev_database_raw.csv')
+from brand_trie import BrandTrie
+from canonicalize import map_unique, memo_path_for, open_memo
 
-print(f"Original: {len(df)} Zeilen")
-print(f"Spalten: {list(df.columns)}")
+INPUT_CSV = '/sessions/confident-cool-euler/mnt/Lemonflow/ev_database_raw.csv'
+OUTPUT_CSV = '/sessions/confident-cool-euler/mnt/Lemonflow/ev_database_raw_fixed.csv'
 
 # Korrekte Hersteller-Liste (basierend auf top Herstellern)
 MANUFACTURERS = [
@@ -28,7 +39,25 @@ MANUFACTURERS = [
     'Maserati', 'Ferrari', 'Lamborghini', 'Bugatti'
 ]
 
-def split_manufacturer_model(text):
+PREFIX_TRIE = BrandTrie(MANUFACTURERS)
+SUFFIX_TRIE = BrandTrie(MANUFACTURERS, suffix=True)
+
+
+def _split_fallback(text):
+    # Fallback: Split nach erstem Großbuchstaben nach Position 2
+    for i in range(2, min(len(text), 10)):
+        if text[i].isupper() and text[i-1].islower():
+            return text[:i], text[i:]
+
+    # Letzter Fallback
+    parts = text.split()
+    if len(parts) > 1:
+        return parts[0], ' '.join(parts[1:])
+
+    return text, "Unknown"
+
+
+def split_manufacturer_model(text, prefix_trie=PREFIX_TRIE, suffix_trie=SUFFIX_TRIE):
     """Splittet "ManufacturerModel" in ("Manufacturer", "Model")"""
 
     if not isinstance(text, str) or not text:
@@ -36,13 +65,37 @@ def split_manufacturer_model(text):
 
     text = text.strip()
 
+    # Bekannte Hersteller vom Anfang, längste zuerst
+    for mfr in prefix_trie.matches(text):
+        model = text[len(mfr):].strip()
+
+        # Entferne Hersteller auch vom Ende des Models (z.B. "iX3BMW" → "iX3")
+        for mfr2 in suffix_trie.matches(model):
+            if mfr2 != mfr:
+                model = model[:-len(mfr2)].strip()
+                break
+
+        if model:
+            return mfr, model
+
+    return _split_fallback(text)
+
+
+def split_manufacturer_model_linear(text, manufacturers=MANUFACTURERS):
+    """Bisheriger Pfad: lineare Suche über die nach Länge sortierte Liste."""
+
+    if not isinstance(text, str) or not text:
+        return "Unknown", "Unknown"
+
+    text = text.strip()
+
     # Versuche zu matchken bekannte Hersteller vom Anfang
-    for mfr in sorted(MANUFACTURERS, key=lambda x: -len(x)):  # Längste zuerst
+    for mfr in sorted(manufacturers, key=lambda x: -len(x)):  # Längste zuerst
         if text.startswith(mfr):
             model = text[len(mfr):].strip()
 
             # Entferne Hersteller auch vom Ende des Models (z.B. "iX3BMW" → "iX3")
-            for mfr2 in sorted(MANUFACTURERS, key=lambda x: -len(x)):
+            for mfr2 in sorted(manufacturers, key=lambda x: -len(x)):
                 if model.endswith(mfr2) and mfr2 != mfr:
                     model = model[:-len(mfr2)].strip()
                     break
@@ -50,34 +103,51 @@ def split_manufacturer_model(text):
             if model:
                 return mfr, model
 
-    # Fallback: Split nach erstem Großbuchstaben nach Position 2
-    for i in range(2, min(len(text), 10)):
-        if text[i].isupper() and text[i-1].islower():
-            return text[:i], text[i:]
+    return _split_fallback(text)
 
-    # Letzter Fallback
-    parts = text.split()
-    if len(parts) > 1:
-        return parts[0], ' '.join(parts[1:])
 
-    return text, "Unknown"
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Hersteller/Modell-Strings der rohen EV-Daten korrekt splitten")
+    p.add_argument("--memo", default=None,
+                   help="Memo für gesplittete Strings über Läufe hinweg (default: .canon_memo.sqlite neben OUTPUT_CSV)")
+    p.add_argument("--no-memo", action="store_true", help="Kein Memo verwenden")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    memo_path = None if args.no_memo else (args.memo or memo_path_for(OUTPUT_CSV))
+
+    df = pd.read_csv(INPUT_CSV)
+
+    print(f"Original: {len(df)} Zeilen")
+    print(f"Spalten: {list(df.columns)}")
+
+    # Anwende Korrektur (einmal pro eindeutigem String, Memo über Läufe hinweg)
+    memo = open_memo('split_manufacturer_model', split_manufacturer_model, _split_fallback,
+                     BrandTrie, MANUFACTURERS, path=memo_path)
+    df['Manufacturer_Fixed'], df['Model_Fixed'] = map_unique(
+        split_manufacturer_model, df['Manufacturer'], memo=memo, unpack=2)
+    if memo is not None:
+        print(memo.summary())
+        memo.close()
+
+    # Ersetze Spalten
+    df['Manufacturer'] = df['Manufacturer_Fixed']
+    df['Model'] = df['Model_Fixed'].fillna(df['Model'])  # Nutze Model_Fixed, fallback zu Model
 
-# Anwende Korrektur
-df['Manufacturer_Fixed'] = df['Manufacturer'].apply(lambda x: split_manufacturer_model(x)[0])
-df['Model_Fixed'] = df['Manufacturer'].apply(lambda x: split_manufacturer_model(x)[1])
+    # Entferne temporäre Spalten
+    df = df.drop(['Manufacturer_Fixed', 'Model_Fixed'], axis=1)
 
-# Ersetze Spalten
-df['Manufacturer'] = df['Manufacturer_Fixed']
-df['Model'] = df['Model_Fixed'].fillna(df['Model'])  # Nutze Model_Fixed, fallback zu Model
+    # Speichere
+    df.to_csv(OUTPUT_CSV, index=False)
 
-# Entferne temporäre Spalten
-df = df.drop(['Manufacturer_Fixed', 'Model_Fixed'], axis=1)
+    print(f"\n✅ Korrigiert: {len(df)} Zeilen")
+    print(f"\nBeispiele:")
+    print(df[['Manufacturer', 'Model', 'Battery Capacity kWh', 'Charging Rate DC Fast (kW)']].head(15).to_string())
+    print(f"\nTop Hersteller:")
+    print(df['Manufacturer'].value_counts().head(15))
 
-# Speichere
-df.to_csv('/sessions/confident-cool-euler/mnt/Lemonflow/ev_database_raw_fixed.csv', index=False)
 
-print(f"\n✅ Korrigiert: {len(df)} Zeilen")
-print(f"\nBeispiele:")
-print(df[['Manufacturer', 'Model', 'Battery Capacity kWh', 'Charging Rate DC Fast (kW)']].head(15).to_string())
-print(f"\nTop Hersteller:")
-print(df['Manufacturer'].value_counts().head(15))
+if __name__ == "__main__":
+    main()
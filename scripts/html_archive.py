@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+html_archive.py
+
+HTML-Archiv der Detail-Seiten plus Parse-Memo, damit geänderte Regexe ohne
+Netzwerk neu angewendet werden können.
+
+- pages:  car_id → zlib-komprimiertes HTML (SQLite, wahlfreier Zugriff per Schlüssel)
+- parsed: (sha256 des HTML, Extraktor, Version + Extraktor-Argumente) → Specs als JSON
+  (z. B. fast_parser=True/False getrennt; wirft der Extraktor, wird nichts gespeichert)
+
+Als Version dient ein Fingerprint über den Quelltext des Extraktors
+(z. B. EXTRACTOR_FINGERPRINT in enrich_from_detail_pages_v5.py, siehe
+canonicalize.fingerprint): jede Änderung am Extraktor ergibt automatisch einen
+neuen Schlüssel. --reparse-archive parst dann alle archivierten Seiten lokal
+neu, unveränderte (HTML, Version)-Paare kommen direkt aus dem Memo.
+
+Verwendung (im Enrichment):
+    --archive detail_pages.sqlite [--reparse-archive]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Callable
+
+
+def html_hash(html: str) -> str:
+    return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+
+class HtmlArchive:
+    """Compressed HTML store keyed by car ID with a parse memo. Safe to share between threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.stats = {'archived': 0, 'memo_hit': 0, 'parsed': 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                car_id TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                html_hash TEXT NOT NULL,
+                html BLOB NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS parsed (
+                html_hash TEXT NOT NULL,
+                extractor TEXT NOT NULL,
+                version TEXT NOT NULL,
+                specs TEXT NOT NULL,
+                PRIMARY KEY (html_hash, extractor, version)
+            );
+        """)
+        self._db.commit()
+
+    # ── HTML ──
+
+    def put(self, car_id: str, url: str, html: str) -> str:
+        """Store (or replace) the page of car_id; returns its HTML hash."""
+        digest = html_hash(html)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (car_id, url, digest, zlib.compress(html.encode('utf-8'), 6), time.time()),
+            )
+            self._db.commit()
+            self.stats['archived'] += 1
+        return digest
+
+    def get(self, car_id: str) -> str | None:
+        with self._lock:
+            row = self._db.execute("SELECT html FROM pages WHERE car_id = ?", (car_id,)).fetchone()
+        return zlib.decompress(row[0]).decode('utf-8') if row else None
+
+    def car_ids(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT car_id FROM pages ORDER BY car_id")]
+
+    # ── Parse-Memo ──
+
+    @staticmethod
+    def _memo_key(html: str, extractor: str, version, args: tuple) -> tuple[str, str, str]:
+        # Argumente wie fast_parser gehören zur Version, sonst teilen sich beide Parser ein Ergebnis
+        return (html_hash(html), extractor, f"{version}|{json.dumps(list(args))}")
+
+    def memo_get(self, html: str, extractor: str, version, args: tuple = ()) -> dict | None:
+        """Memoized specs of (html, extractor, version, args), or None."""
+        key = self._memo_key(html, extractor, version, args)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT specs FROM parsed WHERE html_hash = ? AND extractor = ? AND version = ?", key
+            ).fetchone()
+            if row:
+                self.stats['memo_hit'] += 1
+        return json.loads(row[0]) if row else None
+
+    def memo_put(self, html: str, extractor: str, version, specs: dict, args: tuple = ()) -> None:
+        key = self._memo_key(html, extractor, version, args)
+        with self._lock:
+            self._db.execute("INSERT OR REPLACE INTO parsed VALUES (?, ?, ?, ?)", (*key, json.dumps(specs)))
+            self._db.commit()
+            self.stats['parsed'] += 1
+
+    def parse(self, html: str, extractor: str, version, parse: Callable[..., dict], *args) -> dict:
+        """
+        parse(html, *args), memoized by (HTML hash, extractor, version, args).
+        Exceptions from parse propagate and are never memoized.
+        """
+        specs = self.memo_get(html, extractor, version, args)
+        if specs is None:
+            specs = parse(html, *args)
+            self.memo_put(html, extractor, version, specs, args)
+        return specs
+
+    def summary(self) -> str:
+        with self._lock:
+            pages, stored = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(LENGTH(html)), 0) FROM pages"
+            ).fetchone()
+        s = self.stats
+        return (f"HTML-Archiv: {pages} Seiten ({stored / 1e6:.1f} MB komprimiert), "
+                f"{s['archived']} neu archiviert, {s['parsed']} geparst, {s['memo_hit']} aus Parse-Memo")
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+"""
+http_cache.py
+
+Gemeinsamer On-Disk HTTP-Cache für alle Fetcher der Pipeline
+(fetch_page, fetch_detail_page, call_sql).
+
+- Bodies liegen content-addressed unter objects/<sha256> (identische Antworten nur 1x)
+- Index (SQLite) pro URL: Digest, ETag, Last-Modified, Abrufzeit, letzter Zugriff
+- Innerhalb der TTL: Antwort direkt von Disk, kein Request
+- Nach Ablauf der TTL: Conditional Request (If-None-Match / If-Modified-Since),
+  bei 304 wird nur der Zeitstempel erneuert
+- Größenbegrenzt: LRU-Eviction nach letztem Zugriff
+- Offline-Modus: nur Replay aus dem Cache, fehlende Einträge → CacheMiss
+  (keine RequestException: ein Fehltreffer wird nicht wie ein Netzwerkfehler wiederholt)
+- before_request=: Hook direkt vor jedem echten Request (Rate-Limiter, Budget);
+  statt is_fresh() vorher abzufragen, denn ein Eintrag kann dazwischen ablaufen
+  oder verdrängt werden
+- validate=: Prüffunktion für den Body (z. B. Fehler-JSON mit HTTP 200); ein
+  abgelehnter Body wird nicht gespeichert, ein gespeicherter nicht ausgeliefert
+
+Verwendung (in den Skripten):
+    --cache-dir .http_cache [--cache-ttl 604800] [--cache-max-mb 500] [--offline]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable
+
+import requests
+
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_MB = 500
+
+
+class CacheMiss(Exception):
+    """Raised in offline mode when a URL is not in the cache; not a network error, never retried."""
+
+
+class ResponseCache:
+    """
+    Content-addressed HTTP response cache with conditional revalidation,
+    TTL and size-bounded LRU eviction. Safe to share between threads.
+    """
+
+    def __init__(self, cache_dir: str, ttl: float = DEFAULT_TTL,
+                 max_bytes: int = DEFAULT_MAX_MB * 1024 * 1024, offline: bool = False):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.stats = {'hit': 0, 'revalidated': 0, 'fetched': 0, 'miss': 0, 'evicted': 0, 'rejected': 0}
+
+        os.makedirs(os.path.join(cache_dir, 'objects'), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(cache_dir, 'index.sqlite'), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                digest TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                encoding TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._db.commit()
+
+    # ── Storage ──
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, 'objects', digest[:2], digest)
+
+    def _read_object(self, digest: str) -> bytes | None:
+        try:
+            with open(self._object_path(digest), 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_object(self, body: bytes) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(body)
+            os.replace(tmp, path)
+        return digest
+
+    def _lookup(self, key: str) -> dict | None:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, encoding, etag, last_modified, fetched_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        return dict(zip(('digest', 'encoding', 'etag', 'last_modified', 'fetched_at'), row))
+
+    def _touch(self, key: str, refreshed: bool = False) -> None:
+        now = time.time()
+        with self._lock:
+            if refreshed:
+                self._db.execute("UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def _drop(self, key: str) -> None:
+        """Remove one entry (and its object unless another entry shares it)."""
+        with self._lock:
+            row = self._db.execute("SELECT digest FROM entries WHERE key = ?", (key,)).fetchone()
+            if not row:
+                return
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            if not self._db.execute("SELECT 1 FROM entries WHERE digest = ? LIMIT 1", (row[0],)).fetchone():
+                try:
+                    os.remove(self._object_path(row[0]))
+                except OSError:
+                    pass
+            self._db.commit()
+
+    def _store(self, key: str, url: str, response: requests.Response) -> None:
+        body = response.content
+        digest = self._write_object(body)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, url, digest, len(body), response.encoding or response.apparent_encoding,
+                 response.headers.get('ETag'), response.headers.get('Last-Modified'), now, now),
+            )
+            self._db.commit()
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            total = self._db.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM (SELECT DISTINCT digest, size FROM entries)"
+            ).fetchone()[0]
+            if total <= self.max_bytes:
+                return
+
+            for key, digest in self._db.execute(
+                "SELECT key, digest FROM entries ORDER BY accessed_at ASC"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                still_used = self._db.execute(
+                    "SELECT size FROM entries WHERE digest = ? LIMIT 1", (digest,)
+                ).fetchone()
+                if not still_used:
+                    try:
+                        total -= os.path.getsize(self._object_path(digest))
+                        os.remove(self._object_path(digest))
+                    except OSError:
+                        pass
+                self.stats['evicted'] += 1
+            self._db.commit()
+
+    # ── Public API ──
+
+    @staticmethod
+    def cache_key(url: str) -> str:
+        """Cache key for a full URL (including the query string)."""
+        return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+    def is_fresh(self, url: str) -> bool:
+        """
+        True if get_text(url) would currently be served from disk. Only a hint:
+        to rate-limit real requests use get_text(before_request=...).
+        """
+        entry = self._lookup(self.cache_key(url))
+        if not entry or not os.path.exists(self._object_path(entry['digest'])):
+            return False
+        return self.offline or time.time() - entry['fetched_at'] < self.ttl
+
+    def get_text(self, url: str, session: requests.Session | None = None,
+                 headers: dict | None = None, timeout: float = 30,
+                 validate: Callable[[str], None] | None = None,
+                 before_request: Callable[[], None] | None = None) -> str:
+        """
+        Return the response body for `url`, from disk if possible.
+
+        Raises CacheMiss in offline mode and requests exceptions (HTTPError etc.)
+        like a plain requests.get(...).raise_for_status() would.
+
+        validate(text) may raise to reject a body (e.g. an error payload sent
+        with HTTP 200): a fetched body is then not stored and the exception
+        propagates; a stored body that fails is dropped and treated as missing.
+
+        before_request() runs right before a network request (also a
+        conditional revalidation), never for a cache hit or an offline miss;
+        exceptions from it propagate and no request is made.
+        """
+        key = self.cache_key(url)
+        entry = self._lookup(key)
+        body = self._read_object(entry['digest']) if entry else None
+        if body is None:
+            entry = None
+
+        if entry and validate is not None:
+            try:
+                validate(body.decode(entry['encoding'] or 'utf-8', errors='replace'))
+            except Exception:
+                self._count('rejected')
+                self._drop(key)
+                entry = None
+
+        if entry and (self.offline or time.time() - entry['fetched_at'] < self.ttl):
+            self._count('hit')
+            self._touch(key)
+            return body.decode(entry['encoding'] or 'utf-8', errors='replace')
+
+        if self.offline:
+            self._count('miss')
+            raise CacheMiss(f"Offline: not cached: {url}")
+
+        if before_request is not None:
+            before_request()
+        request_headers = dict(headers or {})
+        if entry and entry['etag']:
+            request_headers['If-None-Match'] = entry['etag']
+        if entry and entry['last_modified']:
+            request_headers['If-Modified-Since'] = entry['last_modified']
+
+        response = (session or requests).get(url, headers=request_headers, timeout=timeout)
+
+        if entry and response.status_code == 304:
+            self._count('revalidated')
+            self._touch(key, refreshed=True)
+            return body.decode(entry['encoding'] or 'utf-8', errors='replace')
+
+        response.raise_for_status()
+        if validate is not None:
+            try:
+                validate(response.text)
+            except Exception:
+                self._count('rejected')
+                raise
+        self._count('fetched')
+        self._store(key, url, response)
+        return response.text
+
+    def summary(self) -> str:
+        s = self.stats
+        return (f"Cache: {s['hit']} hits, {s['revalidated']} revalidated (304), "
+                f"{s['fetched']} fetched, {s['miss']} misses, {s['evicted']} evicted, "
+                f"{s['rejected']} rejected")
+
+
+# ============================================================================
+# CLI HELPERS
+# ============================================================================
+
+def add_cache_args(parser: argparse.ArgumentParser) -> None:
+    """Register the shared --cache-* / --offline options on a script's parser."""
+    parser.add_argument('--cache-dir', default=None,
+                        help='Enable the on-disk HTTP cache in this directory (e.g. .http_cache)')
+    parser.add_argument('--cache-ttl', type=float, default=DEFAULT_TTL,
+                        help=f'Seconds before a cached response is revalidated (default {DEFAULT_TTL})')
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_MAX_MB,
+                        help=f'Cache size limit in MB, LRU eviction (default {DEFAULT_MAX_MB})')
+    parser.add_argument('--offline', action='store_true',
+                        help='Replay only from --cache-dir, never touch the network')
+
+
+def cache_from_args(args: argparse.Namespace) -> ResponseCache | None:
+    """Build the ResponseCache selected on the command line (None = no caching)."""
+    cache_dir = args.cache_dir or ('.http_cache' if args.offline else None)
+    if not cache_dir:
+        return None
+    return ResponseCache(cache_dir, ttl=args.cache_ttl,
+                         max_bytes=int(args.cache_max_mb * 1024 * 1024), offline=args.offline)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+http_client.py
+
+Gemeinsame HTTP-Hilfen für die Scraper/Downloader der Pipeline.
+
+- TokenBucket: globales Requests-pro-Sekunde-Budget, das sich alle Worker-Threads
+  teilen (statt pro Thread zu schlafen)
+- make_session: eine requests.Session mit Connection-Pool (Keep-Alive), die von
+  allen Threads eines ThreadPoolExecutors gemeinsam genutzt wird
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket limiter.
+
+    Every call to acquire() consumes one token; tokens refill at `rate` per
+    second up to `burst`. A rate <= 0 disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available."""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = (1 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+def make_session(pool_size: int = 10, headers: dict | None = None) -> requests.Session:
+    """
+    Session with a connection pool large enough for `pool_size` concurrent
+    workers, so TCP/TLS connections are reused (keep-alive) instead of being
+    opened per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
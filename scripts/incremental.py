@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+incremental.py
+
+Hilfen für inkrementelle Läufe (Scraper + Detail-Enrichment).
+
+Die /car/<id>/ IDs in 'Detail URL' sind stabil. Ein Fahrzeug gilt als
+- added:     ID neu im aktuellen Listing
+- changed:   ID bekannt, aber Slug (Text nach /car/<id>/) anders → Hash weicht ab
+- unchanged: ID und Slug-Hash identisch
+- removed:   ID nur im vorherigen Listing
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+
+import pandas as pd
+
+
+CAR_ID_RE = re.compile(r'/car/(\d+)(?:/|$)')
+SPEC_COLUMNS = ['Battery Capacity kWh', 'Charging Rate Level 2 (kW)', 'Charging Rate DC Fast (kW)']
+
+
+def car_id_from_url(detail_url) -> str | None:
+    """Stable ev-database.org car ID from a detail URL ('/car/1708/MG-MG4-...' → '1708')."""
+    if not isinstance(detail_url, str):
+        return None
+    match = CAR_ID_RE.search(detail_url)
+    return match.group(1) if match else None
+
+
+def slug_hash(detail_url) -> str | None:
+    """Short hash of the URL slug; changes when the listing renames/re-specs a car."""
+    if not isinstance(detail_url, str):
+        return None
+    match = CAR_ID_RE.search(detail_url)
+    slug = detail_url[match.end():] if match else detail_url
+    return hashlib.sha1(slug.strip('/').encode('utf-8')).hexdigest()[:12]
+
+
+def listing_keys(df: pd.DataFrame) -> dict[str, str]:
+    """{car_id: slug_hash} for a listing (first occurrence wins)."""
+    keys: dict[str, str] = {}
+    for url in df.get('Detail URL', pd.Series(dtype=object)):
+        car_id = car_id_from_url(url)
+        if car_id is not None and car_id not in keys:
+            keys[car_id] = slug_hash(url)
+    return keys
+
+
+def diff_listings(previous: pd.DataFrame, current: pd.DataFrame) -> dict[str, set[str]]:
+    """Compare two raw listings by car ID and slug hash."""
+    prev_keys = listing_keys(previous)
+    curr_keys = listing_keys(current)
+
+    added = set(curr_keys) - set(prev_keys)
+    removed = set(prev_keys) - set(curr_keys)
+    common = set(curr_keys) & set(prev_keys)
+    changed = {cid for cid in common if curr_keys[cid] != prev_keys[cid]}
+
+    return {
+        'added': added,
+        'changed': changed,
+        'unchanged': common - changed,
+        'removed': removed,
+    }
+
+
+def print_diff_summary(diff: dict[str, set[str]]) -> None:
+    print(f"Inkrementell (vs. vorheriges Listing):")
+    print(f"  Neu: {len(diff['added'])}  Geändert: {len(diff['changed'])}  "
+          f"Unverändert: {len(diff['unchanged'])}  Entfernt: {len(diff['removed'])}\n")
+
+
+def previous_specs_by_car_id(previous_raw: pd.DataFrame, previous_enriched: pd.DataFrame) -> pd.DataFrame:
+    """
+    Spec values of the previous enriched file, indexed by car ID.
+
+    The enriched CSV drops 'Detail URL', so each enriched row is joined to its
+    raw row on the listing columns both files share (Manufacturer, Model,
+    Model Year, ...; not the spec columns, which enrichment fills) plus the
+    occurrence number of that key. This also holds when the previous run only
+    covered part of the raw file (--max-vehicles) or rows were reordered;
+    enriched rows without a raw counterpart are left out.
+    """
+    key_cols = [c for c in previous_enriched.columns
+                if c in previous_raw.columns and c not in SPEC_COLUMNS and c != 'Detail URL']
+    if not key_cols or 'Detail URL' not in previous_raw.columns:
+        raise ValueError("Previous raw and enriched files share no listing columns to join on")
+
+    raw = previous_raw[key_cols].copy()
+    raw['_car_id'] = previous_raw['Detail URL'].map(car_id_from_url)
+    raw['_n'] = raw.groupby(key_cols, dropna=False).cumcount()
+
+    spec_cols = [c for c in SPEC_COLUMNS if c in previous_enriched.columns]
+    enriched = previous_enriched[key_cols + spec_cols].copy()
+    enriched['_n'] = enriched.groupby(key_cols, dropna=False).cumcount()
+
+    merged = enriched.merge(raw, on=key_cols + ['_n'], how='inner')
+    if len(previous_enriched) and merged.empty:
+        raise ValueError("Previous raw and enriched files do not belong together (no rows match)")
+
+    specs = merged.set_index('_car_id')[spec_cols]
+    specs = specs[specs.index.notna()]
+    specs.index.name = None
+    return specs[~specs.index.duplicated(keep='first')]
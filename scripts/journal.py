@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+journal.py
+
+Append-only Checkpoint-Journal (JSONL) für das Detail-Enrichment.
+
+Jede fertige Detail-Seite wird sofort als eine Zeile geschrieben:
+    {"index": 17, "url": "/car/1708/MG-MG4-Electric-64-kWh", "specs": {...}}
+
+Nach einem Abbruch (Timeout, Ctrl-C, abgestürzter Worker) liest --resume das
+Journal und überspringt alle URLs, die schon darin stehen.
+
+flush() reicht für einen Prozess-Absturz; gegen Stromausfall / OS-Absturz wird
+alle FSYNC_EVERY Einträge und beim Schließen os.fsync() aufgerufen (es gehen
+also höchstens die letzten FSYNC_EVERY - 1 Ergebnisse verloren).
+
+Das Enrichment hängt immer an (auch ohne --resume), damit die Trefferquoten pro
+Hersteller für die Priorisierung über alle Läufe erhalten bleiben; load()
+liefert pro URL den neuesten Eintrag.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+FSYNC_EVERY = 50
+
+
+class EnrichmentJournal:
+    """JSONL journal of (index, Detail URL, specs) results."""
+
+    def __init__(self, path: str, fsync_every: int = FSYNC_EVERY):
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self._fh = None
+        self._unsynced = 0
+
+    def load(self) -> dict[str, dict]:
+        """{Detail URL: specs} of all complete records (torn or malformed lines are ignored)."""
+        results: dict[str, dict] = {}
+        if not os.path.exists(self.path):
+            return results
+
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # unvollständige Zeile nach Absturz
+                if not isinstance(record, dict) or 'url' not in record or 'specs' not in record:
+                    continue  # gültiges JSON, aber kein Journal-Eintrag
+                results[record['url']] = record['specs']
+        return results
+
+    def open(self, append: bool = True) -> 'EnrichmentJournal':
+        """Open for writing; append=False starts a fresh journal."""
+        torn = False
+        if append and os.path.exists(self.path) and os.path.getsize(self.path) > 0:
+            with open(self.path, 'rb') as f:
+                f.seek(-1, os.SEEK_END)
+                torn = f.read(1) != b'\n'
+
+        self._fh = open(self.path, 'a' if append else 'w', encoding='utf-8')
+        if torn:
+            self._fh.write('\n')  # abgeschnittene Zeile abschließen, sie wird beim Laden ignoriert
+        return self
+
+    def append(self, index, url: str, specs: dict) -> None:
+        """Write one result and flush it immediately; fsync every fsync_every records."""
+        self._fh.write(json.dumps({'index': int(index), 'url': url, 'specs': specs}, ensure_ascii=False) + '\n')
+        self._fh.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every:
+            self._sync()
+
+    def _sync(self) -> None:
+        os.fsync(self._fh.fileno())
+        self._unsynced = 0
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.flush()
+            self._sync()
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> 'EnrichmentJournal':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
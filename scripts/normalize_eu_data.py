@@ -7,16 +7,26 @@ Ziel: Kompatibilität mit US-EV-Daten für einheitliche Anreicherung.
 
 Verwendung:
     python3 normalize_eu_data.py --input ev_database_raw_fixed.csv --output ev_database_normalized.csv
+
+Standardmäßig läuft der vektorisierte Pfad (Series.str / to_numeric / NumPy-Masken),
+der dieselbe Ausgabe wie die zeilenweisen Funktionen liefert (Prüfung + Benchmark:
+bench_normalize.py). --rowwise nutzt den bisherigen .apply-Pfad.
+Hersteller/Modell laufen über canonicalize.map_unique (einmal pro eindeutigem
+Wert, Memo in .canon_memo.sqlite neben der Output-CSV oder --memo PATH;
+--no-memo schaltet es ab).
 """
 
 from __future__ import annotations
 
 import argparse
 import sys
+import numpy as np
 import pandas as pd
 import re
 from typing import Optional
 
+from canonicalize import map_unique, memo_path_for, open_memo
+
 
 # ============================================================================
 # NORMALISIERUNGSFUNKTIONEN
@@ -83,15 +93,7 @@ def normalize_model(model: str, manufacturer: str = "") -> str:
     model = re.sub(r'\(MY\d{4}\)', '', model).strip()
 
     # Entferne doppelte Text (z.B. "Model ModelName")
-    parts = model.split()
-    if len(parts) > 1:
-        # Prüfe auf Duplikate (z.B. "Born 150 kW - 58 kWh CUPRA Born")
-        if model.count(parts[0]) > 1:
-            # Finde den eindeutigen Teil
-            for i in range(1, len(parts)):
-                if parts[i].lower() != parts[0].lower():
-                    model = " ".join(parts[i:])
-                    break
+    model = _drop_repeated_prefix(model)
 
     # Entferne Batterie-Info am Ende (wenn vorhanden)
     if "kWh" in model:
@@ -104,6 +106,20 @@ def normalize_model(model: str, manufacturer: str = "") -> str:
     return model if model else "Unknown"
 
 
+def _drop_repeated_prefix(model: str) -> str:
+    """Wenn das erste Wort später nochmal vorkommt: ab dem ersten abweichenden Wort behalten."""
+    parts = model.split()
+    if len(parts) > 1:
+        # Prüfe auf Duplikate (z.B. "Born 150 kW - 58 kWh CUPRA Born")
+        if model.count(parts[0]) > 1:
+            # Finde den eindeutigen Teil
+            for i in range(1, len(parts)):
+                if parts[i].lower() != parts[0].lower():
+                    model = " ".join(parts[i:])
+                    break
+    return model
+
+
 def normalize_year(year) -> int:
     """
     Normalisiere Baujahr.
@@ -171,40 +187,138 @@ def validate_charging_rate(value: Optional[float]) -> Optional[float]:
 
 
 # ============================================================================
-# MAIN
+# VEKTORISIERTE NORMALISIERUNG (ganze Spalten statt row-wise .apply)
 # ============================================================================
+#
+# Gleiche Semantik wie die Funktionen oben. Wo eine Regel nicht exakt als
+# Spalten-Operation abbildbar ist (wiederholtes erstes Wort, exotische Zahlen-
+# Strings wie "1_000"), werden nur die betroffenen Zeilen mit der
+# Skalar-Funktion berechnet.
+
+MODEL_SUFFIX_MAKES = ["Tesla", "BMW", "Audi", "Volkswagen", "Mercedes", "Hyundai", "Kia"]
+
+# Erstes Wort kommt im Rest nochmal vor (= model.count(parts[0]) > 1)
+_REPEATED_FIRST_WORD = r'(?s)^(\S+)(?!\S).*?\1'
+# Zahlen, die float()/int() und NumPy identisch lesen
+_PLAIN_INT = r'^[ \t]*[+-]?[0-9]+[ \t]*$'
+_PLAIN_FLOAT = r'^[ \t]*[+-]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][+-]?[0-9]+)?[ \t]*$'
+
+_isinstance = np.frompyfunc(isinstance, 2, 1)
+
+
+def _is_str(s: pd.Series) -> pd.Series:
+    """isinstance(value, str) per element."""
+    if pd.api.types.is_numeric_dtype(s):
+        return pd.Series(False, index=s.index)
+    return pd.Series(_isinstance(s.to_numpy(dtype=object), str).astype(bool), index=s.index)
+
+
+def normalize_manufacturer_series(mfr: pd.Series) -> pd.Series:
+    """Vectorized normalize_manufacturer."""
+    is_str = _is_str(mfr)
+    if not is_str.any():
+        return pd.Series("Unknown", index=mfr.index, dtype=object)
+
+    m = mfr.where(is_str).astype(object).str.strip()
+    mgmg = m.str.startswith("MGMG", na=False)
+    m = m.where(~mgmg, "MG" + m.str[4:])
+    lad = ~mgmg & m.str.startswith("Ład", na=False)
+    m = m.where(~lad, "Łąd" + m.str[3:])
+    m = m.str.strip()
+
+    return m.where(is_str & m.ne(""), "Unknown")
+
+
+def normalize_model_series(model: pd.Series, manufacturer: pd.Series) -> pd.Series:
+    """Vectorized normalize_model(model, manufacturer) for aligned Series."""
+    is_str = _is_str(model)
+    if not is_str.any():
+        return pd.Series("Unknown", index=model.index, dtype=object)
+
+    m = model.where(is_str).astype(object).str.strip()
+
+    # Herstellername am Ende: zuerst der eigene (gruppiert nach Länge), dann die feste Liste
+    has_mfr = is_str & _is_str(manufacturer) & manufacturer.ne("")
+    own = manufacturer.where(has_mfr).astype(object)
+    own_len = own.str.len()
+    done = pd.Series(False, index=m.index)
+    for k in own_len.dropna().unique():
+        k = int(k)
+        rows = own_len.eq(k)
+        hit = m[rows].str[-k:].eq(own[rows])
+        hit = hit[hit].index
+        m.loc[hit] = m.loc[hit].str[:-k].str.strip()
+        done.loc[hit] = True
+    for suffix in MODEL_SUFFIX_MAKES:
+        hit = has_mfr & ~done & m.str.endswith(suffix, na=False)
+        m[hit] = m[hit].str[:-len(suffix)].str.strip()
+        done |= hit
+
+    # Varianten in Klammern am Ende
+    m = m.str.replace(r'\s*\([A-Za-z0-9\-]+\)$', '', regex=True).str.strip()
+    m = m.str.replace(r'\(MY\d{2}-\d{2}\)', '', regex=True).str.strip()
+    m = m.str.replace(r'\(MY\d{4}\)', '', regex=True).str.strip()
+
+    # Wiederholtes erstes Wort: selten, daher nur diese Zeilen skalar
+    repeated = m.str.match(_REPEATED_FIRST_WORD, na=False)
+    if repeated.any():
+        m[repeated] = m[repeated].map(_drop_repeated_prefix)
+
+    # Batterie-Info und Power-Notationen
+    m = m.str.split("kWh", n=1, regex=False).str[0].str.strip()
+    m = m.str.replace(r'\b\d+\s*(kW|kWh)\b', '', regex=True).str.strip()
+
+    return m.where(is_str & m.ne(""), "Unknown")
+
+
+def normalize_year_series(year: pd.Series) -> pd.Series:
+    """Vectorized normalize_year (int() truncates floats; out of range / invalid → 2024)."""
+    if pd.api.types.is_bool_dtype(year):
+        return pd.Series(2024, index=year.index, dtype='int64')  # int(True) = 1
+    if pd.api.types.is_numeric_dtype(year):
+        values = np.trunc(year.to_numpy(dtype='float64', na_value=np.nan))
+        ok = np.isfinite(values) & (values >= 2010) & (values <= 2030)
+        return pd.Series(np.where(ok, values, 2024).astype('int64'), index=year.index)
+
+    out = np.full(len(year), 2024, dtype='int64')
+    is_str = _is_str(year)
+    plain = (is_str & year.where(is_str).astype(object).str.match(_PLAIN_INT, na=False)).to_numpy()
+    if plain.any():
+        values = pd.to_numeric(year[plain].str.strip(), errors='coerce').to_numpy(dtype='float64')
+        out[plain] = np.where((values >= 2010) & (values <= 2030), values, 2024)
+    rest = (~plain) & year.notna().to_numpy()
+    if rest.any():
+        out[rest] = [normalize_year(v) for v in year[rest]]
+    return pd.Series(out, index=year.index)
+
+
+def normalize_numeric_series(values: pd.Series) -> pd.Series:
+    """Vectorized normalize_numeric: float64, NaN where the scalar version returns None."""
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        v = values.to_numpy(dtype='float64', na_value=np.nan)
+    else:
+        v = np.full(len(values), np.nan)
+        is_str = _is_str(values)
+        plain = (is_str & values.where(is_str).astype(object).str.match(_PLAIN_FLOAT, na=False)).to_numpy()
+        if plain.any():
+            v[plain] = values[plain].to_numpy(dtype=object).astype('float64')  # = float(x)
+        rest = (~plain) & values.notna().to_numpy()
+        if rest.any():
+            v[rest] = [np.nan if r is None else r for r in map(normalize_numeric, values[rest])]
+    return pd.Series(np.where(v >= 0, v, np.nan), index=values.index)
 
-def normalize_csv(input_file: str, output_file: str) -> int:
-    """
-    Hauptfunktion für Normalisierung.
-
-    Args:
-        input_file: Input CSV Pfad
-        output_file: Output CSV Pfad
-
-    Returns:
-        Exit code
-    """
-    print(f"{'='*60}")
-    print(f"EU EV Data - Normalisierung")
-    print(f"{'='*60}\n")
-
-    # Lade Daten
-    try:
-        print(f"Lade: {input_file}")
-        df = pd.read_csv(input_file, low_memory=False)
-        print(f"✅ {len(df)} Zeilen geladen\n")
-    except Exception as e:
-        print(f"ERROR: Fehler beim Laden der CSV: {e}", file=sys.stderr)
-        return 1
 
-    # Zeige Original-Spalten
-    print(f"Original-Spalten: {list(df.columns)}\n")
+def in_range(values: pd.Series, low: float, high: float) -> pd.Series:
+    """Values within [low, high], NaN otherwise (validate_* / Level-2 rule)."""
+    return values.where((values >= low) & (values <= high))
 
-    # ── Normalisierungsschritte ──
 
-    print("Normalisiere Daten...\n")
+# ============================================================================
+# MAIN
+# ============================================================================
 
+def normalize_frame_rowwise(df: pd.DataFrame) -> pd.DataFrame:
+    """Schritte 1–5 zeilenweise (bisheriger Pfad, Referenz für den vektorisierten)."""
     # 1. Manufacturer
     print("  1. Normalisiere Hersteller...")
     df['Manufacturer'] = df['Manufacturer'].apply(normalize_manufacturer)
@@ -232,6 +346,84 @@ def normalize_csv(input_file: str, output_file: str) -> int:
 
     df['Charging Rate DC Fast (kW)'] = df['Charging Rate DC Fast (kW)'].apply(normalize_numeric)
     df['Charging Rate DC Fast (kW)'] = df['Charging Rate DC Fast (kW)'].apply(validate_charging_rate)
+    return df
+
+
+def normalize_frame(df: pd.DataFrame, memo_path: str | None = None) -> pd.DataFrame:
+    """
+    Schritte 1–5 vektorisiert, gleiche Ergebnisse wie normalize_frame_rowwise.
+    Hersteller/Modell werden nur einmal pro eindeutigem Wert berechnet
+    (mit memo_path zusätzlich über Läufe hinweg gemerkt).
+    """
+    module = sys.modules[__name__]  # Fingerprint: Quelltext dieses Moduls
+
+    print("  1. Normalisiere Hersteller...")
+    memo = open_memo('normalize_manufacturer', module, path=memo_path)
+    df['Manufacturer'] = map_unique(normalize_manufacturer_series, df['Manufacturer'], memo=memo, batch=True)
+    if memo is not None:
+        print(f"     {memo.summary()}")
+        memo.close()
+
+    print("  2. Normalisiere Modell...")
+    memo = open_memo('normalize_model', module, path=memo_path)
+    df['Model'] = map_unique(normalize_model_series, df['Model'], df['Manufacturer'], memo=memo, batch=True)
+    if memo is not None:
+        print(f"     {memo.summary()}")
+        memo.close()
+
+    print("  3. Normalisiere Baujahr...")
+    df['Model Year'] = normalize_year_series(df['Model Year'])
+
+    print("  4. Normalisiere Batterie...")
+    df['Battery Capacity kWh'] = in_range(normalize_numeric_series(df['Battery Capacity kWh']), 10, 150)
+
+    print("  5. Normalisiere Ladegeschwindigkeiten...")
+    df['Charging Rate Level 2 (kW)'] = in_range(normalize_numeric_series(df['Charging Rate Level 2 (kW)']), 3, 22)
+    df['Charging Rate DC Fast (kW)'] = in_range(normalize_numeric_series(df['Charging Rate DC Fast (kW)']), 3, 350)
+    return df
+
+
+def normalize_csv(input_file: str, output_file: str, vectorized: bool = True,
+                  memo_path: str | None = '') -> int:
+    """
+    Hauptfunktion für Normalisierung.
+
+    Args:
+        input_file: Input CSV Pfad
+        output_file: Output CSV Pfad
+        vectorized: Spalten-Operationen statt row-wise .apply (gleiche Ausgabe)
+        memo_path: SQLite-Memo für Hersteller/Modell ('' = .canon_memo.sqlite
+            neben output_file, None = ohne Memo)
+
+    Returns:
+        Exit code
+    """
+    print(f"{'='*60}")
+    print(f"EU EV Data - Normalisierung")
+    print(f"{'='*60}\n")
+
+    # Lade Daten
+    try:
+        print(f"Lade: {input_file}")
+        df = pd.read_csv(input_file, low_memory=False)
+        print(f"✅ {len(df)} Zeilen geladen\n")
+    except Exception as e:
+        print(f"ERROR: Fehler beim Laden der CSV: {e}", file=sys.stderr)
+        return 1
+
+    # Zeige Original-Spalten
+    print(f"Original-Spalten: {list(df.columns)}\n")
+
+    # ── Normalisierungsschritte ──
+
+    print("Normalisiere Daten...\n")
+
+    if memo_path == '':
+        memo_path = memo_path_for(output_file)
+    if vectorized:
+        df = normalize_frame(df, memo_path)
+    else:
+        df = normalize_frame_rowwise(df)
 
     # ── Duplikate entfernen ──
     print("  6. Entferne Duplikate...")
@@ -312,10 +504,26 @@ def parse_args() -> argparse.Namespace:
         default="/sessions/confident-cool-euler/mnt/Lemonflow/ev_database_normalized.csv",
         help="Output CSV"
     )
+    p.add_argument(
+        "--rowwise",
+        action="store_true",
+        help="Bisherigen zeilenweisen .apply-Pfad statt des vektorisierten verwenden"
+    )
+    p.add_argument(
+        "--memo",
+        default='',
+        help="Memo für normalisierte Hersteller/Modelle über Läufe hinweg (default: .canon_memo.sqlite neben --output)"
+    )
+    p.add_argument(
+        "--no-memo",
+        action="store_true",
+        help="Kein Memo verwenden"
+    )
     return p.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    exit_code = normalize_csv(args.input, args.output)
+    exit_code = normalize_csv(args.input, args.output, vectorized=not args.rowwise,
+                              memo_path=None if args.no_memo else args.memo)
     raise SystemExit(exit_code)
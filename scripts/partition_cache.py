@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+partition_cache.py
+
+Lokaler Cache für den EEA co2cars-Download, partitioniert nach (Year, Status).
+
+- Eine Datei pro Partition (Parquet, falls pyarrow installiert ist, sonst CSV.gz;
+  dort stehen fehlende Werte als \\N, damit leere Strings beim Lesen leer bleiben)
+- manifest.json: pro Partition Datei, Zeilenzahl, Abrufzeit und SHA-1 der SQL-Abfrage
+- Final-Partitionen ('F') ändern sich nicht mehr und werden nur von Disk gelesen;
+  Provisional ('P') und fehlende Partitionen werden neu geladen
+- Ändert sich die Abfrage (Spalten, Filter, Modus), ändert sich der Hash und die
+  Partition gilt als fehlend
+
+Verwendung (im Downloader):
+    --partition-dir .co2cars_partitions [--refresh]
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401 – nur für Parquet benötigt
+    PARTITION_FORMAT = 'parquet'
+except ImportError:  # pyarrow ist optional
+    PARTITION_FORMAT = 'csv.gz'
+
+FINAL_STATUS = 'F'
+CSV_NA = r'\N'  # fehlender Wert in CSV.gz-Partitionen ('' bleibt ein leerer String)
+
+
+def query_hash(query: str) -> str:
+    return hashlib.sha1(query.encode('utf-8')).hexdigest()[:12]
+
+
+class PartitionCache:
+    """(Year, Status) partitions of a query result on disk, described by manifest.json."""
+
+    def __init__(self, root: str):
+        self.root = root
+        self.manifest_path = os.path.join(root, 'manifest.json')
+        os.makedirs(root, exist_ok=True)
+        self.manifest: dict[str, dict] = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+    @staticmethod
+    def key(year: int, status: str, query: str) -> str:
+        return f"{year}/{status}/{query_hash(query)}"
+
+    def is_cached_final(self, year: int, status: str, query: str) -> bool:
+        """True if a non-empty Final partition for exactly this query is on disk."""
+        entry = self.manifest.get(self.key(year, status, query))
+        return (entry is not None and status == FINAL_STATUS and entry['rows'] > 0
+                and os.path.exists(os.path.join(self.root, entry['file'])))
+
+    def load(self, year: int, status: str, query: str) -> pd.DataFrame:
+        entry = self.manifest[self.key(year, status, query)]
+        path = os.path.join(self.root, entry['file'])
+        if entry['file'].endswith('.parquet'):
+            return pd.read_parquet(path)
+        if 'na_rep' in entry:
+            return pd.read_csv(path, dtype=entry.get('dtypes'), keep_default_na=False, na_values=[entry['na_rep']])
+        return pd.read_csv(path, dtype=entry.get('dtypes'))  # ältere Partitionen ohne NA-Marker
+
+    def save(self, year: int, status: str, query: str, df: pd.DataFrame) -> None:
+        """Write one partition and update the manifest (atomically, via rename)."""
+        file = f"{year}_{status}_{query_hash(query)}.{PARTITION_FORMAT}"
+        path = os.path.join(self.root, file)
+        tmp = f"{path}.tmp"
+        if PARTITION_FORMAT == 'parquet':
+            df.to_parquet(tmp, index=False)
+        else:
+            df.to_csv(tmp, index=False, compression='gzip', na_rep=CSV_NA)
+        os.replace(tmp, path)
+
+        self.manifest[self.key(year, status, query)] = {
+            'year': int(year),
+            'status': status,
+            'file': file,
+            'rows': int(len(df)),
+            'dtypes': {c: 'str' if str(t) == 'category' else str(t) for c, t in df.dtypes.items()},
+            'query_sha1': query_hash(query),
+            **({'na_rep': CSV_NA} if PARTITION_FORMAT == 'csv.gz' else {}),
+            'fetched_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        tmp = f"{self.manifest_path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
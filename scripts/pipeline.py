@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+pipeline.py
+
+Zweistufige Fetch/Parse-Pipeline für das Detail-Enrichment.
+
+    I/O-Threads (fetch)  →  begrenzte Queue  →  ProcessPool (parse)  →  1 Writer-Thread
+
+- Fetch-Threads laden HTML und blockieren, sobald die HTML-Queue voll ist
+  (Backpressure: es liegen nie mehr als queue_size Seiten im Speicher)
+- Parsing läuft in Prozessen, also nicht mehr am GIL der Netzwerk-Threads
+- Höchstens 2 × parse_workers Seiten gleichzeitig im Prozess-Pool
+- Genau ein Writer wendet Ergebnisse an (kein Locking im Callback nötig)
+- Optionales Parse-Memo: memo_get(html) vor dem Pool, memo_put(html, specs) im
+  Writer – nur für erfolgreich geparste Seiten
+- Pro Stufe werden Durchsatz und Zeit pro Seite gemessen, um die Pools zu dimensionieren
+- Worker starten per forkserver/spawn (kein fork aus einem Prozess mit laufenden
+  Threads); stirbt der Pool (BrokenProcessPool), wird im Hauptprozess weitergeparst
+- Die Schleife endet auch, wenn alle Fetch-Threads beendet sind; Jobs eines
+  abgestürzten Threads werden als fehlgeschlagen ({}) gemeldet
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import queue
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable
+
+
+def _timed_call(fn: Callable, *args) -> tuple[Any, float]:
+    """Run fn in the worker process and return (result, CPU seconds spent)."""
+    t0 = time.process_time()
+    result = fn(*args)
+    return result, time.process_time() - t0
+
+
+def _mp_context():
+    """forkserver where available, else spawn – never fork a threaded process."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+class StageStats:
+    """Item count, summed per-item time and wall-clock span of one stage."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.items = 0
+        self.busy = 0.0
+        self.first = None
+        self.last = None
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            self.items += 1
+            self.busy += seconds
+            self.first = self.first if self.first is not None else now - seconds
+            self.last = now
+
+    def line(self, workers: int) -> str:
+        span = (self.last - self.first) if self.items else 0.0
+        rate = self.items / span if span > 0 else 0.0
+        per_item = self.busy / self.items if self.items else 0.0
+        capacity = workers / per_item if per_item > 0 else 0.0
+        return (f"  {self.name:<6} {self.items:5d} pages  {rate:7.2f} pages/s  "
+                f"{per_item * 1000:8.1f} ms/page  ({workers} workers → max. {capacity:.1f} pages/s)")
+
+
+class FetchParsePipeline:
+    """
+    fetch(url) -> html | None runs on `fetch_workers` threads,
+    parse(html, *parse_args) -> dict runs on `parse_workers` processes
+    (must be a picklable module-level function; an exception = failed page).
+    memo_get(html) -> specs | None skips the pool on a hit; memo_put(html, specs)
+    stores fresh results from the writer thread.
+    """
+
+    def __init__(self, fetch: Callable[[str], str | None], parse: Callable, parse_args: tuple = (),
+                 fetch_workers: int = 5, parse_workers: int = 2, queue_size: int = None,
+                 memo_get: Callable[[str], dict | None] = None, memo_put: Callable[[str, dict], None] = None):
+        self.fetch = fetch
+        self.parse = parse
+        self.parse_args = parse_args
+        self.memo_get = memo_get
+        self.memo_put = memo_put
+        self.fetch_workers = max(1, fetch_workers)
+        self.parse_workers = max(1, parse_workers)
+        self.queue_size = queue_size or 2 * self.parse_workers
+        self.stats = {name: StageStats(name) for name in ('fetch', 'parse', 'write')}
+        self.max_queue_depth = 0
+
+    def run(self, jobs: Iterable[tuple[Any, str]], on_result: Callable[[Any, str, dict], None]) -> None:
+        """
+        Process (key, url) jobs; on_result(key, url, specs) is called from the
+        single writer thread. A failed fetch yields specs = {}; every job
+        gets exactly one on_result call.
+        """
+        jobs = list(jobs)
+        jobs_q: queue.Queue = queue.Queue()
+        for job in jobs:
+            jobs_q.put(job)
+        html_q: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        results_q: queue.Queue = queue.Queue()
+        in_flight = threading.BoundedSemaphore(2 * self.parse_workers)
+        stop = threading.Event()
+        pool_broken = threading.Event()
+
+        def fetcher():
+            while not stop.is_set():
+                try:
+                    key, url = jobs_q.get_nowait()
+                except queue.Empty:
+                    return
+                t0 = time.perf_counter()
+                try:
+                    html = self.fetch(url)
+                except Exception:
+                    html = None
+                self.stats['fetch'].add(time.perf_counter() - t0)
+
+                while not stop.is_set():
+                    try:
+                        html_q.put((key, url, html), timeout=0.2)
+                        break
+                    except queue.Full:
+                        continue
+
+        def writer():
+            # Einträge: (key, url, specs, html) – html nur bei frisch geparsten Seiten (fürs Memo)
+            while True:
+                item = results_q.get()
+                if item is None:
+                    return
+                key, url, specs, html = item
+                t0 = time.perf_counter()
+                on_result(key, url, specs)
+                if html is not None and self.memo_put is not None:
+                    self.memo_put(html, specs)
+                self.stats['write'].add(time.perf_counter() - t0)
+
+        def parse_local(key, url, html):
+            """Fallback after the pool broke: parse in this process."""
+            try:
+                specs, cpu = _timed_call(self.parse, html, *self.parse_args)
+                self.stats['parse'].add(cpu)
+            except Exception as e:
+                print(f"  ⚠ Parse failed for {url}: {e}")
+                return (key, url, {}, None)
+            return (key, url, specs, html)
+
+        def on_broken(e):
+            if not pool_broken.is_set():
+                pool_broken.set()
+                print(f"  ⚠ Parser-Prozesse abgestürzt ({e}), parse im Hauptprozess weiter")
+
+        def parsed(future, key, url, html):
+            in_flight.release()
+            try:
+                specs, cpu = future.result()
+                self.stats['parse'].add(cpu)
+            except BrokenProcessPool as e:
+                on_broken(e)
+                results_q.put(parse_local(key, url, html))
+                return
+            except Exception as e:
+                print(f"  ⚠ Parse failed for {url}: {e}")
+                results_q.put((key, url, {}, None))
+                return
+            results_q.put((key, url, specs, html))
+
+        fetch_threads = [threading.Thread(target=fetcher, daemon=True) for _ in range(self.fetch_workers)]
+        writer_thread = threading.Thread(target=writer, daemon=True)
+        for t in fetch_threads:
+            t.start()
+        writer_thread.start()
+
+        pending = Counter((key, url) for key, url in jobs)
+        try:
+            with ProcessPoolExecutor(max_workers=self.parse_workers, mp_context=_mp_context()) as pool:
+                while pending:
+                    try:
+                        key, url, html = html_q.get(timeout=0.5)
+                    except queue.Empty:
+                        # erst Threads, dann Queue prüfen: ein Put vor dem Thread-Ende ist sonst verloren
+                        if not any(t.is_alive() for t in fetch_threads) and html_q.empty():
+                            break
+                        continue
+                    pending[(key, url)] -= 1
+                    if not pending[(key, url)]:
+                        del pending[(key, url)]
+                    self.max_queue_depth = max(self.max_queue_depth, html_q.qsize() + 1)
+
+                    if not html:
+                        results_q.put((key, url, {}, None))
+                        continue
+
+                    memoized = self.memo_get(html) if self.memo_get is not None else None
+                    if memoized is not None:
+                        results_q.put((key, url, memoized, None))
+                        continue
+
+                    if not pool_broken.is_set():
+                        in_flight.acquire()
+                        try:
+                            future = pool.submit(_timed_call, self.parse, html, *self.parse_args)
+                        except BrokenProcessPool as e:
+                            in_flight.release()
+                            on_broken(e)
+                        else:
+                            future.add_done_callback(
+                                lambda f, key=key, url=url, html=html: parsed(f, key, url, html))
+                            continue
+                    results_q.put(parse_local(key, url, html))
+
+            if pending:
+                print(f"  ⚠ Fetch-Threads beendet, {pending.total()} Seiten nicht geladen")
+                for key, url in pending.elements():
+                    results_q.put((key, url, {}, None))
+        except BaseException:
+            stop.set()
+            raise
+        finally:
+            results_q.put(None)
+            writer_thread.join()
+            for t in fetch_threads:
+                t.join(timeout=1)
+
+    def report(self) -> str:
+        workers = {'fetch': self.fetch_workers, 'parse': self.parse_workers, 'write': 1}
+        lines = ["Pipeline-Durchsatz pro Stufe:"]
+        lines += [stats.line(workers[name]) for name, stats in self.stats.items()]
+        lines.append(f"  HTML-Queue: max. {self.max_queue_depth}/{self.queue_size} Seiten gepuffert")
+        return "\n".join(lines)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+rule_tables.py
+
+Gemeinsamer Loader für die Regel-/Lookup-Tabellen unter rules/ (JSON, versioniert).
+
+- rules/build_lookup_specs.json: SPECS für build_lookup.py
+- rules/enrich_eu_rules.json:    EU_AUTOCHARGE_LOOKUP + EU_EMERGENCY_RELEASE_* für enrich_eu_ev_data.py
+- rules/eu_sources.json:         EU_*_SOURCES für add_eu_sources.py
+
+Jede Datei hat ein Feld "version" (Schema-Version, aktuell 1). Tabellen sind Listen
+von Zeilen in Prioritätsreihenfolge; reine Strings sind Kommentare/Abschnitte
+und werden beim Laden übersprungen.
+
+Beim ersten Laden wird die Datei in die Strukturen übersetzt, die die Skripte
+erwarten (Dicts/Tupel), und als Pickle unter rules/.compiled/ abgelegt.
+Schlüssel: SHA-256 der JSON-Datei + Fingerprint der Compile-Funktion; danach
+lädt load_rules() nur noch den Pickle (Millisekunden). Regeln lassen sich so
+ohne Codeänderung bearbeiten.
+
+Verwendung:
+    from rule_tables import load_rules
+    SPECS = load_rules('build_lookup_specs')['specs']
+
+    python3 rule_tables.py            # alle Tabellen prüfen + kompilieren, Ladezeiten
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import pickle
+import time
+from typing import Any, Callable
+
+from canonicalize import fingerprint
+
+RULES_DIR = os.environ.get('EV_RULES_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules'))
+SUPPORTED_VERSION = 1
+
+
+def rows(table: list) -> list:
+    """Table rows without comment strings."""
+    return [row for row in table if not isinstance(row, str)]
+
+
+# ============================================================================
+# COMPILE-FUNKTIONEN (JSON → Strukturen der Skripte)
+# ============================================================================
+
+def compile_specs(data: dict) -> dict:
+    """SPECS als Liste von (Manufacturer, model_substring, bat, ac, dc) + Index pro Hersteller."""
+    specs = [tuple(row[:5]) for row in rows(data['specs'])]
+    by_manufacturer: dict[str, list] = {}
+    for mfr, model, bat, ac, dc in specs:
+        by_manufacturer.setdefault(mfr, []).append((model, bat, ac, dc))
+    return {'specs': specs, 'by_manufacturer': by_manufacturer}
+
+
+def compile_enrich_rules(data: dict) -> dict:
+    autocharge = {}
+    for row in rows(data['autocharge']):
+        info = dict(row)
+        autocharge[info.pop('manufacturer')] = info
+    return {
+        'autocharge': autocharge,
+        'emergency_release_by_model': {(mfr, model): desc for mfr, model, desc in rows(data['emergency_release_by_model'])},
+        'emergency_release_by_platform': dict(rows(data['emergency_release_by_platform'])),
+        'emergency_release_by_make': dict(rows(data['emergency_release_by_make'])),
+    }
+
+
+def compile_sources(data: dict) -> dict:
+    compiled = {key: dict(rows(data[key]))
+                for key in ('plug_type', 'autocharge', 'emergency_release', 'emergency_release_platform')}
+    compiled['emergency_release_fallback'] = data['emergency_release_fallback']
+    return compiled
+
+
+RULE_SETS: dict[str, Callable[[dict], Any]] = {
+    'build_lookup_specs': compile_specs,
+    'enrich_eu_rules': compile_enrich_rules,
+    'eu_sources': compile_sources,
+}
+
+
+# ============================================================================
+# LADEN + CACHE
+# ============================================================================
+
+_compiler_fingerprints: dict[str, str] = {}
+
+
+def rules_path(name: str, rules_dir: str | None = None) -> str:
+    return os.path.join(rules_dir or RULES_DIR, f"{name}.json")
+
+
+def parse_rules(raw: bytes, path: str = '<rules>') -> dict:
+    data = json.loads(raw)
+    version = data.get('version')
+    if version != SUPPORTED_VERSION:
+        raise ValueError(f"{path}: unsupported rules version {version!r} (expected {SUPPORTED_VERSION})")
+    return data
+
+
+def load_rules(name: str, rules_dir: str | None = None, cache: bool = True) -> Any:
+    """Compiled rule set `name` (see RULE_SETS); recompiled only when the JSON file or its compiler changes."""
+    compile_fn = RULE_SETS[name]
+    path = rules_path(name, rules_dir)
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if name not in _compiler_fingerprints:
+        _compiler_fingerprints[name] = fingerprint(compile_fn, SUPPORTED_VERSION)[:8]
+    key = f"{hashlib.sha256(raw).hexdigest()[:16]}-{_compiler_fingerprints[name]}"
+    cache_dir = os.path.join(os.path.dirname(path), '.compiled')
+    cache_file = os.path.join(cache_dir, f"{name}.{key}.pickle")
+
+    if cache and os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            pass  # beschädigt → neu kompilieren
+
+    compiled = compile_fn(parse_rules(raw, path))
+    if cache:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp = f"{cache_file}.tmp"
+            with open(tmp, 'wb') as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, cache_file)
+            for old in glob.glob(os.path.join(cache_dir, f"{name}.*.pickle")):
+                if old != cache_file:
+                    os.remove(old)
+        except OSError:
+            pass  # z. B. schreibgeschütztes Verzeichnis: ohne Cache weiter
+    return compiled
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Validate and compile the rule tables under rules/")
+    ap.add_argument("--rules-dir", default=None, help=f"Directory with the JSON files (default {RULES_DIR})")
+    args = ap.parse_args()
+
+    for name in RULE_SETS:
+        t0 = time.perf_counter()
+        load_rules(name, args.rules_dir, cache=False)
+        t_parse = time.perf_counter() - t0
+        load_rules(name, args.rules_dir)  # Cache schreiben
+        t0 = time.perf_counter()
+        compiled = load_rules(name, args.rules_dir)
+        t_cached = time.perf_counter() - t0
+        sizes = ', '.join(f"{k}: {len(v)}" for k, v in compiled.items() if hasattr(v, '__len__') and not isinstance(v, str))
+        print(f"  {name:<20} JSON+compile {t_parse * 1000:6.1f} ms, cached {t_cached * 1000:5.1f} ms  ({sizes})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+scheduler.py
+
+Priorisierung und Budget für das Detail-Enrichment.
+
+Erwarteter Ertrag pro Zeile = (# fehlende Spec-Felder) × Trefferquote des Herstellers.
+Die Trefferquote stammt aus früheren Läufen (Journal: Anteil geladener Detail-Seiten
+dieses Herstellers, die mindestens einen Wert lieferten), geglättet mit (hits+1)/(n+2);
+ohne Historie gilt 0.5. Zeilen mit allen drei fehlenden Werten bei gut abgedeckten
+Herstellern kommen also zuerst.
+
+Budget: maximale Anzahl Requests und/oder Sekunden – danach werden keine weiteren
+Seiten mehr geladen.
+
+Coalescing: Zeilen mit derselben /car/<id>/ (auch bei abweichendem Slug) teilen
+sich einen Request; das Ergebnis wird auf alle Zeilen verteilt.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+import pandas as pd
+
+from incremental import SPEC_COLUMNS, car_id_from_url
+
+
+DEFAULT_FILL_RATE = 0.5
+
+
+def manufacturer_fill_rates(df: pd.DataFrame, history: dict[str, dict]) -> dict[str, float]:
+    """Smoothed share of journaled detail pages per manufacturer that yielded any spec."""
+    if not history:
+        return {}
+
+    urls = df[['Manufacturer', 'Detail URL']].dropna().drop_duplicates('Detail URL')
+    urls = urls[urls['Detail URL'].isin(history.keys())]
+    if urls.empty:
+        return {}
+
+    hit = urls['Detail URL'].map(
+        lambda url: any(v is not None for v in history[url].values())
+    ).astype(int)
+    grouped = hit.groupby(urls['Manufacturer'])
+    return ((grouped.sum() + 1) / (grouped.count() + 2)).to_dict()
+
+
+def expected_yield(df: pd.DataFrame, indices: list, fill_rates: dict[str, float]) -> pd.Series:
+    """Expected number of filled fields per row if its detail page is fetched."""
+    rows = df.loc[indices]
+    missing = rows[[c for c in SPEC_COLUMNS if c in rows.columns]].isna().sum(axis=1)
+    rate = rows['Manufacturer'].map(fill_rates).fillna(DEFAULT_FILL_RATE)
+    return missing * rate
+
+
+def prioritize(df: pd.DataFrame, indices: list, fill_rates: dict[str, float]) -> list:
+    """Indices ordered by expected yield (ties keep CSV order)."""
+    if not indices:
+        return []
+    scores = expected_yield(df, indices, fill_rates)
+    return scores.sort_values(ascending=False, kind='mergesort').index.tolist()
+
+
+def group_by_car_id(df: pd.DataFrame, indices: list) -> dict[str, list]:
+    """
+    {request key: [row indices]} in the order of `indices`. The key is the car ID,
+    or the URL itself for URLs without /car/<id>/.
+    """
+    groups: dict[str, list] = {}
+    for idx in indices:
+        url = df.at[idx, 'Detail URL']
+        groups.setdefault(car_id_from_url(url) or url, []).append(idx)
+    return groups
+
+
+class BudgetExhausted(Exception):
+    """Raised by fetchers when Budget.take() refuses a network request."""
+
+
+class Budget:
+    """
+    Thread-safe request / wall-clock budget; take() is False once exhausted.
+    None = no limit; 0 = nothing allowed.
+    """
+
+    def __init__(self, max_requests: int = None, max_seconds: float = None):
+        self.max_requests = max_requests
+        self.deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        self.used = 0
+        self.refused = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            if (self.max_requests is not None and self.used >= self.max_requests) or \
+                    (self.deadline is not None and time.monotonic() >= self.deadline):
+                self.refused += 1
+                return False
+            self.used += 1
+            return True
+
+    def summary(self) -> str:
+        return f"Budget: {self.used} Requests genutzt, {self.refused} übersprungen (Budget erschöpft)"
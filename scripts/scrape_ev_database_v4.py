@@ -12,6 +12,9 @@ Version 4 Improvements:
 
 Verwendung:
     python3 scrape_ev_database_v4.py --output ev_database_raw_v4.csv
+    python3 scrape_ev_database_v4.py --output ev_database_raw_v4.csv --concurrent --rps 2 --workers 4
+    python3 scrape_ev_database_v4.py --output ev_database_raw_v4.csv --cache-dir .http_cache
+    python3 scrape_ev_database_v4.py --output ev_database_raw_v4_new.csv --previous ev_database_raw_v4.csv
 """
 
 import requests
@@ -20,6 +23,14 @@ import pandas as pd
 import time
 import sys
 import re
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Callable
+
+from fast_parse import listing_soup
+from http_cache import CacheMiss, ResponseCache, add_cache_args, cache_from_args
+from http_client import TokenBucket, make_session
+from incremental import diff_listings, print_diff_summary
 
 # ============================================================================
 # CONFIGURATION
@@ -32,6 +43,10 @@ HEADERS = {
 REQUEST_DELAY = 1.5
 TIMEOUT = 30
 MAX_VEHICLES_PER_PAGE = 50
+CONCURRENT_RPS = 2.0      # Globales Budget im --concurrent Modus
+CONCURRENT_WORKERS = 4
+FETCH_ATTEMPTS = 3        # --concurrent: Versuche pro Seite, bevor der Crawl abbricht
+RETRY_BACKOFF = 2.0       # Sekunden, verdoppelt pro Versuch
 
 # ============================================================================
 # SPEC EXTRACTION FROM URL
@@ -85,34 +100,73 @@ def extract_specs_from_url(detail_url: str) -> dict:
     return specs
 
 
-def fetch_page(page_num: int) -> str | None:
-    """Fetch a single page from ev-database.org."""
+def page_url(page_num: int) -> str:
+    """Listing URL for a page number (?p=start-end)."""
+    start = page_num * MAX_VEHICLES_PER_PAGE
+    end = (page_num + 1) * MAX_VEHICLES_PER_PAGE
+    return f"{BASE_URL}?p={start}-{end}"
+
+
+def fetch_page(page_num: int, session: requests.Session | None = None, quiet: bool = False,
+               cache: ResponseCache | None = None, before_request: Callable[[], None] | None = None) -> str | None:
+    """
+    Fetch a single page from ev-database.org (through the response cache if given).
+
+    before_request() runs right before a real network request (rate limiter),
+    not for cache hits. Raises CacheMiss for an uncached page in offline mode.
+    """
     try:
-        start = page_num * MAX_VEHICLES_PER_PAGE
-        end = (page_num + 1) * MAX_VEHICLES_PER_PAGE
-        url = f"{BASE_URL}?p={start}-{end}"
+        url = page_url(page_num)
 
-        print(f"  [{page_num:2d}] Fetching: {url}", end=" ... ", flush=True)
+        if not quiet:
+            print(f"  [{page_num:2d}] Fetching: {url}", end=" ... ", flush=True)
 
-        response = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-        response.raise_for_status()
+        if cache is not None:
+            text = cache.get_text(url, session=session, headers=HEADERS, timeout=TIMEOUT,
+                                  before_request=before_request)
+        else:
+            if before_request is not None:
+                before_request()
+            response = (session or requests).get(url, headers=HEADERS, timeout=TIMEOUT)
+            response.raise_for_status()
+            text = response.text
 
-        print(f"✓", flush=True)
-        return response.text
+        if not quiet:
+            print(f"✓", flush=True)
+        return text
 
     except requests.exceptions.RequestException as e:
-        print(f"✗ ERROR: {e}", flush=True)
+        print(f"  [{page_num:2d}] ✗ ERROR: {e}" if quiet else f"✗ ERROR: {e}", flush=True)
         return None
 
 
-def extract_vehicles_from_page(html: str, page_num: int) -> list[dict]:
+def parse_listing(html: str, fast: bool = True) -> BeautifulSoup:
+    """
+    Parse a listing page. The fast path only builds the <a> elements
+    (fast_parse.listing_soup); the full html.parser tree is the fallback.
+    """
+    if fast:
+        try:
+            return listing_soup(html)
+        except Exception as e:
+            print(f"    Fast parser failed ({e}), falling back to html.parser")
+    return BeautifulSoup(html, 'html.parser')
+
+
+def count_vehicles_on_page(html: str, fast: bool = True) -> int:
+    """Number of vehicle title links on a listing page (0 = end of data)."""
+    soup = parse_listing(html, fast)
+    return len(soup.find_all('a', class_='title'))
+
+
+def extract_vehicles_from_page(html: str, page_num: int, fast: bool = True) -> list[dict]:
     """
     Extract vehicle data from HTML with enhanced spec extraction from URLs.
     """
     vehicles = []
 
     try:
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = parse_listing(html, fast)
         title_links = soup.find_all('a', class_='title')
 
         print(f"    Found {len(title_links)} vehicles on page {page_num}")
@@ -166,12 +220,168 @@ def extract_vehicles_from_page(html: str, page_num: int) -> list[dict]:
         return []
 
 
+# ============================================================================
+# CONCURRENT CRAWL
+# ============================================================================
+
+class PageFetchError(RuntimeError):
+    """A listing page could not be fetched after FETCH_ATTEMPTS tries."""
+
+    def __init__(self, page_num: int, attempts: int):
+        super().__init__(f"Failed to fetch page {page_num} after {attempts} attempts")
+        self.page_num = page_num
+
+
+class PageCrawler:
+    """
+    Fetches listing pages under one shared requests/sec budget and remembers
+    every page it has seen, so probing for the page count costs no extra fetches.
+
+    A failed fetch is retried (attempts, backoff) and then raises PageFetchError,
+    so "fetch failed" is never mistaken for "page has 0 vehicles".
+    """
+
+    def __init__(self, rps: float, session: requests.Session | None = None,
+                 cache: ResponseCache | None = None, fast_parser: bool = True,
+                 attempts: int = FETCH_ATTEMPTS, backoff: float = RETRY_BACKOFF):
+        self.limiter = TokenBucket(rps)
+        self.session = session or make_session()
+        self.cache = cache
+        self.fast_parser = fast_parser
+        self.attempts = max(1, attempts)
+        self.backoff = backoff
+        self.pages: dict[int, str] = {}
+        self.fetch_seconds = 0.0
+        self._requests = 0
+        self._lock = Lock()
+
+    @property
+    def requests_made(self) -> int:
+        return self._requests
+
+    def _before_request(self) -> None:
+        # Nur echte Requests zählen (inkl. Retries), keine Cache-Treffer
+        self.limiter.acquire()
+        with self._lock:
+            self._requests += 1
+
+    def fetch(self, page_num: int) -> str:
+        if page_num in self.pages:
+            return self.pages[page_num]
+        for attempt in range(self.attempts):
+            if attempt:
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+                print(f"  [{page_num:2d}] retry {attempt}/{self.attempts - 1}", flush=True)
+            t0 = time.perf_counter()
+            try:
+                html = fetch_page(page_num, self.session, quiet=True, cache=self.cache,
+                                  before_request=self._before_request)
+            except CacheMiss as e:
+                print(f"  [{page_num:2d}] ✗ {e}", flush=True)
+                raise PageFetchError(page_num, attempt + 1) from None  # offline: erneut versuchen bringt nichts
+            elapsed = time.perf_counter() - t0
+
+            with self._lock:
+                self.fetch_seconds += elapsed
+                if html is not None:
+                    self.pages[page_num] = html
+            if html is not None:
+                print(f"  [{page_num:2d}] ✓ {page_url(page_num)} ({elapsed:.2f}s)", flush=True)
+                return html
+        raise PageFetchError(page_num, self.attempts)
+
+    def has_vehicles(self, page_num: int) -> bool:
+        return count_vehicles_on_page(self.fetch(page_num), self.fast_parser) > 0
+
+
+def find_page_count(crawler: PageCrawler, max_pages: int = None) -> int:
+    """
+    Find the number of non-empty listing pages with an exponential probe
+    followed by a binary search (O(log n) requests instead of n).
+
+    max_pages None or 0 = unlimited (as in the sequential loop); raises
+    PageFetchError if a probed page cannot be fetched.
+    """
+    max_pages = max_pages or None
+    if (max_pages is not None and max_pages < 0) or not crawler.has_vehicles(0):
+        return 0
+
+    lo, hi = 0, 1  # lo: letzte bekannte volle Seite, hi: Kandidat
+    while True:
+        if max_pages is not None and hi >= max_pages:
+            if crawler.has_vehicles(max_pages - 1):
+                return max_pages
+            hi = max_pages - 1
+            break
+        if not crawler.has_vehicles(hi):
+            break
+        lo, hi = hi, hi * 2
+
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if crawler.has_vehicles(mid):
+            lo = mid
+        else:
+            hi = mid
+
+    return lo + 1
+
+
+def crawl_pages_concurrent(max_pages: int = None, rps: float = CONCURRENT_RPS,
+                           workers: int = CONCURRENT_WORKERS,
+                           cache: ResponseCache | None = None,
+                           fast_parser: bool = True) -> tuple[list[str], PageCrawler]:
+    """
+    Determine the page count, then fetch the remaining pages in parallel.
+
+    Returns the page HTML in page order (plus the crawler for its stats).
+    Raises PageFetchError if any page still fails after its retries, instead
+    of returning fewer pages.
+    """
+    crawler = PageCrawler(rps, make_session(pool_size=max(1, workers)), cache, fast_parser)
+
+    page_count = find_page_count(crawler, max_pages)
+    print(f"\n  Seitenanzahl: {page_count} ({len(crawler.pages)} Seiten geprüft, "
+          f"{crawler.requests_made} Probe-Requests)\n")
+
+    missing = [p for p in range(page_count) if p not in crawler.pages]
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        list(executor.map(crawler.fetch, missing))
+
+    return [crawler.pages[page_num] for page_num in range(page_count)], crawler
+
+
 # ============================================================================
 # MAIN
 # ============================================================================
 
-def scrape_all_vehicles(output_file: str, max_pages: int = None) -> int:
-    """Scrape all vehicles from ev-database.org."""
+def print_crawl_stats(pages: int, requests_made: int, elapsed: float, fetch_seconds: float,
+                      compare: bool = False) -> None:
+    """Throughput summary; the sequential estimate is fetch time + REQUEST_DELAY per real request."""
+    rate = pages / elapsed if elapsed > 0 else 0.0
+    print(f"Crawl time: {elapsed:.1f}s ({rate:.2f} pages/sec, {requests_made} requests)")
+    if not compare:
+        print()
+        return
+
+    sequential_estimate = fetch_seconds + REQUEST_DELAY * requests_made
+    print(f"Sequential loop (est.): {sequential_estimate:.1f}s "
+          f"({pages / sequential_estimate if sequential_estimate > 0 else 0.0:.2f} pages/sec)")
+    if elapsed > 0 and sequential_estimate > 0:
+        print(f"Speedup vs. sequential: {sequential_estimate / elapsed:.1f}x\n")
+
+
+def scrape_all_vehicles(output_file: str, max_pages: int = None, concurrent: bool = False,
+                        rps: float = CONCURRENT_RPS, workers: int = CONCURRENT_WORKERS,
+                        cache: ResponseCache | None = None, previous_file: str = None,
+                        fast_parser: bool = True) -> int:
+    """
+    Scrape all vehicles from ev-database.org.
+
+    With previous_file (raw CSV of the last run) the new listing is compared by
+    car ID and slug hash; feed both files to enrich_from_detail_pages_v5.py
+    (--previous-raw) to fetch only added/changed detail pages.
+    """
 
     print(f"{'='*80}")
     print(f"EV-Database Scraper v4 - URL-Based Spec Extraction")
@@ -183,30 +393,61 @@ def scrape_all_vehicles(output_file: str, max_pages: int = None) -> int:
 
     all_vehicles = []
     page_num = 0
+    crawl_start = time.perf_counter()
+    fetch_seconds = 0.0
+    requests_made = 0
 
     print("Scraping pages...")
 
-    while True:
-        if max_pages and page_num >= max_pages:
-            print(f"\n⚠ Reached max_pages limit ({max_pages})")
-            break
+    if concurrent:
+        print(f"Mode: concurrent ({workers} workers, {rps:g} req/s global budget)\n")
+        try:
+            pages, crawler = crawl_pages_concurrent(max_pages, rps, workers, cache, fast_parser)
+        except PageFetchError as e:
+            print(f"\n❌ {e} – aborting, nothing written", file=sys.stderr)
+            return 1
+        fetch_seconds = crawler.fetch_seconds
+        requests_made = crawler.requests_made
+
+        # Reihenfolge der Seiten = Reihenfolge im CSV (deterministisch)
+        for html in pages:
+            vehicles = extract_vehicles_from_page(html, page_num, fast_parser)
+            if not vehicles:
+                print(f"⚠ No vehicles found on page {page_num}, assuming end of data")
+                break
+            all_vehicles.extend(vehicles)
+            page_num += 1
 
-        html = fetch_page(page_num)
-        if not html:
-            print(f"⚠ Failed to fetch page {page_num}, stopping")
-            break
+    else:
+        while True:
+            if max_pages and page_num >= max_pages:
+                print(f"\n⚠ Reached max_pages limit ({max_pages})")
+                break
 
-        vehicles = extract_vehicles_from_page(html, page_num)
+            sent = []  # before_request-Hook: nur bei echtem Request (nicht bei Cache-Treffer)
+            t0 = time.perf_counter()
+            try:
+                html = fetch_page(page_num, cache=cache, before_request=lambda: sent.append(1))
+            except CacheMiss as e:
+                print(f"✗ {e}")
+                html = None
+            fetch_seconds += time.perf_counter() - t0
+            requests_made += len(sent)
+            if not html:
+                print(f"⚠ Failed to fetch page {page_num}, stopping")
+                break
 
-        if not vehicles:
-            print(f"⚠ No vehicles found on page {page_num}, assuming end of data")
-            break
+            vehicles = extract_vehicles_from_page(html, page_num, fast_parser)
 
-        all_vehicles.extend(vehicles)
-        page_num += 1
+            if not vehicles:
+                print(f"⚠ No vehicles found on page {page_num}, assuming end of data")
+                break
 
-        if page_num < 100:
-            time.sleep(REQUEST_DELAY)
+            all_vehicles.extend(vehicles)
+            page_num += 1
+
+            if page_num < 100 and sent:
+                time.sleep(REQUEST_DELAY)
 
     # Save to CSV
     print(f"\n{'='*80}")
@@ -216,6 +457,10 @@ def scrape_all_vehicles(output_file: str, max_pages: int = None) -> int:
     print(f"Total vehicles scraped: {len(all_vehicles)}")
     print(f"Pages processed: {page_num}\n")
 
+    print_crawl_stats(page_num, requests_made, time.perf_counter() - crawl_start, fetch_seconds, concurrent)
+    if cache is not None:
+        print(f"{cache.summary()}\n")
+
     if all_vehicles:
         df = pd.DataFrame(all_vehicles)
 
@@ -234,6 +479,12 @@ def scrape_all_vehicles(output_file: str, max_pages: int = None) -> int:
         print(f"  DC Charging: {(~df['Charging Rate DC Fast (kW)'].isna()).sum()}/{len(df)} ({100*(~df['Charging Rate DC Fast (kW)'].isna()).sum()/len(df):.1f}%)")
         print(f"  AC Charging: {(~df['Charging Rate Level 2 (kW)'].isna()).sum()}/{len(df)} ({100*(~df['Charging Rate Level 2 (kW)'].isna()).sum()/len(df):.1f}%)\n")
 
+        if previous_file:
+            try:
+                print_diff_summary(diff_listings(pd.read_csv(previous_file), df))
+            except Exception as e:
+                print(f"⚠ Could not compare with {previous_file}: {e}\n")
+
         df.to_csv(output_file, index=False)
         print(f"✅ Saved: {output_file}\n")
 
@@ -248,9 +499,17 @@ if __name__ == "__main__":
 
     parser = argparse.ArgumentParser(description="Scrape EV data from ev-database.org with URL-based specs")
     parser.add_argument('--output', '-o', default='ev_database_raw_v4.csv', help='Output CSV file')
-    parser.add_argument('--max-pages', '-m', type=int, default=None, help='Max pages to scrape')
+    parser.add_argument('--max-pages', '-m', type=int, default=None, help='Max pages to scrape (0 = unlimited)')
+    parser.add_argument('--concurrent', action='store_true', help='Fetch pages in parallel (page count first)')
+    parser.add_argument('--rps', type=float, default=CONCURRENT_RPS, help='Global requests/sec budget for --concurrent')
+    parser.add_argument('--workers', '-w', type=int, default=CONCURRENT_WORKERS, help='Parallel workers for --concurrent')
+    parser.add_argument('--previous', '-p', default=None, help='Raw CSV of the last run: report added/changed car IDs')
+    parser.add_argument('--parser', choices=['fast', 'bs4'], default='fast',
+                        help='HTML parser: fast (strainer/lxml) or bs4 (full html.parser tree)')
+    add_cache_args(parser)
 
     args = parser.parse_args()
 
-    exit_code = scrape_all_vehicles(args.output, args.max_pages)
+    exit_code = scrape_all_vehicles(args.output, args.max_pages, args.concurrent, args.rps, args.workers,
+                                    cache_from_args(args), args.previous, args.parser == 'fast')
     sys.exit(exit_code)
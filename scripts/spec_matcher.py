@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+spec_matcher.py
+
+Multi-Pattern-Suche über die SPECS-Tabelle von build_lookup.py.
+
+Bisher wurde pro Zeile die ganze SPECS-Liste durchlaufen (Hersteller
+vergleichen, dann `spec_model in model_norm`), also Zeilen × Regeln. Hier wird
+pro Hersteller einmal ein Aho-Corasick-Automat über die Modell-Teilstrings
+gebaut. best() läuft einmal über den Modellnamen und liefert die Regel mit dem
+kleinsten SPECS-Index unter allen Treffern, also dieselbe Regel wie die
+bisherige Schleife ("first listed wins"). Jeder Knoten kennt den kleinsten
+Index aller Muster, die an ihm enden (inkl. Fail-Kette), und sobald die erste
+Regel des Herstellers getroffen ist, wird abgebrochen.
+
+Leere Teilstrings passen wie `'' in s` auf jeden Namen; Hersteller werden wie
+bisher exakt verglichen.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import Sequence
+
+_NONE = -1  # kein Treffer
+
+
+class _Automaton:
+    """Aho-Corasick automaton over (pattern, priority) pairs; lower priority wins."""
+
+    __slots__ = ('goto', 'fail', 'best', 'first')
+
+    def __init__(self, patterns: Sequence[tuple[str, int]]):
+        self.goto: list[dict[str, int]] = [{}]
+        self.best: list[int] = [_NONE]
+        for pattern, priority in patterns:
+            node = 0
+            for ch in pattern:
+                nxt = self.goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[node][ch] = nxt
+                    self.goto.append({})
+                    self.best.append(_NONE)
+                node = nxt
+            if self.best[node] == _NONE or priority < self.best[node]:
+                self.best[node] = priority
+        self.first = min(p for _, p in patterns)
+
+        # Fail-Links per BFS; best[] über die Fail-Kette zusammenfassen
+        self.fail = [0] * len(self.goto)
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                inherited = self.best[self.fail[child]]
+                if inherited != _NONE and (self.best[child] == _NONE or inherited < self.best[child]):
+                    self.best[child] = inherited
+                queue.append(child)
+
+    def search(self, text: str) -> int:
+        goto, fail, best_at = self.goto, self.fail, self.best
+        best = best_at[0]  # leere Muster passen immer
+        if best == self.first:
+            return best
+        node = 0
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = best_at[node]
+            if hit != _NONE and (best == _NONE or hit < best):
+                best = hit
+                if best == self.first:
+                    break
+        return best
+
+
+class SpecMatcher:
+    """Per-manufacturer automata over SPECS rows (manufacturer, model_substring, ...)."""
+
+    def __init__(self, specs: Sequence[tuple]):
+        by_manufacturer: dict[str, list[tuple[str, int]]] = {}
+        for i, spec in enumerate(specs):
+            by_manufacturer.setdefault(spec[0], []).append((spec[1], i))
+        self.automata = {mfr: _Automaton(patterns) for mfr, patterns in by_manufacturer.items()}
+        self.size = len(specs)
+
+    def best(self, manufacturer: str, model_norm: str) -> int:
+        """Index of the first SPECS row matching (manufacturer, model_norm), or -1."""
+        automaton = self.automata.get(manufacturer)
+        if automaton is None:
+            return _NONE
+        return automaton.search(model_norm)
+
+    def __len__(self) -> int:
+        return self.size